@@ -0,0 +1 @@
+"""Benchmark and load-test scripts; run each one with ``python -m benchmarks.<name>`` from the Backend directory."""
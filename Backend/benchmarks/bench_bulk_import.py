@@ -0,0 +1,100 @@
+"""Measures bulk user import throughput.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_bulk_import --rows 20000 --batch-sizes 100,500,2000 --hash-rows 200
+
+Reports three numbers separately, because they scale differently:
+
+* insert rows/sec of ``UserCRUD.bulk_create_users`` per batch size, with
+  passwords pre-hashed so only the database is measured;
+* bcrypt hashes/sec on the bulk process pool;
+* end-to-end rows/sec through ``POST /users/import`` for ``--hash-rows`` rows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from uuid import uuid4
+
+# POST /users/import is for operators; the token is read at import
+os.environ.setdefault("INTERNAL_API_TOKEN", "bench-internal-token")
+
+from benchmarks.common import BENCH_PASSWORD
+import httpx
+from sqlmodel import Session
+from src.backend import database
+from src.backend.cruds.crud_user import UserCRUD
+from src.backend.main import app
+from src.backend.schemas.user_schema import UserCreate
+from src.backend.settings import settings
+from src.backend.utils.hashing_pool import bulk_hashing_pool, hash_passwords_bulk
+from src.backend.utils.security import hash_password
+
+
+def make_rows(count: int, password: str) -> list[UserCreate]:
+    run = uuid4().hex[:6]
+    return [
+        UserCreate(
+            username=f"bulk_{run}_{i}",
+            first_name="Bulk",
+            last_name="User",
+            email=f"bulk_{run}_{i}@example.com",
+            password=password,
+        )
+        for i in range(count)
+    ]
+
+
+def bench_inserts(rows: int, batch_size: int) -> float:
+    users = make_rows(rows, hash_password(BENCH_PASSWORD))
+    start = time.perf_counter()
+    with Session(database.engine) as session:
+        for offset in range(0, rows, batch_size):
+            UserCRUD.bulk_create_users(session, users[offset:offset + batch_size])
+    return rows / (time.perf_counter() - start)
+
+
+async def bench_hashing(rows: int) -> float:
+    # Warm the workers so process start-up is not timed
+    await hash_passwords_bulk([BENCH_PASSWORD] * bulk_hashing_pool.max_workers)
+    start = time.perf_counter()
+    await hash_passwords_bulk([BENCH_PASSWORD] * rows)
+    return rows / (time.perf_counter() - start)
+
+
+async def bench_endpoint(rows: int, batch_size: int) -> float:
+    body = "\n".join(json.dumps(user.model_dump()) for user in make_rows(rows, BENCH_PASSWORD))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        response = await client.post(
+            "/users/import",
+            params={"batch_size": batch_size},
+            headers={"X-Internal-Token": settings.internal_api_token},
+            files={"file": ("users.jsonl", body, "application/x-ndjson")},
+        )
+        elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    assert response.json()["inserted"] == rows
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-sizes", default="1,100,500,2000")
+    parser.add_argument("--hash-rows", type=int, default=100)
+    args = parser.parse_args()
+
+    database.create_db_and_tables()
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        rows = args.rows if batch_size > 1 else min(args.rows, 2000)
+        print(f"insert  batch={batch_size:<5} rows={rows:<7} {bench_inserts(rows, batch_size):,.0f} rows/s")
+    print(f"hashing rows={args.hash_rows:<7} {asyncio.run(bench_hashing(args.hash_rows)):,.1f} hashes/s")
+    print(f"import  rows={args.hash_rows:<7} {asyncio.run(bench_endpoint(args.hash_rows, 500)):,.1f} rows/s end to end")
+
+
+if __name__ == "__main__":
+    main()
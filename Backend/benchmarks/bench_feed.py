@@ -0,0 +1,96 @@
+"""Measures feed and author-page latency over a large seeded POSTS table.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_feed --posts 1000000 --authors 1000 --samples 500
+
+Seeds ``--posts`` posts (90% published) across ``--authors`` authors with
+batched core inserts, then times ``--samples`` page reads each for the first
+feed page, deep feed pages (reached by cursor), and random author pages.
+Every read is a single index range scan, so deep pages should cost the same
+as the first one.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from benchmarks.common import percentiles
+from sqlalchemy import insert
+from sqlmodel import Session
+from src.backend import database
+from src.backend.cruds.crud_post import PostCRUD
+from src.backend.models.blogs import Post, PostStatus
+from src.backend.models.users import User
+
+SEED_BATCH = 5000
+
+
+def seed(posts: int, authors: int) -> list:
+    database.create_db_and_tables()
+    author_ids = [uuid4() for _ in range(authors)]
+    start = datetime.utcnow() - timedelta(days=365)
+    with Session(database.engine) as session:
+        session.execute(insert(User), [
+            {"id": author_id, "username": f"author{i}", "email": f"author{i}@example.com",
+             "first_name": "Bench", "last_name": "Author", "password": "x"}
+            for i, author_id in enumerate(author_ids)
+        ])
+        for offset in range(0, posts, SEED_BATCH):
+            rows = []
+            for i in range(offset, min(offset + SEED_BATCH, posts)):
+                published = random.random() < 0.9
+                moment = start + timedelta(seconds=i * 30)
+                rows.append({
+                    "id": uuid4(), "author_id": random.choice(author_ids), "slug": f"post-{i}",
+                    "title": f"Post {i}", "body": "Lorem ipsum " * 20,
+                    "status": PostStatus.PUBLISHED if published else PostStatus.DRAFT,
+                    "published_at": moment if published else None,
+                    "comment_count": random.randint(0, 50), "like_count": random.randint(0, 500),
+                    "created_at": moment, "updated_at": moment,
+                })
+            session.execute(insert(Post), rows)
+            session.commit()
+    return author_ids
+
+
+def timed(fn, samples: int) -> list[float]:
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=50, help="page number used for deep-page reads")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    author_ids = seed(args.posts, args.authors)
+    print(f"seeded {args.posts:,} posts in {time.perf_counter() - start:.1f}s")
+
+    with Session(database.engine) as session:
+        cursor = None
+        for _ in range(args.depth):
+            _, cursor = PostCRUD.get_feed_page(session, args.limit, cursor)
+
+        first = timed(lambda: PostCRUD.get_feed_page(session, args.limit), args.samples)
+        deep = timed(lambda: PostCRUD.get_feed_page(session, args.limit, cursor), args.samples)
+        author = timed(lambda: PostCRUD.get_author_page(session, random.choice(author_ids), args.limit), args.samples)
+
+    print(f"feed first page:        {percentiles(first)}")
+    print(f"feed page {args.depth:<4}          {percentiles(deep)}")
+    print(f"author first page:      {percentiles(author)}")
+
+
+if __name__ == "__main__":
+    main()
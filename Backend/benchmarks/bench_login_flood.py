@@ -0,0 +1,73 @@
+"""Measures GET /users/{id} latency while /auth/login is being flooded.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_login_flood --logins 200 --concurrency 50
+
+Runs the app in-process over httpx's ASGI transport against a throwaway
+SQLite database unless DATABASE_URL is already set. Reports p50/p95/p99 of
+the user lookup on an idle server and again during the login flood; with
+hashing offloaded to the bounded pool the two should stay close.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import BENCH_PASSWORD, percentiles, seed_user
+import httpx
+from src.backend.main import app
+
+
+async def probe(client: httpx.AsyncClient, user_id: str, stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(f"/users/{user_id}")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def flood(client: httpx.AsyncClient, logins: int, concurrency: int) -> dict[int, int]:
+    codes: dict[int, int] = {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            response = await client.post("/auth/login", data={"username": "benchuser", "password": BENCH_PASSWORD})
+            codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(logins)))
+    return codes
+
+
+async def main(logins: int, concurrency: int, idle_seconds: float):
+    user_id = seed_user()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle: list[float] = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, user_id, stop, idle))
+        await asyncio.sleep(idle_seconds)
+        stop.set()
+        await prober
+
+        loaded: list[float] = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, user_id, stop, loaded))
+        start = time.perf_counter()
+        codes = await flood(client, logins, concurrency)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    print(f"idle   GET /users/{{id}}: {percentiles(idle)}")
+    print(f"flood  GET /users/{{id}}: {percentiles(loaded)}")
+    print(f"logins: {logins} in {elapsed:.2f}s ({logins / elapsed:.1f}/s) status codes: {codes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.idle_seconds))
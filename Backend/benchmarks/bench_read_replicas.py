@@ -0,0 +1,126 @@
+"""Shows where the statements of a read-heavy workload run with read replicas.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_read_replicas --users 10000 --requests 2000 --write-every 20
+
+Seeds ``--users`` users into the primary, then copies the SQLite file
+``BENCH_REPLICAS`` times (default 2) to stand in for replicas (a snapshot, so no lag while
+it runs). ``--requests`` GET /users/{id} requests are spread over 20
+clients; every ``--write-every``-th request is instead a PATCH of the
+client's own user, which keeps the client's next reads on the primary for
+DB_REPLICA_STICKY_SECONDS. The same workload then runs without replicas.
+
+Reported per node: statements executed, so the share of the read load the
+primary no longer carries is visible.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from uuid import uuid4
+
+# The replica URLs are read at import, so they are fixed before the app loads
+DIRECTORY = tempfile.mkdtemp()
+REPLICA_COUNT = int(os.environ.get("BENCH_REPLICAS", "2"))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DIRECTORY}/bench.db")
+os.environ.setdefault("DATABASE_REPLICA_URLS", ",".join(f"sqlite:///{DIRECTORY}/replica{i}.db" for i in range(REPLICA_COUNT)))
+os.environ.setdefault("USER_CACHE_BACKEND", "none")
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+import httpx
+from benchmarks.common import percentiles
+from sqlalchemy import event, insert
+from sqlmodel import Session
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import User
+from src.backend.utils.security import create_access_token
+
+SEED_BATCH = 5000
+CLIENTS = 20
+
+
+def seed(users: int) -> list[str]:
+    database.create_db_and_tables()
+    ids = [uuid4() for _ in range(users)]
+    with Session(database.engine) as session:
+        for offset in range(0, users, SEED_BATCH):
+            session.execute(insert(User), [
+                {"id": user_id, "username": f"user{offset + i}", "email": f"user{offset + i}@example.com",
+                 "first_name": "Bench", "last_name": "User", "password": "x"}
+                for i, user_id in enumerate(ids[offset:offset + SEED_BATCH])
+            ])
+        session.commit()
+    database.engine.dispose()
+    for replica in database.replicas.replicas:
+        shutil.copyfile(f"{DIRECTORY}/bench.db", replica.url.removeprefix("sqlite:///"))
+    return [str(user_id) for user_id in ids]
+
+
+def count_statements(engine, counts: dict, name: str) -> None:
+    def before_cursor_execute(*_):
+        counts[name] = counts.get(name, 0) + 1
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def workload(args, ids: list[str]) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+
+    async def client_loop(requests: int):
+        # Each client keeps its own cookie jar, so stickiness applies per client
+        own_id = random.choice(ids)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': own_id, 'sid': uuid4().hex})}"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for i in range(requests):
+                user_id = random.choice(ids)
+                start = time.perf_counter()
+                if args.write_every and i % args.write_every == args.write_every - 1:
+                    response = await client.patch(f"/users/{own_id}", json={"first_name": "Edited"}, headers=headers)
+                else:
+                    response = await client.get(f"/users/{user_id}")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(client_loop(args.requests // CLIENTS) for _ in range(CLIENTS)))
+    return latencies
+
+
+async def run(args) -> None:
+    ids = seed(args.users)
+    replica_set = database.replicas
+    counts: dict[str, int] = {}
+    engine = database.get_async_engine().sync_engine if database.DB_ASYNC else database.get_engine()
+    count_statements(engine, counts, "primary")
+    for replica in replica_set.replicas:
+        replica_engine = replica.async_engine().sync_engine if database.DB_ASYNC else replica.engine()
+        count_statements(replica_engine, counts, replica.name.rsplit("/", 1)[-1])
+
+    for label, replica_set_in_use in (("replicas", replica_set), ("primary only", database.ReplicaSet([]))):
+        database.replicas = replica_set_in_use
+        counts.clear()
+        latencies = await workload(args, ids)
+        nodes = "  ".join(f"{name}={count}" for name, count in sorted(counts.items()))
+        print(f"{label:12} {percentiles(latencies)}")
+        print(f"{'':12} statements: {nodes}")
+    database.replicas = replica_set
+    await database.dispose_engines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-every", type=int, default=20, help="every Nth request of a client is a PATCH (0: none)")
+    args = parser.parse_args()
+    logging.getLogger("src.backend.utils.metrics").setLevel(logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measures ranked full-text search latency over a large seeded index.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_search --documents 1000000 --samples 200
+
+Seeds ``--documents`` synthetic search documents (90% posts, 10% users)
+straight into the search backend of the configured database, with words
+drawn from a Zipf-like vocabulary so a few terms are very common and most
+are rare. Then times ``--samples`` top-20 queries per query shape.
+"""
+import argparse
+import itertools
+import random
+import time
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from benchmarks.common import percentiles
+from sqlmodel import Session
+from src.backend import database
+from src.backend.utils.search import get_search_backend, search_terms
+
+SEED_BATCH = 5000
+VOCABULARY_SIZE = 20000
+
+
+def vocabulary(size: int) -> list[str]:
+    """Distinct pronounceable words; list position is the word's frequency rank."""
+    rng = random.Random(42)
+    words: dict[str, None] = {}
+    while len(words) < size:
+        words["".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))] = None
+    return list(words)
+
+
+VOCABULARY = vocabulary(VOCABULARY_SIZE)
+# Zipf's law: the r-th most common word occurs about 1/r as often as the first
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE)))
+
+
+def words(count: int) -> str:
+    return " ".join(random.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=count))
+
+
+def seed(documents: int) -> None:
+    database.create_db_and_tables()
+    backend = get_search_backend(database.engine.dialect.name)
+    with Session(database.engine) as session:
+        for offset in range(0, documents, SEED_BATCH):
+            batch = []
+            for _ in range(min(SEED_BATCH, documents - offset)):
+                if random.random() < 0.9:
+                    batch.append(("post", uuid4(), words(6), words(80)))
+                else:
+                    batch.append(("user", uuid4(), f"{random.choice(VOCABULARY)}{random.randint(0, 99999)}", words(2)))
+            backend.upsert(session, batch)
+            session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    seed(args.documents)
+    print(f"seeded {args.documents:,} documents in {time.perf_counter() - start:.1f}s")
+
+    rare = VOCABULARY[-2000:]
+    shapes = {
+        "stop word": (lambda: random.choice(VOCABULARY[:10]), None),
+        "common term": (lambda: random.choice(VOCABULARY[100:200]), None),
+        "rare term": (lambda: random.choice(rare), None),
+        "three-char prefix": (lambda: random.choice(VOCABULARY)[:3], None),
+        "two terms": (lambda: f"{random.choice(VOCABULARY[:200])} {random.choice(VOCABULARY[:2000])}", None),
+        "prefix, users only": (lambda: random.choice(VOCABULARY)[:4], "user"),
+    }
+    backend = get_search_backend(database.engine.dialect.name)
+    with Session(database.engine) as session:
+        for name, (make_query, kind) in shapes.items():
+            latencies = []
+            for _ in range(args.samples):
+                terms = search_terms(make_query())
+                begin = time.perf_counter()
+                backend.search(session, terms, kind, args.limit)
+                latencies.append(time.perf_counter() - begin)
+            print(f"{name:20} {percentiles(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
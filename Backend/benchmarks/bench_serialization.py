@@ -0,0 +1,97 @@
+"""Measures the cost of building a GET /users/ response at 10k rows, before and after the fast path.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_serialization --users 10000 --samples 30
+
+Seeds ``--users`` users, then times one page holding all of them three ways:
+
+- ``before``: ORM Users validated through the route's UserPage response
+  field and encoded with the stdlib (FastAPI's JSONResponse), as the
+  route did before orjson;
+- ``orjson``: the same validation, encoded by the new default ORJSONResponse;
+- ``fast path``: column rows encoded straight to bytes by ``page_response``,
+  which is what GET /users/ does now.
+
+Each variant is timed end to end (query + serialization) and for the
+serialization step alone on rows fetched once.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from benchmarks.common import percentiles
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import insert
+from sqlmodel import Session
+from src.backend import database
+from src.backend.cruds.crud_user import USER_READ_COLUMNS, UserCRUD
+from src.backend.main import app
+from src.backend.models.users import User
+from src.backend.utils.serialization import page_response
+
+SEED_BATCH = 5000
+
+
+def seed(users: int) -> None:
+    database.create_db_and_tables()
+    with Session(database.engine) as session:
+        for offset in range(0, users, SEED_BATCH):
+            session.execute(insert(User), [
+                {"id": uuid4(), "username": f"user{i}", "email": f"user{i}@example.com",
+                 "first_name": "Bench", "last_name": "User", "password": "x"}
+                for i in range(offset, min(offset + SEED_BATCH, users))
+            ])
+        session.commit()
+
+
+def validated(field, users, response_class) -> bytes:
+    content = asyncio.run(serialize_response(field=field, response_content={"items": users, "next_cursor": None}))
+    return response_class(content).body
+
+
+def timed(fn, samples: int) -> list[float]:
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=30)
+    args = parser.parse_args()
+
+    seed(args.users)
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/users/" and "GET" in route.methods)
+    field = route.response_field
+
+    with Session(database.engine) as session:
+        def orm_page():
+            session.expunge_all()
+            return UserCRUD.get_users_page(session, args.users)[0]
+
+        def row_page():
+            return UserCRUD.get_users_page(session, args.users, None, USER_READ_COLUMNS)[0]
+
+        users, rows = orm_page(), row_page()
+        assert validated(field, users, ORJSONResponse) == page_response(rows, None).body
+
+        variants = {
+            "before": (lambda: validated(field, orm_page(), JSONResponse), lambda: validated(field, users, JSONResponse)),
+            "orjson": (lambda: validated(field, orm_page(), ORJSONResponse), lambda: validated(field, users, ORJSONResponse)),
+            "fast path": (lambda: page_response(row_page(), None), lambda: page_response(rows, None)),
+        }
+        for name, (end_to_end, encode_only) in variants.items():
+            print(f"{name:10} query+encode {percentiles(timed(end_to_end, args.samples))}")
+            print(f"{name:10} encode only  {percentiles(timed(encode_only, args.samples))}")
+
+
+if __name__ == "__main__":
+    main()
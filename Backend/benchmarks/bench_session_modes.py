@@ -0,0 +1,73 @@
+"""Compares GET /users/{id} throughput with the sync and async session paths.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_session_modes --clients 500 --requests 5000
+
+Each mode runs in its own interpreter because DB_ASYNC is read when
+``backend.database`` is imported. Point DATABASE_URL at Postgres to compare
+psycopg2 against asyncpg; by default a throwaway SQLite file is used.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+# Measure the session path, not the in-process user cache (the child interpreters inherit this)
+os.environ.setdefault("USER_CACHE_BACKEND", "none")
+
+
+async def drive(clients: int, requests: int):
+    from benchmarks.common import percentiles, seed_user
+    import httpx
+    from src.backend.main import app
+
+    user_id = seed_user()
+    latencies: list[float] = []
+    errors = 0
+    per_client = max(1, requests // clients)
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        for _ in range(per_client):
+            start = time.perf_counter()
+            response = await client.get(f"/users/{user_id}")
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    mode = "async" if os.environ.get("DB_ASYNC") == "1" else "sync"
+    print(f"{mode:5} clients={clients} rps={len(latencies) / elapsed:.1f} errors={errors} {percentiles(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        asyncio.run(drive(args.clients, args.requests))
+        return
+    for mode in ("sync", "async"):
+        env = dict(os.environ, DB_ASYNC="1" if mode == "async" else "0")
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_session_modes", "--mode", mode,
+             "--clients", str(args.clients), "--requests", str(args.requests)],
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Measures cold-start cost: importing the app, then serving its first request.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_startup --runs 7 --top 15
+
+Each run starts a fresh interpreter, as a new autoscaled instance would, and
+reports three medians: ``import`` (import src.backend.main), ``startup``
+(the lifespan: engine, migrations, background workers) and ``first request``
+(GET /posts/ over the in-process ASGI transport). One extra run under
+``python -X importtime`` lists the modules with the highest self time.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import httpx
+from src.backend.main import app
+imported = time.perf_counter()
+
+async def serve():
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            assert (await client.get("/posts/")).status_code == 200
+        return started, time.perf_counter()
+
+started, served = asyncio.run(serve())
+print(json.dumps({"import": imported - start, "startup": started - imported, "first request": served - started}))
+"""
+
+
+def child_env(db_dir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{db_dir}/startup.db")
+    env.setdefault("SECRET_KEY", "benchmark-secret")
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15, help="modules to list by import self time")
+    args = parser.parse_args()
+
+    env = child_env(tempfile.mkdtemp())
+    runs = [json.loads(subprocess.run([sys.executable, "-c", CHILD], env=env, check=True,
+                                      capture_output=True, text=True).stdout) for _ in range(args.runs)]
+    for phase in runs[0]:
+        print(f"{phase:14} median={statistics.median(run[phase] for run in runs) * 1000:.1f}ms")
+
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.backend.main"],
+                            env=env, check=True, capture_output=True, text=True).stderr
+    modules = []
+    for line in stderr.splitlines()[1:]:
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append((int(self_us), int(cumulative_us), name.strip()))
+    print(f"\nimport src.backend.main: {modules[-1][1] / 1000:.1f}ms cumulative; top self times:")
+    for self_us, cumulative_us, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.1f}ms self {cumulative_us / 1000:7.1f}ms cumulative  {name}")
+
+
+if __name__ == "__main__":
+    main()
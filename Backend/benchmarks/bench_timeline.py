@@ -0,0 +1,126 @@
+"""Compares hybrid fan-out timelines against pure pull-on-read over a synthetic social graph.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_timeline --users 20000 --follows 50 --posts 40000 --fanout-limit 2000
+
+Each user follows ``--follows`` authors picked with Zipf-like popularity,
+so a few authors gather most followers, and popular authors also post more.
+Timelines are seeded as if every post below ``--fanout-limit`` followers had
+been fanned out on publish (one set-based INSERT ... SELECT), then trimmed.
+The benchmark then times publishing fresh posts (the fan-out write cost)
+and reading the first timeline page of random users with both strategies.
+"""
+import argparse
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from benchmarks.common import percentiles
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
+from src.backend import database
+from src.backend.cruds import crud_timeline
+from src.backend.cruds.crud_timeline import TimelineCRUD, timeline_trimmer
+from src.backend.models.blogs import Post, PostStatus
+from src.backend.models.social import Follow, FollowerCount, TimelineEntry
+from src.backend.models.users import User
+
+SEED_BATCH = 5000
+
+
+def seed(users: int, follows: int, posts: int, fanout_limit: int) -> list:
+    database.create_db_and_tables()
+    user_ids = [uuid4() for _ in range(users)]
+    popularity = list(itertools.accumulate(1 / (rank + 1) ** 0.9 for rank in range(users)))
+    activity = list(itertools.accumulate(1 / (rank + 1) ** 0.5 for rank in range(users)))
+    start = datetime.utcnow() - timedelta(days=30)
+    with Session(database.engine) as session:
+        for offset in range(0, users, SEED_BATCH):
+            session.execute(insert(User), [
+                {"id": user_id, "username": f"user{offset + i}", "email": f"user{offset + i}@example.com",
+                 "first_name": "Bench", "last_name": "User", "password": "x"}
+                for i, user_id in enumerate(user_ids[offset:offset + SEED_BATCH])
+            ])
+        for offset in range(0, users, SEED_BATCH // follows + 1):
+            rows = []
+            for follower_id in user_ids[offset:offset + SEED_BATCH // follows + 1]:
+                followees = set(random.choices(user_ids, cum_weights=popularity, k=follows)) - {follower_id}
+                rows.extend({"follower_id": follower_id, "followee_id": followee_id} for followee_id in followees)
+            session.execute(insert(Follow), rows)
+        counts = select(Follow.followee_id, func.count()).group_by(Follow.followee_id)
+        session.execute(insert(FollowerCount).from_select(["user_id", "follower_count"], counts))
+
+        authors = random.choices(user_ids, cum_weights=activity, k=posts)
+        for offset in range(0, posts, SEED_BATCH):
+            rows = []
+            for i in range(offset, min(offset + SEED_BATCH, posts)):
+                moment = start + timedelta(seconds=i * 5)
+                rows.append({
+                    "id": uuid4(), "author_id": authors[i], "slug": f"post-{i}", "title": f"Post {i}", "body": "Lorem ipsum",
+                    "status": PostStatus.PUBLISHED, "published_at": moment, "created_at": moment, "updated_at": moment,
+                })
+            session.execute(insert(Post), rows)
+
+        # Equivalent to fanning out every post by an author under the limit
+        pushed = (
+            select(Follow.follower_id, Post.id, Post.author_id, Post.published_at)
+            .join(Post, Post.author_id == Follow.followee_id)
+            .join(FollowerCount, FollowerCount.user_id == Follow.followee_id)
+            .where(FollowerCount.follower_count <= fanout_limit)
+        )
+        session.execute(insert(TimelineEntry).from_select(["user_id", "post_id", "author_id", "published_at"], pushed))
+        session.commit()
+        timeline_trimmer.mark_users(*user_ids)
+        timeline_trimmer.flush(session)
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--follows", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=40_000)
+    parser.add_argument("--fanout-limit", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    crud_timeline.TIMELINE_FANOUT_LIMIT = args.fanout_limit
+
+    start = time.perf_counter()
+    user_ids = seed(args.users, args.follows, args.posts, args.fanout_limit)
+    print(f"seeded {args.users:,} users, {args.posts:,} posts in {time.perf_counter() - start:.1f}s")
+
+    with Session(database.engine) as session:
+        celebrities = session.exec(select(func.count()).where(FollowerCount.follower_count > args.fanout_limit)).one()
+        entries = session.exec(select(func.count()).select_from(TimelineEntry)).one()
+        print(f"authors above the fan-out limit: {celebrities}, timeline entries: {entries:,}")
+
+        fan_out = []
+        for author_id in random.sample(user_ids, args.samples):
+            now = datetime.utcnow()
+            post = Post(author_id=author_id, slug=f"fresh-{uuid4().hex}", title="Fresh", body="Lorem ipsum",
+                        status=PostStatus.PUBLISHED, published_at=now)
+            begin = time.perf_counter()
+            session.add(post)
+            session.flush()
+            TimelineCRUD.fan_out(session, post)
+            session.commit()
+            fan_out.append(time.perf_counter() - begin)
+        print(f"publish with fan-out: {percentiles(fan_out)}")
+
+        readers = random.sample(user_ids, args.samples)
+        for strategy in ("hybrid", "pull"):
+            latencies = []
+            for reader in readers:
+                begin = time.perf_counter()
+                TimelineCRUD.get_timeline_page(session, reader, args.limit, strategy=strategy)
+                latencies.append(time.perf_counter() - begin)
+            print(f"timeline read {strategy:7}{percentiles(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Micro-benchmarks JWT encode/decode per token backend and algorithm.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_token_backends --seconds 1
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from src.backend.utils.security import PRIVATE_JWK_MEMBERS, TOKEN_BACKENDS, get_token_backend
+
+
+def keys() -> dict[str, tuple[object, object]]:
+    """(signing key, verification key) per algorithm."""
+    secret = "benchmark-secret-that-is-at-least-32-bytes"
+    rsa_jwk = {**RSAAlgorithm.to_jwk(rsa.generate_private_key(public_exponent=65537, key_size=2048), as_dict=True), "kid": "rsa"}
+    ed_jwk = {**OKPAlgorithm.to_jwk(ed25519.Ed25519PrivateKey.generate(), as_dict=True), "kid": "ed"}
+    public = lambda jwk: {name: value for name, value in jwk.items() if name not in PRIVATE_JWK_MEMBERS}
+    return {
+        "HS256": (secret, secret),
+        "RS256": (rsa_jwk, public(rsa_jwk)),
+        "EdDSA": (ed_jwk, public(ed_jwk)),
+    }
+
+
+def ops_per_second(fn, seconds: float) -> float:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for _ in range(50):
+            fn()
+        count += 50
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    claims = {"sub": "6f1c0b7e-2d3a-4e8f-9b1a-1c2d3e4f5a6b", "exp": datetime.utcnow() + timedelta(hours=1)}
+    print(f"{'backend':8} {'alg':6} {'encode/s':>12} {'decode/s':>12}")
+    for name in TOKEN_BACKENDS:
+        backend = get_token_backend(name)
+        for algorithm, (signing, verifying) in keys().items():
+            try:
+                token = backend.encode(claims, signing, algorithm, kid="bench")
+            except Exception as exc:
+                print(f"{name:8} {algorithm:6} unsupported ({type(exc).__name__})")
+                continue
+            encode = ops_per_second(lambda: backend.encode(claims, signing, algorithm, kid="bench"), args.seconds)
+            decode = ops_per_second(lambda: backend.decode(token, verifying, [algorithm]), args.seconds)
+            print(f"{name:8} {algorithm:6} {encode:12,.0f} {decode:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
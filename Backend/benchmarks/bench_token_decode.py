@@ -0,0 +1,51 @@
+"""Measures access-token verification cost with and without the claims cache.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_token_decode --requests 200000 --tokens 1000 --threads 8
+
+Simulates ``--requests`` authenticated requests spread over ``--tokens``
+distinct live tokens (one per active session), verified from ``--threads``
+threads the way Starlette's threadpool would call ``get_token_claims``.
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from src.backend.utils.security import create_access_token, token_cache, verify_access_token, verify_access_token_cached
+
+
+def run(verify, tokens: list[str], requests: int, threads: int) -> float:
+    sequence = [random.choice(tokens) for _ in range(requests)]
+    chunk = len(sequence) // threads
+
+    def worker(part: list[str]):
+        for token in part:
+            verify(token)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(worker, [sequence[i * chunk:(i + 1) * chunk] for i in range(threads)]))
+    return chunk * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    tokens = [create_access_token({"sub": str(uuid4())}) for _ in range(args.tokens)]
+    uncached = run(verify_access_token, tokens, args.requests, args.threads)
+    cached = run(verify_access_token_cached, tokens, args.requests, args.threads)
+    print(f"uncached: {uncached:,.0f} verifications/s ({1e6 / uncached:.1f}us each)")
+    print(f"cached:   {cached:,.0f} verifications/s ({1e6 / cached:.1f}us each) speedup x{cached / uncached:.1f}")
+    print(f"cache:    {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
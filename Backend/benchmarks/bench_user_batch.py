@@ -0,0 +1,85 @@
+"""Compares resolving N users one GET at a time with one POST /users/batch.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_user_batch --users 10000 --keys 50 --samples 50
+
+Seeds ``--users`` users, then resolves ``--keys`` random ids per sample:
+
+- ``per item``: ``--keys`` sequential GET /users/{id} requests, as a client
+  building a list view did before the batch endpoint;
+- ``batch``: one POST /users/batch holding every id.
+
+Both run in-process over httpx's ASGI transport, with the user cache off
+so the per-item path pays its queries too.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from uuid import uuid4
+
+os.environ.setdefault("USER_CACHE_BACKEND", "none")
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+import httpx
+from benchmarks.common import percentiles
+from sqlalchemy import insert
+from sqlmodel import Session
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import User
+
+SEED_BATCH = 5000
+
+
+def seed(users: int) -> list[str]:
+    database.create_db_and_tables()
+    ids = [uuid4() for _ in range(users)]
+    with Session(database.engine) as session:
+        for offset in range(0, users, SEED_BATCH):
+            session.execute(insert(User), [
+                {"id": user_id, "username": f"user{offset + i}", "email": f"user{offset + i}@example.com",
+                 "first_name": "Bench", "last_name": "User", "password": "x"}
+                for i, user_id in enumerate(ids[offset:offset + SEED_BATCH])
+            ])
+        session.commit()
+    return [str(user_id) for user_id in ids]
+
+
+async def run(args) -> None:
+    ids = seed(args.users)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def per_item(keys):
+            for key in keys:
+                assert (await client.get(f"/users/{key}")).status_code == 200
+
+        async def batch(keys):
+            response = await client.post("/users/batch", json={"ids": keys})
+            assert response.status_code == 200 and None not in response.json()["ids"].values()
+
+        for name, fn in (("per item", per_item), ("batch", batch)):
+            latencies = []
+            for _ in range(args.samples):
+                keys = random.sample(ids, args.keys)
+                start = time.perf_counter()
+                await fn(keys)
+                latencies.append(time.perf_counter() - start)
+            print(f"{name:8} {args.keys} users  {percentiles(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--keys", type=int, default=50, help="users resolved per sample")
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+    logging.getLogger("src.backend.utils.metrics").setLevel(logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measures deleting a prolific user: one cascading transaction against a soft delete plus batched purge.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_user_delete --posts 2000 --comments 20 --batch 500
+
+Seeds an author with ``--posts`` published posts, each carrying
+``--comments`` comments and likes by other users, then deletes the author
+twice (after reseeding):
+
+- ``cascade``: every owned row and the user in one transaction, as a hard
+  delete has to, so the request holds its write locks throughout;
+- ``soft``: DELETE /users/{id}, which only sets the tombstone, followed by
+  the purger, whose longest single transaction bounds how long any other
+  writer can be blocked.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+from src.backend import database
+from src.backend.cruds.crud_purge import UserPurger
+from src.backend.main import app
+from src.backend.models.blogs import Comment, Post, PostLike, PostStatus
+from src.backend.models.social import TimelineEntry
+from src.backend.models.users import User
+from src.backend.utils.security import create_access_token
+
+SEED_BATCH = 2000
+
+
+def user_row(name: str) -> dict:
+    return {"id": uuid4(), "username": name, "email": f"{name}@example.com", "first_name": "Bench", "last_name": "User", "password": "x"}
+
+
+def seed(posts: int, comments: int) -> User:
+    run = uuid4().hex[:6]
+    author = user_row(f"author_{run}")
+    readers = [user_row(f"reader_{run}_{i}") for i in range(comments)]
+    post_ids = [uuid4() for _ in range(posts)]
+    with Session(database.engine) as session:
+        session.execute(insert(User), [author, *readers])
+        session.execute(insert(Post), [
+            {"id": post_id, "author_id": author["id"], "slug": f"post-{post_id.hex}", "title": "Post", "body": "Body",
+             "status": PostStatus.PUBLISHED, "published_at": datetime.utcnow()}
+            for post_id in post_ids
+        ])
+        per_chunk = max(1, SEED_BATCH // max(comments, 1))
+        for offset in range(0, posts, per_chunk):
+            chunk = post_ids[offset:offset + per_chunk]
+            session.execute(insert(Comment), [
+                {"id": uuid4(), "post_id": post_id, "author_id": reader["id"], "body": "Nice"}
+                for post_id in chunk for reader in readers
+            ])
+            session.execute(insert(PostLike), [
+                {"post_id": post_id, "user_id": reader["id"]} for post_id in chunk for reader in readers
+            ])
+        session.commit()
+    return author["id"]
+
+
+def cascade(user_id) -> float:
+    start = time.perf_counter()
+    with Session(database.engine) as session:
+        post_ids = select(Post.id).where(Post.author_id == user_id)
+        session.execute(delete(Comment).where(Comment.post_id.in_(post_ids)))
+        session.execute(delete(PostLike).where(PostLike.post_id.in_(post_ids)))
+        session.execute(delete(TimelineEntry).where(TimelineEntry.post_id.in_(post_ids)))
+        session.execute(delete(Post).where(Post.author_id == user_id))
+        session.execute(delete(User).where(User.id == user_id))
+        session.commit()
+    return time.perf_counter() - start
+
+
+class TimedPurger(UserPurger):
+    """Records how long each committed batch took."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.longest = 0.0
+        self._batch_start = time.perf_counter()
+
+    def _commit_batch(self, deleted: int) -> None:
+        now = time.perf_counter()
+        self.longest = max(self.longest, now - self._batch_start)
+        super()._commit_batch(deleted)
+        self._batch_start = time.perf_counter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=20, help="comments and likes per post")
+    parser.add_argument("--batch", type=int, default=500, help="purger rows per transaction")
+    args = parser.parse_args()
+    logging.getLogger("src.backend.utils.metrics").setLevel(logging.ERROR)
+    database.create_db_and_tables()
+    rows = args.posts * (1 + 2 * args.comments)
+
+    user_id = seed(args.posts, args.comments)
+    print(f"cascade  {rows} rows in one transaction: {cascade(user_id) * 1000:.1f}ms holding locks")
+
+    user_id = seed(args.posts, args.comments)
+    client = TestClient(app)
+    start = time.perf_counter()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id), 'sid': uuid4().hex})}"}
+    assert client.delete(f"/users/{user_id}", headers=headers).status_code == 204
+    request = time.perf_counter() - start
+    purger = TimedPurger(batch_size=args.batch, pause=0)
+    start = time.perf_counter()
+    with Session(database.engine) as session:
+        purger.flush(session)
+    purge = time.perf_counter() - start
+    print(f"soft     DELETE request {request * 1000:.1f}ms; purge {purge * 1000:.1f}ms in {purger.batches} batches, "
+          f"longest transaction {purger.longest * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
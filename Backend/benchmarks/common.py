@@ -0,0 +1,45 @@
+"""Shared helpers for the benchmark scripts.
+
+Importing this module points the app at a throwaway SQLite database unless
+DATABASE_URL is already set, so it must be imported before the app.
+"""
+import os
+import statistics
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+# Every benchmark client shares one IP, which the login limiter would throttle
+os.environ.setdefault("LOGIN_RATE_LIMIT_BACKEND", "none")
+
+from sqlmodel import Session
+from src.backend import database
+from src.backend.models.users import User
+from src.backend.utils.security import hash_password
+
+BENCH_PASSWORD = "benchpassword"
+
+
+def seed_user(username: str = "benchuser") -> str:
+    """Creates the tables and one user, returning its id."""
+    database.create_db_and_tables()
+    with Session(database.engine) as session:
+        user = User(
+            username=username,
+            first_name="Bench",
+            last_name="User",
+            email=f"{username}@example.com",
+            password=hash_password(BENCH_PASSWORD),
+        )
+        session.add(user)
+        session.commit()
+        return str(user.id)
+
+
+def percentiles(samples: list[float]) -> str:
+    """Formats latency samples (seconds) as p50/p95/p99 in milliseconds."""
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return f"n={len(ordered)} p50={pick(0.50):.1f}ms p95={pick(0.95):.1f}ms p99={pick(0.99):.1f}ms mean={statistics.mean(ordered) * 1000:.1f}ms"
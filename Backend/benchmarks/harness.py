@@ -0,0 +1,96 @@
+"""Load driver, latency summaries and baseline comparison for ``benchmarks.load``.
+
+Kept free of app imports so the regression check can be used (and tested)
+without booting the app or touching DATABASE_URL.
+"""
+import asyncio
+import json
+import platform
+import time
+from collections.abc import Awaitable, Callable
+
+# Latency figures a baseline can be compared on
+LATENCY_METRICS = ("p50", "p95", "p99", "mean")
+
+
+def summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    """Turns per-request latencies (seconds) into RPS and percentiles in milliseconds."""
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3) if ordered else 0.0
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def drive(send: Callable[[int], Awaitable[bool]], requests: int, concurrency: int) -> dict:
+    """Runs ``send(i)`` for i in range(requests) from ``concurrency`` workers.
+
+    ``send`` returns whether the response was the expected one; failures
+    count as errors but their latency is still recorded.
+    """
+    samples: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            index, next_index = next_index, next_index + 1
+            start = time.perf_counter()
+            ok = await send(index)
+            samples.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+def format_result(route: str, result: dict) -> str:
+    return (
+        f"{route:12} {result['rps']:>8.1f} req/s  p50={result['p50']:.1f}ms p95={result['p95']:.1f}ms "
+        f"p99={result['p99']:.1f}ms  errors={result['errors']}/{result['requests']}"
+    )
+
+
+###############################################
+# Baselines
+###############################################
+
+def save_baseline(path: str, results: dict[str, dict], settings: dict) -> None:
+    baseline = {"settings": settings, "python": platform.python_version(), "routes": results}
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(results: dict[str, dict], baseline: dict, tolerance: float, metric: str = "p95") -> list[str]:
+    """Lists every route that regressed beyond ``tolerance`` (0.2 = 20%) against the baseline.
+
+    A route regresses when its ``metric`` latency grows, or its throughput
+    drops, by more than the tolerance, or when it starts returning errors.
+    Routes missing from either side are skipped.
+    """
+    regressions = []
+    for route, current in results.items():
+        previous = baseline.get("routes", {}).get(route)
+        if previous is None:
+            continue
+        if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+            regressions.append(f"{route}: {metric} {previous[metric]:.1f}ms -> {current[metric]:.1f}ms")
+        if current["rps"] < previous["rps"] / (1 + tolerance):
+            regressions.append(f"{route}: throughput {previous['rps']:.1f} -> {current['rps']:.1f} req/s")
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{route}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
@@ -0,0 +1,161 @@
+"""Load-tests the main API routes and checks them against a saved baseline.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.load --users 10000 --requests 2000 --concurrency 32 --save-baseline baseline.json
+    python -m benchmarks.load --users 10000 --requests 2000 --concurrency 32 --baseline baseline.json --tolerance 0.2
+
+Seeds ``--users`` users straight into the database, then drives each route
+with ``--concurrency`` concurrent clients over an async httpx client and
+prints RPS and p50/p95/p99 per route, keeping the best of ``--rounds`` runs:
+
+- ``login``: POST /auth/login as a random seeded user
+- ``get_user``: GET /users/{id} for a random seeded user
+- ``list_users``: GET /users/ at a random page depth
+- ``create_user``: POST /users/createuser with a fresh user
+
+By default the app runs in-process over httpx's ASGI transport against a
+throwaway SQLite file; set DATABASE_URL to run against Postgres instead.
+With ``--base-url`` the requests go to a running server, which must use the
+same DATABASE_URL so it sees the seeded users. With ``--baseline`` the run
+exits with status 1 when a route regresses beyond ``--tolerance``.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+from uuid import uuid4
+
+import benchmarks.common  # noqa: F401  (sets the env the app needs)
+import httpx
+from benchmarks.common import BENCH_PASSWORD
+from benchmarks.harness import LATENCY_METRICS, compare, drive, format_result, load_baseline, save_baseline
+from sqlalchemy import insert
+from sqlmodel import Session
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import User
+from src.backend.utils.security import hash_password
+
+ROUTES = ("login", "get_user", "list_users", "create_user")
+SEED_BATCH = 5000
+LIST_PAGE_SIZE = 50
+
+
+def seed(users: int) -> list[tuple[str, str]]:
+    """Inserts ``users`` users sharing one password hash; returns their (id, username)."""
+    database.create_db_and_tables()
+    password = hash_password(BENCH_PASSWORD)
+    run = uuid4().hex[:6]
+    seeded = [(uuid4(), f"load_{run}_{i}") for i in range(users)]
+    with Session(database.engine) as session:
+        for offset in range(0, users, SEED_BATCH):
+            session.execute(insert(User), [
+                {"id": user_id, "username": username, "email": f"{username}@example.com",
+                 "first_name": "Load", "last_name": "Test", "password": password}
+                for user_id, username in seeded[offset:offset + SEED_BATCH]
+            ])
+        session.commit()
+    return [(str(user_id), username) for user_id, username in seeded]
+
+
+async def page_cursors(client: httpx.AsyncClient, pages: int) -> list[str | None]:
+    """Walks the first ``pages`` pages of GET /users/ once, so runs can start at any depth."""
+    cursors: list[str | None] = [None]
+    while len(cursors) < pages:
+        params = {"limit": LIST_PAGE_SIZE, **({"cursor": cursors[-1]} if cursors[-1] else {})}
+        next_cursor = (await client.get("/users/", params=params)).json().get("next_cursor")
+        if not next_cursor:
+            break
+        cursors.append(next_cursor)
+    return cursors
+
+
+def scenarios(client: httpx.AsyncClient, users: list[tuple[str, str]], cursors: list[str | None]) -> dict:
+    async def login(_):
+        _, username = random.choice(users)
+        response = await client.post("/auth/login", data={"username": username, "password": BENCH_PASSWORD})
+        return response.status_code == 200
+
+    async def get_user(_):
+        user_id, _ = random.choice(users)
+        return (await client.get(f"/users/{user_id}")).status_code == 200
+
+    async def list_users(_):
+        cursor = random.choice(cursors)
+        params = {"limit": LIST_PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        return (await client.get("/users/", params=params)).status_code == 200
+
+    async def create_user(_):
+        username = f"new_{uuid4().hex[:12]}"
+        response = await client.post("/users/createuser", json={
+            "username": username, "email": f"{username}@example.com",
+            "first_name": "Load", "last_name": "Test", "password": BENCH_PASSWORD,
+        })
+        return response.status_code == 201
+
+    return {"login": login, "get_user": get_user, "list_users": list_users, "create_user": create_user}
+
+
+async def run(args) -> dict[str, dict]:
+    users = seed(args.users)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+    async with client:
+        cursors = await page_cursors(client, args.list_pages)
+        routes = scenarios(client, users, cursors)
+        results = {}
+        for route in args.routes:
+            requests = args.login_requests if route == "login" else args.requests
+            # Best of --rounds: in-process runs are noisy, and noise only ever adds latency
+            rounds = [await drive(routes[route], requests, args.concurrency) for _ in range(args.rounds)]
+            results[route] = min(rounds, key=lambda result: result[args.metric])
+            print(format_result(route, results[route]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route")
+    parser.add_argument("--login-requests", type=int, default=200, help="requests for login, which hashes on every call")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--routes", type=lambda value: value.split(","), default=list(ROUTES))
+    parser.add_argument("--rounds", type=int, default=3, help="runs per route; the best one is kept")
+    parser.add_argument("--list-pages", type=int, default=20, help="page depths GET /users/ is spread over")
+    parser.add_argument("--base-url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="fail when a route regresses against this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, as a fraction")
+    parser.add_argument("--metric", choices=LATENCY_METRICS, default="p95")
+    parser.add_argument("--log-slow-queries", action="store_true", help="keep the app's slow-query and N+1 warnings")
+    args = parser.parse_args()
+    unknown = set(args.routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+    if not args.log_slow_queries:
+        logging.getLogger("src.backend.utils.metrics").setLevel(logging.ERROR)
+
+    results = asyncio.run(run(args))
+    settings = {key: getattr(args, key) for key in ("users", "requests", "login_requests", "concurrency", "rounds", "list_pages")}
+    settings["dialect"] = database.engine.dialect.name
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, settings)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline.get("settings") != settings:
+            print(f"warning: baseline was recorded with {baseline.get('settings')}")
+        regressions = compare(results, baseline, args.tolerance, args.metric)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no route regressed beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
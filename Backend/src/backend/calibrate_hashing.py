@@ -0,0 +1,42 @@
+"""Picks password hashing parameters for this machine.
+
+Usage (from the Backend directory, with the app's environment set):
+
+    python -m src.backend.calibrate_hashing --target-ms 250
+    python -m src.backend.calibrate_hashing --scheme argon2id --memory-kib 65536 --parallelism 4 --target-ms 250
+
+Prints the highest cost whose verify stays under ``--target-ms`` as the
+environment variables to deploy. Existing users move to the new cost on
+their next successful login.
+"""
+import argparse
+from .utils.security import (
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    PasswordPolicy,
+    calibrate_password_policy,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scheme", choices=PasswordPolicy.SCHEMES, default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250, help="verify time to stay under")
+    parser.add_argument("--memory-kib", type=int, default=ARGON2_MEMORY_COST, help="argon2id memory cost")
+    parser.add_argument("--parallelism", type=int, default=ARGON2_PARALLELISM, help="argon2id lanes")
+    args = parser.parse_args()
+
+    params = {"argon2_memory_cost": args.memory_kib, "argon2_parallelism": args.parallelism}
+    policy, elapsed = calibrate_password_policy(args.scheme, args.target_ms, **params)
+    print(f"# {policy.describe()}: {elapsed:.1f}ms per verify (target {args.target_ms:g}ms)")
+    print(f"PASSWORD_HASH_SCHEME={policy.scheme}")
+    if policy.scheme == "bcrypt":
+        print(f"BCRYPT_ROUNDS={policy.bcrypt_rounds}")
+    else:
+        print(f"ARGON2_TIME_COST={policy.argon2_time_cost}")
+        print(f"ARGON2_MEMORY_COST={policy.argon2_memory_cost}")
+        print(f"ARGON2_PARALLELISM={policy.argon2_parallelism}")
+
+
+if __name__ == "__main__":
+    main()
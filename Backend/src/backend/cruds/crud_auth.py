@@ -0,0 +1,208 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from ..models.auth import RevokedToken
+from ..utils.background import PeriodicFlush
+from ..utils.bloom import BloomFilter
+from ..utils.security import REFRESH_TOKEN_EXPIRE_DAYS
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+REVOCATION_BLOOM_CAPACITY = settings.revocation_bloom_capacity
+REVOCATION_SYNC_SECONDS = settings.revocation_sync_seconds
+REVOCATION_SYNC_OVERLAP_SECONDS = settings.revocation_sync_overlap_seconds
+# How often expired revocations are deleted; every refresh adds one
+REVOCATION_PURGE_SECONDS = settings.revocation_purge_seconds
+
+
+def user_revocation_id(user_id) -> str:
+    """The revocation ID that cancels every token issued to a user, e.g. once they are deleted."""
+    return f"user:{user_id}"
+
+def token_revocation_ids(claims: dict) -> tuple[str | None, str]:
+    """Every revocation ID that can cancel a token: its login session and its user."""
+    return claims.get("sid"), user_revocation_id(claims.get("sub"))
+
+
+class RevocationStore:
+    """Revoked token and session IDs, stored in REVOKED_TOKENS.
+
+    A Bloom filter in front of the table answers "not revoked" in O(1)
+    without touching the database, which is the answer for nearly every
+    request; only possible hits are confirmed with a primary-key lookup.
+    Each worker re-reads revocations made elsewhere every
+    ``sync_seconds``, so another worker's logout takes effect here within
+    that window.
+
+    A row's revoked_at is stamped before its transaction commits, so each
+    sync re-reads ``overlap_seconds`` behind the previous one. A revocation
+    whose transaction takes longer than that to commit, or that reaches
+    this session later than that (a lagging replica), is only picked up by
+    the next full load. Every session handed in must therefore be on the
+    primary, and the overlap must cover the longest transaction.
+    """
+
+    def __init__(self, capacity: int = REVOCATION_BLOOM_CAPACITY, sync_seconds: float = REVOCATION_SYNC_SECONDS,
+                 overlap_seconds: float = REVOCATION_SYNC_OVERLAP_SECONDS):
+        self.sync_seconds = sync_seconds
+        self.overlap_seconds = overlap_seconds
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity)
+        self._synced_until: datetime | None = None
+        self._synced_at = 0.0
+        self.db_checks = 0
+
+###############################################
+# LOAD
+###############################################
+
+    def load(self, db: Session) -> None:
+        """Rebuilds the filter from every unexpired revocation in the table."""
+        now = datetime.utcnow()
+        ids = db.exec(select(RevokedToken.token_id).where(RevokedToken.expires_at > now)).all()
+        bloom = BloomFilter(max(self._bloom.capacity, 2 * len(ids)))
+        for token_id in ids:
+            bloom.add(token_id)
+        with self._lock:
+            self._bloom = bloom
+            self._synced_until = now
+            self._synced_at = time.monotonic()
+
+    def sync(self, db: Session) -> None:
+        """Adds revocations recorded since the last sync, e.g. by other workers."""
+        if self._synced_until is None or self._bloom.is_full:
+            self.load(db)
+            return
+        now = datetime.utcnow()
+        # Revocations stamped before the last sync may have committed since; the
+        # overlap also absorbs clock skew between workers. Re-adding is harmless.
+        since = self._synced_until - timedelta(seconds=self.overlap_seconds)
+        stmt = select(RevokedToken.token_id).where(RevokedToken.revoked_at >= since)
+        for token_id in db.exec(stmt).all():
+            self._bloom.add(token_id)
+        with self._lock:
+            self._synced_until = now
+            self._synced_at = time.monotonic()
+
+    def needs_sync(self) -> bool:
+        return self._synced_until is None or time.monotonic() - self._synced_at >= self.sync_seconds
+
+###############################################
+# CHECK
+###############################################
+
+    def might_be_revoked(self, *token_ids: str | None) -> list[str]:
+        """Returns the IDs the filter cannot rule out; an empty list means none are revoked."""
+        return [token_id for token_id in token_ids if token_id and token_id in self._bloom]
+
+    def is_revoked(self, db: Session, *token_ids: str | None, issued_at: float | None = None) -> bool:
+        """Checks the filter, then confirms possible hits against the table.
+
+        With ``issued_at`` (the token's ``iat``) a revocation only counts if
+        it was made after the token was issued, so a user can log in again
+        after their password changed. Tokens without ``iat`` predate it and
+        are revoked by any match.
+        """
+        if self.needs_sync():
+            self.sync(db)
+        candidates = self.might_be_revoked(*token_ids)
+        if not candidates:
+            return False
+        self.db_checks += 1
+        stmt = select(RevokedToken.token_id).where(RevokedToken.token_id.in_(candidates))
+        if issued_at is not None:
+            stmt = stmt.where(RevokedToken.revoked_at >= datetime.utcfromtimestamp(issued_at))
+        return db.exec(stmt).first() is not None
+
+###############################################
+# REVOKE
+###############################################
+
+    def revoke(self, db: Session, token_id: str, expires_at: datetime) -> bool:
+        """Revokes an ID until ``expires_at``.
+
+        The insert doubles as an atomic claim: it returns False if the ID was
+        already revoked, which is how refresh-token reuse is detected.
+        """
+        try:
+            db.add(RevokedToken(token_id=token_id, expires_at=expires_at))
+            db.commit()
+            revoked = True
+        except IntegrityError:
+            db.rollback()
+            revoked = False
+        self._bloom.add(token_id)
+        return revoked
+
+    def revoke_user(self, db: Session, user_id) -> None:
+        """Revokes every token issued to ``user_id`` so far; the caller commits.
+
+        Tokens issued later still work (see ``is_revoked``), so the same row
+        is moved forward on every password change. It outlives the
+        longest-lived token, the refresh token.
+        """
+        token_id = user_revocation_id(user_id)
+        now = datetime.utcnow()
+        values = {"revoked_at": now, "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)}
+        if not db.execute(update(RevokedToken).where(RevokedToken.token_id == token_id).values(**values)).rowcount:
+            db.add(RevokedToken(token_id=token_id, **values))
+        self._bloom.add(token_id)
+
+    def purge_expired(self, db: Session) -> int:
+        """Deletes revocations whose tokens have expired anyway."""
+        result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        db.commit()
+        return result.rowcount
+
+    def stats(self) -> dict:
+        return {
+            "bloom_items": self._bloom.count,
+            "bloom_capacity": self._bloom.capacity,
+            "bloom_hash_count": self._bloom.hash_count,
+            "db_checks": self.db_checks,
+        }
+
+
+revocation_store = RevocationStore()
+
+
+class RevocationPurger(PeriodicFlush):
+    """Deletes expired revocations every ``interval`` seconds, so REVOKED_TOKENS stays bounded.
+
+    A token past its ``exp`` fails verification on its own, so its row is
+    dead weight. The work is driven by time, not by a queue: every run
+    issues one DELETE on the expires_at index.
+    """
+
+    name = "revocation purge"
+
+    def __init__(self, store: RevocationStore, interval: float = REVOCATION_PURGE_SECONDS):
+        super().__init__(interval)
+        self.store = store
+        self.purged = 0
+
+    @property
+    def pending(self) -> int:
+        # Something may have expired since the last run
+        return 1
+
+    def flush(self, db: Session) -> int:
+        """Deletes every expired revocation.
+
+        Returns:
+            int: Number of revocations deleted
+        """
+        purged = self.store.purge_expired(db)
+        self.purged += purged
+        return purged
+
+    def stats(self) -> dict:
+        return {"purged": self.purged, "failures": self.failures, "running": self.running}
+
+
+revocation_purger = RevocationPurger(revocation_store)
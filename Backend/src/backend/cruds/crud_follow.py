@@ -0,0 +1,83 @@
+from uuid import UUID
+from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from ..models.social import Follow, FollowerCount
+from ..models.users import USER_IS_LIVE, User
+from .crud_timeline import TimelineCRUD
+from fastapi import HTTPException, status
+
+
+class FollowCRUD:
+    """ CRUD operations for Follow model """
+
+###############################################
+# CREATE
+###############################################
+
+    @staticmethod
+    def _bump_follower_count(db: Session, user_id: UUID, delta: int) -> None:
+        bump = update(FollowerCount).where(FollowerCount.user_id == user_id).values(follower_count=FollowerCount.follower_count + delta)
+        if db.execute(bump).rowcount:
+            return
+        try:
+            with db.begin_nested():
+                db.add(FollowerCount(user_id=user_id, follower_count=max(delta, 0)))
+        except IntegrityError:
+            # A concurrent follow created the row first
+            db.execute(bump)
+
+    @staticmethod
+    def follow(db: Session, follower_id: UUID, followee_id: UUID) -> None:
+        """Follow a user and backfill their latest posts into the follower's timeline.
+
+        Args:
+            db (Session): Database session
+            follower_id (UUID): The authenticated user
+            followee_id (UUID): The user to follow
+
+        Raises:
+            HTTPException: If following yourself, the user does not exist or is already followed
+        """
+        if follower_id == followee_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot follow yourself")
+        if db.exec(select(User.id).where(User.id == followee_id, USER_IS_LIVE)).first() is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        try:
+            db.add(Follow(follower_id=follower_id, followee_id=followee_id))
+            db.flush()
+            FollowCRUD._bump_follower_count(db, followee_id, 1)
+            TimelineCRUD.backfill(db, follower_id, followee_id)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already following this user")
+
+###############################################
+# GETTERS
+###############################################
+
+    @staticmethod
+    def get_following(db: Session, user_id: UUID) -> list[UUID]:
+        """IDs of the users ``user_id`` follows, leaving out soft-deleted ones."""
+        stmt = select(Follow.followee_id).join(User, User.id == Follow.followee_id).where(Follow.follower_id == user_id, USER_IS_LIVE)
+        return db.exec(stmt).all()
+
+###############################################
+# DELETE
+###############################################
+
+    @staticmethod
+    def unfollow(db: Session, follower_id: UUID, followee_id: UUID) -> None:
+        """Unfollow a user and drop their posts from the follower's timeline.
+
+        Raises:
+            HTTPException: If the user is not followed
+        """
+        removed = db.execute(delete(Follow).where(Follow.follower_id == follower_id, Follow.followee_id == followee_id))
+        if removed.rowcount == 0:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not following this user")
+        FollowCRUD._bump_follower_count(db, followee_id, -1)
+        TimelineCRUD.remove_author(db, follower_id, followee_id)
+        db.commit()
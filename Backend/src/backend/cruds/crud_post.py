@@ -0,0 +1,298 @@
+import re
+from datetime import datetime
+from uuid import UUID, uuid4
+from sqlmodel import Session, and_, or_, select, tuple_
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from ..models.blogs import AUTHOR_IS_LIVE, Comment, Post, PostLike, PostStatus
+from ..schemas.post_schema import CommentCreate, PostCreate, PostUpdate
+from ..utils.pagination import decode_cursor, encode_cursor
+from .crud_search import search_indexer
+from .crud_timeline import TimelineCRUD
+from fastapi import HTTPException, status
+
+
+def _slugify(title: str) -> str:
+    """Builds a URL slug from a title, with a short random suffix to keep it unique."""
+    base = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")[:100] or "post"
+    return f"{base}-{uuid4().hex[:8]}"
+
+def _post_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+def _is_visible(post, viewer_id: UUID | None) -> bool:
+    """Published posts are public; drafts and archived posts exist only for their author."""
+    return post.status == PostStatus.PUBLISHED or (viewer_id is not None and post.author_id == viewer_id)
+
+def _visible_to(viewer_id: UUID):
+    """``_is_visible`` as a WHERE criterion, for statements that must not load the post first."""
+    return and_(AUTHOR_IS_LIVE, or_(Post.status == PostStatus.PUBLISHED, Post.author_id == viewer_id))
+
+class PostCRUD:
+    """ CRUD operations for Post model """
+
+###############################################
+# CREATE
+###############################################
+
+    @staticmethod
+    def create_post(db: Session, author_id: UUID, post: PostCreate) -> Post:
+        """Creates a new post for an author.
+
+        Args:
+            db (Session): Database session
+            author_id (UUID): ID of the authenticated author
+            post (PostCreate): pydantic model for creating a post
+
+        Raises:
+            HTTPException: If the slug is already in use
+
+        Returns:
+            Post: The created post
+        """
+        new_post = Post(
+            author_id=author_id,
+            slug=post.slug or _slugify(post.title),
+            title=post.title,
+            body=post.body,
+            status=post.status,
+            published_at=datetime.utcnow() if post.status == PostStatus.PUBLISHED else None,
+        )
+        try:
+            new_post = db.execute(insert(Post).values(**new_post.model_dump()).returning(Post)).scalar_one()
+            if new_post.status == PostStatus.PUBLISHED:
+                TimelineCRUD.fan_out(db, new_post)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already in use")
+        search_indexer.mark_dirty("post", new_post.id)
+        return new_post
+
+###############################################
+# GETTERS
+###############################################
+
+    @staticmethod
+    def get_post_by_id(db: Session, post_id: UUID, viewer_id: UUID | None = None) -> Post:
+        """Fetch a post by ID; only its author sees it unless it is published.
+
+        Raises:
+            HTTPException: If post not found or not visible to ``viewer_id``
+        """
+        post = db.exec(select(Post).where(Post.id == post_id, AUTHOR_IS_LIVE)).first()
+        if not post or not _is_visible(post, viewer_id):
+            raise _post_not_found()
+        return post
+
+    @staticmethod
+    def get_post_by_slug(db: Session, slug: str, viewer_id: UUID | None = None) -> Post:
+        """Fetch a post by slug; only its author sees it unless it is published.
+
+        Raises:
+            HTTPException: If post not found or not visible to ``viewer_id``
+        """
+        post = db.exec(select(Post).where(Post.slug == slug, AUTHOR_IS_LIVE)).first()
+        if not post or not _is_visible(post, viewer_id):
+            raise _post_not_found()
+        return post
+
+    @staticmethod
+    def get_post_version(db: Session, post_id: UUID | None = None, slug: str | None = None, viewer_id: UUID | None = None):
+        """Fetch only the columns that identify a post's version, for conditional requests.
+
+        Likes and comments change the counters without touching ``updated_at``,
+        so the counters are part of the version. Status and author are read
+        too, so a draft answers 404 to everyone but its author here as well.
+
+        Raises:
+            HTTPException: If post not found or not visible to ``viewer_id``
+
+        Returns:
+            Row: id, updated_at, like_count, comment_count, status and author_id
+        """
+        stmt = select(Post.id, Post.updated_at, Post.like_count, Post.comment_count, Post.status, Post.author_id)
+        stmt = stmt.where(AUTHOR_IS_LIVE)
+        stmt = stmt.where(Post.id == post_id) if post_id is not None else stmt.where(Post.slug == slug)
+        row = db.exec(stmt).first()
+        if not row or not _is_visible(row, viewer_id):
+            raise _post_not_found()
+        return row
+
+    @staticmethod
+    def _page(db: Session, stmt, limit: int, cursor: str | None) -> tuple[list[Post], str | None]:
+        """Runs a newest-first keyset page over (published_at, id)."""
+        stmt = stmt.order_by(Post.published_at.desc(), Post.id.desc()).limit(limit + 1)
+        if cursor:
+            published_at, post_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Post.published_at, Post.id) < tuple_(published_at, post_id))
+        posts = db.exec(stmt).all()
+        if len(posts) <= limit:
+            return posts, None
+        posts = posts[:limit]
+        return posts, encode_cursor(posts[-1].published_at, posts[-1].id)
+
+    @staticmethod
+    def get_feed_page(db: Session, limit: int, cursor: str | None = None, columns: tuple | None = None) -> tuple[list[Post], str | None]:
+        """Fetch one page of the home feed: published posts, newest first.
+
+        Each page is a single range scan on (status, published_at DESC, id DESC).
+
+        Args:
+            db (Session): Database Session
+            limit (int): Maximum number of posts on the page
+            cursor (str | None): Opaque cursor returned by the previous page
+            columns (tuple | None): Select just these columns (including published_at and id) and return rows, not Posts
+
+        Returns:
+            tuple[list[Post], str | None]: The posts and the cursor of the next page, if any
+        """
+        stmt = (select(*columns) if columns else select(Post)).where(Post.status == PostStatus.PUBLISHED, AUTHOR_IS_LIVE)
+        return PostCRUD._page(db, stmt, limit, cursor)
+
+    @staticmethod
+    def get_author_page(db: Session, author_id: UUID, limit: int, cursor: str | None = None, columns: tuple | None = None) -> tuple[list[Post], str | None]:
+        """Fetch one page of an author's published posts, newest first.
+
+        Each page is a single range scan on (author_id, status, published_at DESC, id DESC).
+        """
+        stmt = select(*columns) if columns else select(Post)
+        stmt = stmt.where(Post.author_id == author_id, Post.status == PostStatus.PUBLISHED, AUTHOR_IS_LIVE)
+        return PostCRUD._page(db, stmt, limit, cursor)
+
+###############################################
+# UPDATE
+###############################################
+
+    @staticmethod
+    def _get_own_post(db: Session, post_id: UUID, author_id: UUID) -> Post:
+        post = db.get(Post, post_id)
+        if not post:
+            raise _post_not_found()
+        if post.author_id != author_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not the author of this post")
+        return post
+
+    @staticmethod
+    def update_post(db: Session, post_id: UUID, author_id: UUID, post_update: PostUpdate) -> Post:
+        """Update a post owned by the author.
+
+        Publishing a post for the first time stamps ``published_at``. Publishing
+        pushes it to followers' timelines and unpublishing retracts it.
+
+        Raises:
+            HTTPException: If post not found or not owned by the author
+        """
+        post = PostCRUD._get_own_post(db, post_id, author_id)
+        was_published = post.status == PostStatus.PUBLISHED
+        for key, value in post_update.model_dump(exclude_unset=True, exclude_none=True).items():
+            setattr(post, key, value)
+        if post.status == PostStatus.PUBLISHED and post.published_at is None:
+            post.published_at = datetime.utcnow()
+        post.updated_at = datetime.utcnow()
+        db.add(post)
+        db.flush()
+        if post.status == PostStatus.PUBLISHED and not was_published:
+            TimelineCRUD.fan_out(db, post)
+        elif was_published and post.status != PostStatus.PUBLISHED:
+            TimelineCRUD.retract(db, post.id)
+        db.commit()
+        search_indexer.mark_dirty("post", post.id)
+        return post
+
+###############################################
+# DELETE
+###############################################
+
+    @staticmethod
+    def delete_post(db: Session, post_id: UUID, author_id: UUID) -> None:
+        """Delete a post owned by the author, with its comments, likes and timeline entries.
+
+        Raises:
+            HTTPException: If post not found or not owned by the author
+        """
+        post = PostCRUD._get_own_post(db, post_id, author_id)
+        db.execute(delete(Comment).where(Comment.post_id == post_id))
+        db.execute(delete(PostLike).where(PostLike.post_id == post_id))
+        TimelineCRUD.retract(db, post_id)
+        db.delete(post)
+        db.commit()
+        search_indexer.mark_dirty("post", post_id)
+
+###############################################
+# LIKES AND COMMENTS
+###############################################
+
+    @staticmethod
+    def like_post(db: Session, post_id: UUID, user_id: UUID) -> None:
+        """Like a post, bumping its like counter in the same transaction.
+
+        Only posts the user can see can be liked.
+
+        Raises:
+            HTTPException: If post not found, not visible to the user or already liked by the user
+        """
+        bumped = db.execute(update(Post).where(Post.id == post_id, _visible_to(user_id)).values(like_count=Post.like_count + 1))
+        if bumped.rowcount == 0:
+            db.rollback()
+            raise _post_not_found()
+        try:
+            db.execute(insert(PostLike).values(post_id=post_id, user_id=user_id, created_at=datetime.utcnow()))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Post already liked")
+
+    @staticmethod
+    def unlike_post(db: Session, post_id: UUID, user_id: UUID) -> None:
+        """Remove a like, decrementing the counter in the same transaction.
+
+        Raises:
+            HTTPException: If the user has not liked the post
+        """
+        removed = db.execute(delete(PostLike).where(PostLike.post_id == post_id, PostLike.user_id == user_id))
+        if removed.rowcount == 0:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Like not found")
+        db.execute(update(Post).where(Post.id == post_id).values(like_count=Post.like_count - 1))
+        db.commit()
+
+    @staticmethod
+    def add_comment(db: Session, post_id: UUID, author_id: UUID, comment: CommentCreate) -> Comment:
+        """Comment on a post, bumping its comment counter in the same transaction.
+
+        Only posts the commenter can see take comments.
+
+        Raises:
+            HTTPException: If post not found or not visible to the commenter
+        """
+        bumped = db.execute(update(Post).where(Post.id == post_id, _visible_to(author_id)).values(comment_count=Post.comment_count + 1))
+        if bumped.rowcount == 0:
+            db.rollback()
+            raise _post_not_found()
+        new_comment = Comment(post_id=post_id, author_id=author_id, body=comment.body)
+        db.add(new_comment)
+        db.commit()
+        return new_comment
+
+    @staticmethod
+    def get_comments_page(db: Session, post_id: UUID, limit: int, cursor: str | None = None, viewer_id: UUID | None = None) -> tuple[list[Comment], str | None]:
+        """Fetch one page of a post's comments, oldest first; a draft's comments only for its author.
+
+        Each page is a single range scan on (post_id, created_at, id).
+
+        Raises:
+            HTTPException: If post not found or not visible to ``viewer_id``
+        """
+        post = db.exec(select(Post.status, Post.author_id).where(Post.id == post_id, AUTHOR_IS_LIVE)).first()
+        if not post or not _is_visible(post, viewer_id):
+            raise _post_not_found()
+        stmt = select(Comment).where(Comment.post_id == post_id).order_by(Comment.created_at, Comment.id).limit(limit + 1)
+        if cursor:
+            created_at, comment_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Comment.created_at, Comment.id) > tuple_(created_at, comment_id))
+        comments = db.exec(stmt).all()
+        if len(comments) <= limit:
+            return comments, None
+        comments = comments[:limit]
+        return comments, encode_cursor(comments[-1].created_at, comments[-1].id)
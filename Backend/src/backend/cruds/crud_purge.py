@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import Counter
+from uuid import UUID
+from sqlmodel import Session, select, tuple_
+from sqlalchemy import delete, func, update
+from sqlalchemy.exc import IntegrityError
+from ..models.blogs import Comment, Post, PostLike
+from ..models.social import Follow, FollowerCount, TimelineEntry
+from ..models.users import User
+from ..utils.background import PeriodicFlush
+from .crud_search import search_indexer
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+USER_PURGE_INTERVAL = settings.user_purge_interval
+# Rows deleted per transaction, and the pause after each, so a prolific account never holds locks for long
+USER_PURGE_BATCH = settings.user_purge_batch
+USER_PURGE_PAUSE = settings.user_purge_pause
+
+
+class UserPurger(PeriodicFlush):
+    """Removes soft-deleted users and everything they own, off the request path.
+
+    DELETE /users/{id} only sets the tombstone. The purger works through
+    the tombstones oldest first, deleting the user's posts (with their
+    comments, likes and timeline entries), then the user's own comments,
+    likes, follows and timeline, then the user row. Every step deletes at
+    most ``batch_size`` rows per committed transaction and sleeps
+    ``pause`` seconds in between. The queue lives in the database, so a
+    purge interrupted by a restart resumes where it stopped; each step is
+    idempotent.
+    """
+
+    name = "user purge"
+
+    def __init__(self, interval: float = USER_PURGE_INTERVAL, batch_size: int = USER_PURGE_BATCH, pause: float = USER_PURGE_PAUSE):
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+        self._queued: set[UUID] = set()
+        # Tombstones may be left over from before a restart, so look once at startup
+        self._recheck = True
+        self._stopping = False
+        self.current: UUID | None = None
+        self.users_purged = 0
+        self.rows_deleted = 0
+        self.batches = 0
+
+    def mark(self, user_id: UUID) -> None:
+        with self._lock:
+            self._queued.add(user_id)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queued) + self._recheck
+
+    async def stop(self) -> None:
+        # The queue is durable: finish the current batch instead of draining it on shutdown
+        self._stopping = True
+        try:
+            await super().stop()
+        finally:
+            self._stopping = False
+
+    def _flush_engine(self) -> int:
+        with self._flushing:
+            # When stopping, this only waits for a flush in progress to notice
+            return 0 if self._stopping else super()._flush_engine()
+
+###############################################
+# FLUSH
+###############################################
+
+    def flush(self, db: Session) -> int:
+        """Purges tombstoned users until none is left or the purger is stopped.
+
+        Returns:
+            int: Number of users removed
+        """
+        with self._lock:
+            self._queued.clear()
+            self._recheck = False
+        purged = 0
+        try:
+            while not self._stopping:
+                user_id = db.exec(
+                    select(User.id).where(User.deleted_at.is_not(None)).order_by(User.deleted_at).limit(1)
+                ).first()
+                if user_id is None:
+                    break
+                self.current = user_id
+                if not self.purge_user(db, user_id):
+                    break
+                purged += 1
+                with self._lock:
+                    self._queued.discard(user_id)
+        except Exception:
+            db.rollback()
+            self._recheck = True
+            raise
+        finally:
+            self.current = None
+        return purged
+
+    def purge_user(self, db: Session, user_id: UUID) -> bool:
+        """Deletes one tombstoned user's data in batches, then the user.
+
+        Returns:
+            bool: Whether the user row is gone; False when stopped midway
+        """
+        steps = (
+            self._purge_posts,
+            self._purge_comments,
+            self._purge_likes,
+            self._purge_follows,
+            self._purge_timeline,
+        )
+        for step in steps:
+            step(db, user_id)
+            if self._stopping:
+                return False
+        db.execute(delete(FollowerCount).where(FollowerCount.user_id == user_id))
+        try:
+            db.execute(delete(User).where(User.id == user_id, User.deleted_at.is_not(None)))
+            db.commit()
+        except IntegrityError:
+            # Something was written for the user mid-purge (e.g. a post from a still-valid token);
+            # the tombstone stays, so the next flush purges again
+            db.rollback()
+            self._recheck = True
+            return False
+        self.users_purged += 1
+        self.rows_deleted += 1
+        search_indexer.mark_dirty("user", user_id)
+        return True
+
+    def _commit_batch(self, deleted: int) -> None:
+        self.batches += 1
+        self.rows_deleted += deleted
+        if self.pause:
+            time.sleep(self.pause)
+
+    def _delete_batched(self, db: Session, model, key: tuple, condition) -> int:
+        """Deletes the rows of ``model`` matching ``condition``, ``batch_size`` primary keys per transaction."""
+        deleted = 0
+        while not self._stopping:
+            batch = select(*key).where(condition).limit(self.batch_size)
+            target = key[0].in_(batch) if len(key) == 1 else tuple_(*key).in_(batch)
+            count = db.execute(delete(model).where(target)).rowcount
+            db.commit()
+            deleted += count
+            self._commit_batch(count)
+            if count < self.batch_size:
+                break
+        return deleted
+
+    def _purge_posts(self, db: Session, user_id: UUID) -> None:
+        while not self._stopping:
+            post_ids = db.exec(select(Post.id).where(Post.author_id == user_id).limit(self.batch_size)).all()
+            if not post_ids:
+                return
+            self._delete_batched(db, Comment, (Comment.id,), Comment.post_id.in_(post_ids))
+            self._delete_batched(db, PostLike, (PostLike.post_id, PostLike.user_id), PostLike.post_id.in_(post_ids))
+            self._delete_batched(db, TimelineEntry, (TimelineEntry.user_id, TimelineEntry.post_id), TimelineEntry.post_id.in_(post_ids))
+            if self._stopping:
+                return
+            count = db.execute(delete(Post).where(Post.id.in_(post_ids))).rowcount
+            db.commit()
+            self._commit_batch(count)
+            search_indexer.mark_dirty("post", *post_ids)
+
+    def _purge_comments(self, db: Session, user_id: UUID) -> None:
+        """The user's comments on other authors' posts, keeping their comment_count right.
+
+        Counters are decremented for the rows the DELETE returns, not the
+        ones selected, so a concurrent purge of the same user never
+        decrements them twice.
+        """
+        while not self._stopping:
+            batch = select(Comment.id).where(Comment.author_id == user_id).limit(self.batch_size)
+            post_ids = db.execute(delete(Comment).where(Comment.id.in_(batch)).returning(Comment.post_id)).scalars().all()
+            for post_id, count in Counter(post_ids).items():
+                db.execute(update(Post).where(Post.id == post_id).values(comment_count=Post.comment_count - count))
+            db.commit()
+            if not post_ids:
+                return
+            self._commit_batch(len(post_ids))
+
+    def _purge_likes(self, db: Session, user_id: UUID) -> None:
+        """The user's likes on other authors' posts, keeping their like_count right."""
+        while not self._stopping:
+            batch = select(PostLike.post_id).where(PostLike.user_id == user_id).limit(self.batch_size)
+            stmt = delete(PostLike).where(PostLike.user_id == user_id, PostLike.post_id.in_(batch)).returning(PostLike.post_id)
+            post_ids = db.execute(stmt).scalars().all()
+            if post_ids:
+                db.execute(update(Post).where(Post.id.in_(post_ids)).values(like_count=Post.like_count - 1))
+            db.commit()
+            if not post_ids:
+                return
+            self._commit_batch(len(post_ids))
+
+    def _purge_follows(self, db: Session, user_id: UUID) -> None:
+        """Who the user follows (keeping FOLLOWER_COUNTS right), then who follows the user."""
+        while not self._stopping:
+            batch = select(Follow.followee_id).where(Follow.follower_id == user_id).limit(self.batch_size)
+            stmt = delete(Follow).where(Follow.follower_id == user_id, Follow.followee_id.in_(batch)).returning(Follow.followee_id)
+            followee_ids = db.execute(stmt).scalars().all()
+            if followee_ids:
+                db.execute(
+                    update(FollowerCount).where(FollowerCount.user_id.in_(followee_ids))
+                    .values(follower_count=FollowerCount.follower_count - 1)
+                )
+            db.commit()
+            if not followee_ids:
+                break
+            self._commit_batch(len(followee_ids))
+        self._delete_batched(db, Follow, (Follow.follower_id, Follow.followee_id), Follow.followee_id == user_id)
+
+    def _purge_timeline(self, db: Session, user_id: UUID) -> None:
+        self._delete_batched(db, TimelineEntry, (TimelineEntry.user_id, TimelineEntry.post_id), TimelineEntry.user_id == user_id)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._queued),
+            "current": str(self.current) if self.current else None,
+            "users_purged": self.users_purged,
+            "rows_deleted": self.rows_deleted,
+            "batches": self.batches,
+            "failures": self.failures,
+            "running": self.running,
+        }
+
+    @staticmethod
+    def tombstones(db: Session) -> int:
+        """Soft-deleted users still waiting for the purger, counted on the partial deleted_at index."""
+        return db.exec(select(func.count()).select_from(User).where(User.deleted_at.is_not(None))).one()
+
+
+user_purger = UserPurger()
@@ -0,0 +1,173 @@
+import threading
+from uuid import UUID
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from ..models.blogs import AUTHOR_IS_LIVE, Post, PostStatus
+from ..models.users import USER_IS_LIVE, User
+from ..utils.background import PeriodicFlush
+from ..utils.search import SEARCH_BACKENDS, get_search_backend, search_terms
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+SEARCH_INDEX_INTERVAL = settings.search_index_interval
+SEARCH_INDEX_BATCH = settings.search_index_batch
+
+SEARCH_KINDS = ("user", "post")
+
+def _documents(db: Session, kind: str, ids: list[UUID]) -> tuple[list[tuple[str, UUID, str, str]], list[UUID]]:
+    """Loads the current documents for ``ids``; also returns the IDs that should not be indexed."""
+    if kind == "user":
+        stmt = select(User.id, User.username, User.first_name, User.last_name).where(User.id.in_(ids), USER_IS_LIVE)
+        documents = [("user", row.id, row.username, f"{row.first_name} {row.last_name}") for row in db.exec(stmt)]
+    else:
+        stmt = select(Post.id, Post.title, Post.body).where(Post.id.in_(ids), Post.status == PostStatus.PUBLISHED, AUTHOR_IS_LIVE)
+        documents = [("post", row.id, row.title, row.body) for row in db.exec(stmt)]
+    found = {document[1] for document in documents}
+    return documents, [ref_id for ref_id in ids if ref_id not in found]
+
+
+class SearchIndexer(PeriodicFlush):
+    """Keeps the search index in step with USERS and published POSTS.
+
+    CRUD writes only mark rows dirty, which is a set insert with no I/O. A
+    background task re-reads the dirty rows every ``interval`` seconds and
+    writes their documents, so writes never wait on the index and a burst
+    of edits to one row is indexed once. Rows that are gone, and posts that
+    are no longer published, are removed from the index.
+    """
+
+    name = "search index"
+
+    def __init__(self, interval: float = SEARCH_INDEX_INTERVAL, batch_size: int = SEARCH_INDEX_BATCH):
+        super().__init__(interval)
+        self.batch_size = batch_size
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._pending: set[tuple[str, UUID]] = set()
+        self.indexed = 0
+        self.removed = 0
+
+    def mark_dirty(self, kind: str, *ids: UUID) -> None:
+        """Queues rows for (re)indexing on the next flush."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.update((kind, ref_id) for ref_id in ids)
+
+###############################################
+# FLUSH
+###############################################
+
+    def _take(self) -> list[tuple[str, UUID]]:
+        with self._lock:
+            return [self._pending.pop() for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def flush(self, db: Session) -> int:
+        """Indexes every dirty row now, one transaction per batch.
+
+        A failed batch is queued again before the error propagates.
+
+        Returns:
+            int: Number of rows processed
+        """
+        backend = get_search_backend(db.get_bind().dialect.name)
+        processed = 0
+        while batch := self._take():
+            try:
+                indexed = removed = 0
+                for kind in SEARCH_KINDS:
+                    ids = [ref_id for batch_kind, ref_id in batch if batch_kind == kind]
+                    if not ids:
+                        continue
+                    documents, missing = _documents(db, kind, ids)
+                    backend.upsert(db, documents)
+                    backend.remove(db, kind, missing)
+                    indexed += len(documents)
+                    removed += len(missing)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self._pending.update(batch)
+                raise
+            self.indexed += indexed
+            self.removed += removed
+            processed += len(batch)
+        return processed
+
+    def rebuild(self, db: Session) -> int:
+        """Empties the index and re-indexes every user and published post.
+
+        Commits per batch, so searches see a partial index until it finishes.
+
+        Returns:
+            int: Number of documents indexed
+        """
+        backend = get_search_backend(db.get_bind().dialect.name)
+        backend.clear(db)
+        db.commit()
+        total = 0
+        for kind, model in (("user", User), ("post", Post)):
+            last_id = None
+            while True:
+                stmt = select(model.id).order_by(model.id).limit(self.batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(model.id > last_id)
+                ids = db.exec(stmt).all()
+                if not ids:
+                    break
+                documents, _ = _documents(db, kind, ids)
+                backend.upsert(db, documents)
+                db.commit()
+                total += len(documents)
+                last_id = ids[-1]
+        return total
+
+###############################################
+# BACKGROUND TASK
+###############################################
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def start(self, engine: Engine) -> None:
+        """Starts the periodic flush, unless the dialect has no search backend."""
+        if engine.dialect.name not in SEARCH_BACKENDS:
+            self.enabled = False
+            return
+        super().start(engine)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "indexed": self.indexed,
+            "removed": self.removed,
+            "failures": self.failures,
+            "running": self.running,
+        }
+
+
+search_indexer = SearchIndexer()
+
+
+class SearchCRUD:
+    """ Read side of the full-text search index """
+
+    @staticmethod
+    def search(db: Session, query: str, kind: str | None, limit: int) -> list[dict]:
+        """Ranked prefix search over usernames and names, and post titles and bodies.
+
+        Args:
+            db (Session): Database Session
+            query (str): Free-text query; every word must match, as a prefix
+            kind (str | None): Restrict results to "user" or "post"
+            limit (int): Maximum number of hits
+
+        Returns:
+            list[dict]: Hits with kind, id, title and rank, best first
+        """
+        backend = get_search_backend(db.get_bind().dialect.name)
+        return backend.search(db, search_terms(query), kind, limit)
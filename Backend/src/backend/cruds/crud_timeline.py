@@ -0,0 +1,250 @@
+import threading
+from uuid import UUID
+from sqlmodel import Session, select, tuple_
+from sqlalchemy import delete, func, insert, literal, or_, update
+from ..models.blogs import AUTHOR_IS_LIVE, Post, PostStatus
+from ..models.social import Follow, FollowerCount, TimelineEntry
+from ..utils.background import PeriodicFlush
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+# Authors with more followers than this are pulled on read instead of pushed on publish
+TIMELINE_FANOUT_LIMIT = settings.timeline_fanout_limit
+TIMELINE_MAX_ENTRIES = settings.timeline_max_entries
+TIMELINE_TRIM_SECONDS = settings.timeline_trim_seconds
+TIMELINE_TRIM_BATCH = settings.timeline_trim_batch
+
+
+class TimelineTrimmer(PeriodicFlush):
+    """Caps every timeline at ``max_entries``, off the request path.
+
+    Fan-out only appends, so the oldest entries of each touched timeline
+    are deleted in the background: publishing marks the author (all of
+    whose followers grew by one entry) and a follow marks the follower.
+    """
+
+    name = "timeline trim"
+
+    def __init__(self, max_entries: int = TIMELINE_MAX_ENTRIES, interval: float = TIMELINE_TRIM_SECONDS, batch_size: int = TIMELINE_TRIM_BATCH):
+        super().__init__(interval)
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._authors: set[UUID] = set()
+        self._users: set[UUID] = set()
+        self.trimmed = 0
+
+    def mark_author(self, author_id: UUID) -> None:
+        with self._lock:
+            self._authors.add(author_id)
+
+    def mark_users(self, *user_ids: UUID) -> None:
+        with self._lock:
+            self._users.update(user_ids)
+
+    @property
+    def pending(self) -> int:
+        return len(self._authors) + len(self._users)
+
+    def flush(self, db: Session) -> int:
+        """Trims every marked timeline now, one transaction per batch of users.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        with self._lock:
+            authors, self._authors = self._authors, set()
+            users, self._users = self._users, set()
+        trimmed = 0
+        try:
+            # Popular authors share followers, so each timeline is trimmed once per flush
+            for author_id in authors:
+                users.update(db.exec(select(Follow.follower_id).where(Follow.followee_id == author_id)).all())
+            users = list(users)
+            for start in range(0, len(users), self.batch_size):
+                trimmed += self._trim(db, users[start:start + self.batch_size])
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._authors.update(authors)
+                self._users.update(users)
+            raise
+        return trimmed
+
+    def _trim(self, db: Session, user_ids: list[UUID]) -> int:
+        position = func.row_number().over(
+            partition_by=TimelineEntry.user_id,
+            order_by=(TimelineEntry.published_at.desc(), TimelineEntry.post_id.desc()),
+        )
+        ranked = select(TimelineEntry.user_id, TimelineEntry.post_id, position.label("position")).where(TimelineEntry.user_id.in_(user_ids)).subquery()
+        stale = select(ranked.c.user_id, ranked.c.post_id).where(ranked.c.position > self.max_entries)
+        result = db.execute(delete(TimelineEntry).where(tuple_(TimelineEntry.user_id, TimelineEntry.post_id).in_(stale)))
+        db.commit()
+        self.trimmed += result.rowcount
+        return result.rowcount
+
+    def stats(self) -> dict:
+        return {"pending": self.pending, "trimmed": self.trimmed, "failures": self.failures, "running": self.running}
+
+
+timeline_trimmer = TimelineTrimmer()
+
+
+class TimelineCRUD:
+    """ Per-user timelines of posts by followed authors """
+
+###############################################
+# FAN-OUT
+###############################################
+
+    @staticmethod
+    def follower_count(db: Session, user_id: UUID) -> int:
+        count = db.exec(select(FollowerCount.follower_count).where(FollowerCount.user_id == user_id)).first()
+        return count or 0
+
+    @staticmethod
+    def fan_out(db: Session, post: Post) -> bool:
+        """Pushes a newly published post into each follower's timeline.
+
+        One INSERT ... SELECT over the author's followers; the caller commits,
+        so the entries appear atomically with the publish. Authors above
+        TIMELINE_FANOUT_LIMIT are skipped and pulled on read instead, and
+        their ``pulled_until`` advances to the post.
+
+        Returns:
+            bool: Whether the post was pushed
+        """
+        if TimelineCRUD.follower_count(db, post.author_id) > TIMELINE_FANOUT_LIMIT:
+            # Readers keep pulling posts up to here after the author drops below the limit
+            db.execute(
+                update(FollowerCount)
+                .where(FollowerCount.user_id == post.author_id)
+                .where(or_(FollowerCount.pulled_until.is_(None), FollowerCount.pulled_until < post.published_at))
+                .values(pulled_until=post.published_at)
+            )
+            return False
+        columns = TimelineEntry.__table__.c
+        followers = select(
+            Follow.follower_id,
+            literal(post.id, columns.post_id.type),
+            literal(post.author_id, columns.author_id.type),
+            literal(post.published_at, columns.published_at.type),
+        ).where(Follow.followee_id == post.author_id)
+        db.execute(insert(TimelineEntry).from_select(["user_id", "post_id", "author_id", "published_at"], followers))
+        timeline_trimmer.mark_author(post.author_id)
+        return True
+
+    @staticmethod
+    def retract(db: Session, post_id: UUID) -> None:
+        """Removes a deleted or unpublished post from every timeline; the caller commits."""
+        db.execute(delete(TimelineEntry).where(TimelineEntry.post_id == post_id))
+
+    @staticmethod
+    def backfill(db: Session, user_id: UUID, author_id: UUID) -> None:
+        """Pushes an author's latest posts into a new follower's timeline; the caller commits."""
+        if TimelineCRUD.follower_count(db, author_id) > TIMELINE_FANOUT_LIMIT:
+            return
+        latest = (
+            select(literal(user_id, TimelineEntry.__table__.c.user_id.type), Post.id, Post.author_id, Post.published_at)
+            .where(Post.author_id == author_id, Post.status == PostStatus.PUBLISHED)
+            .order_by(Post.published_at.desc(), Post.id.desc())
+            .limit(TIMELINE_MAX_ENTRIES)
+        )
+        db.execute(insert(TimelineEntry).from_select(["user_id", "post_id", "author_id", "published_at"], latest))
+        timeline_trimmer.mark_users(user_id)
+
+    @staticmethod
+    def remove_author(db: Session, user_id: UUID, author_id: UUID) -> None:
+        """Drops an unfollowed author's posts from a timeline; the caller commits."""
+        db.execute(delete(TimelineEntry).where(TimelineEntry.user_id == user_id, TimelineEntry.author_id == author_id))
+
+###############################################
+# GETTERS
+###############################################
+
+    @staticmethod
+    def _pushed(db: Session, user_id: UUID, limit: int, position: tuple | None) -> list[Post]:
+        stmt = (
+            select(Post)
+            .join(TimelineEntry, TimelineEntry.post_id == Post.id)
+            .where(TimelineEntry.user_id == user_id, AUTHOR_IS_LIVE)
+            .order_by(TimelineEntry.published_at.desc(), TimelineEntry.post_id.desc())
+            .limit(limit)
+        )
+        if position:
+            stmt = stmt.where(tuple_(TimelineEntry.published_at, TimelineEntry.post_id) < tuple_(*position))
+        return db.exec(stmt).all()
+
+    @staticmethod
+    def _author_posts(db: Session, author_ids, limit: int, position: tuple | None, *criteria) -> list[Post]:
+        """Newest published posts by ``author_ids``, a list or a subquery, that match ``criteria``."""
+        stmt = (
+            select(Post)
+            .where(Post.author_id.in_(author_ids), Post.status == PostStatus.PUBLISHED, AUTHOR_IS_LIVE, *criteria)
+            .order_by(Post.published_at.desc(), Post.id.desc())
+            .limit(limit)
+        )
+        if position:
+            stmt = stmt.where(tuple_(Post.published_at, Post.id) < tuple_(*position))
+        return db.exec(stmt).all()
+
+    @staticmethod
+    def _pulled(db: Session, user_id: UUID, limit: int, position: tuple | None) -> list[Post]:
+        """Newest posts of followed authors that were never pushed.
+
+        That is every post of an author above the fan-out limit, and the
+        posts up to ``pulled_until`` of an author who has been above it:
+        dropping back below the limit only pushes the posts that follow.
+        The authors are resolved first, so readers who follow none of them
+        skip the posts query entirely.
+        """
+        above_limit = FollowerCount.follower_count > TIMELINE_FANOUT_LIMIT
+        authors = db.exec(
+            select(Follow.followee_id)
+            .join(FollowerCount, FollowerCount.user_id == Follow.followee_id)
+            .where(Follow.follower_id == user_id, or_(above_limit, FollowerCount.pulled_until.is_not(None)))
+        ).all()
+        if not authors:
+            return []
+        pulled = (
+            select(FollowerCount.user_id)
+            .where(FollowerCount.user_id == Post.author_id)
+            .where(or_(above_limit, Post.published_at <= FollowerCount.pulled_until))
+        )
+        return TimelineCRUD._author_posts(db, authors, limit, position, pulled.exists())
+
+    @staticmethod
+    def get_timeline_page(db: Session, user_id: UUID, limit: int, cursor: str | None = None, strategy: str = "hybrid") -> tuple[list[Post], str | None]:
+        """Fetch one page of a user's timeline: posts by followed authors, newest first.
+
+        Pushed posts are a single range scan on (user_id, published_at DESC,
+        post_id DESC). Posts by followed authors above the fan-out limit are
+        read by author and merged in.
+
+        Args:
+            db (Session): Database Session
+            user_id (UUID): The reader
+            limit (int): Maximum number of posts on the page
+            cursor (str | None): Opaque cursor returned by the previous page
+            strategy (str): "hybrid", or "pull" to query every followed author on read (for benchmarks)
+
+        Returns:
+            tuple[list[Post], str | None]: The posts and the cursor of the next page, if any
+        """
+        position = decode_cursor(cursor) if cursor else None
+        if strategy == "pull":
+            authors = select(Follow.followee_id).where(Follow.follower_id == user_id)
+            posts = TimelineCRUD._author_posts(db, authors, limit + 1, position)
+        else:
+            # An author who crossed the limit can have posts both pushed and pulled
+            merged = {post.id: post for post in TimelineCRUD._pushed(db, user_id, limit + 1, position)}
+            for post in TimelineCRUD._pulled(db, user_id, limit + 1, position):
+                merged.setdefault(post.id, post)
+            posts = sorted(merged.values(), key=lambda post: (post.published_at, post.id), reverse=True)[:limit + 1]
+        if len(posts) <= limit:
+            return posts, None
+        posts = posts[:limit]
+        return posts, encode_cursor(posts[-1].published_at, posts[-1].id)
@@ -1,9 +1,44 @@
-from sqlmodel import Session, select
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from sqlmodel import Session, select, tuple_, or_
+from sqlalchemy import and_, func, insert, update
 from sqlalchemy.exc import IntegrityError
-from ..models.users import User
+from ..database import DBSession, on_replica, stream_batches
+from ..models.blogs import Post, PostStatus
+from ..models.users import USER_IS_LIVE, User
 from ..schemas.user_schema import *
+from ..utils.cache import get_user_cache
+from ..utils.http_cache import make_etag
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.serialization import schema_columns
+from .crud_auth import revocation_store
+from .crud_purge import user_purger
+from .crud_search import search_indexer
 from fastapi import HTTPException, status
-from datetime import datetime, timezone, timezone
+from datetime import datetime
+
+# The only columns the user cache holds: never the password hash
+USER_READ_COLUMNS = schema_columns(User, UserRead)
+
+def username_matches(username: str):
+    """Case-insensitive match on a live user's username, served by the unique lower(username) index."""
+    return and_(func.lower(User.username) == func.lower(username), USER_IS_LIVE)
+
+def email_matches(email: str):
+    """Case-insensitive match on a live user's email, served by the unique lower(email) index."""
+    return and_(func.lower(User.email) == func.lower(email), USER_IS_LIVE)
+
+def _user_cache_keys(user: User) -> list[str]:
+    """Every cache key that can hold data for this user.
+
+    Usernames and emails are keyed lower-cased, like their lookups.
+    """
+    return [
+        f"user:id:{user.id}",
+        f"user:email:{user.email.lower()}",
+        f"user:username:{user.username.lower()}:id",
+        f"user:email:{user.email.lower()}:id",
+    ]
 
 class UserCRUD:
     """ CRUD operations for User model """
@@ -13,39 +48,117 @@ class UserCRUD:
 ###############################################
  
     @staticmethod
-    def create_user(db: Session, user: UserCreate) -> User:
+    def create_user(db: Session, user: UserCreate, conflict_order: tuple[str, ...] = ("email", "username")) -> User:
         """Creates a new user in the database.
 
+        The row is written with a single INSERT ... RETURNING (plain INSERT where
+        the dialect has no RETURNING). Duplicates are detected by the unique
+        indexes on lower(email) and lower(username) instead of pre-check
+        SELECTs, so the check cannot race with a concurrent insert, and
+        names differing only in case count as duplicates.
+
         Args:
             db (Session): Database session
             user (UserCreate): pydantic model for creating a user
+            conflict_order (tuple[str, ...]): Field reported first when both email and username clash
 
         Raises:
             HTTPException: If user with this email or username already exists
-     
 
         Returns:
             User: The created user
         """
         new_user = User(**user.model_dump())
-        
-        if db.exec(select(User).where(User.email == new_user.email)).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-        if db.exec(select(User).where(User.username == new_user.username)).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        try:
+            if db.get_bind().dialect.insert_returning:
+                new_user = db.execute(insert(User).values(**new_user.model_dump()).returning(User)).scalar_one()
+            else:
+                db.add(new_user)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            UserCRUD._raise_duplicate(db, new_user, conflict_order)
+            raise
+        search_indexer.mark_dirty("user", new_user.id)
         return new_user
-       
-    
+
+    @staticmethod
+    def _raise_duplicate(db: Session, user: User, conflict_order: tuple[str, ...]) -> None:
+        """Raises the 400 for whichever unique field an insert collided on.
+
+        Only runs after an IntegrityError, so the happy path stays one round trip.
+        """
+        details = {"email": "Email already registered", "username": "Username already registered"}
+        clauses = [match(value) for match, value in ((username_matches, user.username), (email_matches, user.email)) if value]
+        existing = db.exec(select(User.username, User.email).where(or_(*clauses))).all()
+        for field in conflict_order:
+            wanted = getattr(user, field)
+            if wanted and any(getattr(row, field).lower() == wanted.lower() for row in existing):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=details[field])
+
+    @staticmethod
+    def bulk_create_users(db: Session, users: list[UserCreate]) -> dict[int, str]:
+        """Inserts a batch of users in one statement, skipping duplicates.
+
+        Uses a multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING id on
+        Postgres and SQLite, so a clash on one row never aborts the batch.
+        Other dialects fall back to one savepoint per row. Passwords must
+        already be hashed.
+
+        Args:
+            db (Session): Database session
+            users (list[UserCreate]): Users to insert
+
+        Returns:
+            dict[int, str]: Conflict message keyed by the index of each skipped user
+        """
+        if not users:
+            return {}
+        rows = [User(**user.model_dump()).model_dump() for user in users]
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            # Imported here: the dialect modules are a noticeable share of app import time
+            from sqlalchemy.dialects import postgresql, sqlite
+
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(User).values(rows).on_conflict_do_nothing().returning(User.id)
+            inserted = set(db.execute(stmt).scalars())
+        else:
+            inserted = set()
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(User).values(**row))
+                    inserted.add(row["id"])
+                except IntegrityError:
+                    pass
+        db.commit()
+        search_indexer.mark_dirty("user", *inserted)
+
+        skipped = [index for index, row in enumerate(rows) if row["id"] not in inserted]
+        if not skipped:
+            return {}
+        emails = [rows[index]["email"] for index in skipped]
+        stmt = select(User.email).where(func.lower(User.email).in_([func.lower(email) for email in emails]), USER_IS_LIVE)
+        taken_emails = {email.lower() for email in db.exec(stmt)}
+        return {
+            index: "Email already registered" if rows[index]["email"].lower() in taken_emails else "Username already registered"
+            for index in skipped
+        }
+
+
 ###############################################
 # GETTERS
 ###############################################
 
     @staticmethod
-    def get_user_by_id(db: Session, user_id: UUID) -> User | None:
-        """Fetch a user by ID.
+    def get_user_by_id(db: Session, user_id: UUID) -> UserRead:
+        """Fetch a user's public fields by ID.
+
+        Only the UserRead fields are read and cached, so the password hash
+        never reaches the cache; the login path reads credentials itself.
+        Rows read from a replica may lag behind the primary, so they are
+        served but never cached.
 
         Args:
             db (Session): Database session
@@ -55,16 +168,23 @@ class UserCRUD:
             HTTPException: If user not found
 
         Returns:
-            User | None: The user object or None if not found
+            UserRead: The user
         """
-        user = db.get(User, user_id)
-        if not user:
+        cache = get_user_cache()
+        cached = cache.get(f"user:id:{user_id}")
+        if cached is not None:
+            return UserRead.model_validate(cached)
+        row = db.exec(select(*USER_READ_COLUMNS).where(User.id == user_id, USER_IS_LIVE)).first()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = UserRead.model_validate(row)
+        if not on_replica(db):
+            cache.set(f"user:id:{user_id}", user.model_dump(mode="json"))
         return user
 
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> User | None:
-        """Fetch a user by email.
+    def get_user_by_email(db: Session, email: str) -> UserRead:
+        """Fetch a user's public fields by email.
 
         Args:
             db (Session): Database Session
@@ -74,14 +194,64 @@ class UserCRUD:
             HTTPException: If user not found
 
         Returns:
-            User | None: The user object or None if not found
+            UserRead: The user
         """
-        stmt = select(User).where(User.email == email)
-        user = db.exec(stmt).first()
-        if not user:
+        cache = get_user_cache()
+        cached = cache.get(f"user:email:{email.lower()}")
+        if cached is not None:
+            return UserRead.model_validate(cached)
+        stmt = select(*USER_READ_COLUMNS).where(email_matches(email))
+        row = db.exec(stmt).first()
+        if not row:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        user = UserRead.model_validate(row)
+        if not on_replica(db):
+            cache.set(f"user:email:{email.lower()}", user.model_dump(mode="json"))
         return user
     
+    @staticmethod
+    def get_user_version(db: Session, user_id: UUID) -> datetime:
+        """Fetch only a user's ``updated_at``, for conditional requests.
+
+        Served from the cached user when there is one, otherwise a single
+        column is read instead of the whole row.
+
+        Args:
+            db (Session): Database Session
+            user_id (UUID): User ID type UUID
+
+        Raises:
+            HTTPException: If user not found
+
+        Returns:
+            datetime: When the user was last updated
+        """
+        cached = get_user_cache().get(f"user:id:{user_id}")
+        if cached is not None:
+            return datetime.fromisoformat(cached["updated_at"])
+        updated_at = db.exec(select(User.updated_at).where(User.id == user_id, USER_IS_LIVE)).first()
+        if not updated_at:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return updated_at
+
+    @staticmethod
+    def get_user_version_by_email(db: Session, email: str) -> tuple[UUID, datetime]:
+        """Fetch only a user's ID and ``updated_at`` by email, for conditional requests.
+
+        Raises:
+            HTTPException: If user not found
+
+        Returns:
+            tuple[UUID, datetime]: The user ID and when the user was last updated
+        """
+        cached = get_user_cache().get(f"user:email:{email.lower()}")
+        if cached is not None:
+            return UUID(cached["id"]), datetime.fromisoformat(cached["updated_at"])
+        row = db.exec(select(User.id, User.updated_at).where(email_matches(email))).first()
+        if not row:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return row.id, row.updated_at
+
     @staticmethod
     def get_user_id_by_username(db: Session, username: str) -> UUID | None:
         """Fetch a user ID by username.
@@ -96,11 +266,17 @@ class UserCRUD:
         Returns:
             UUID | None: The user ID or None if not found
         """
-        stmt = select(User).where(User.username == username)
-        user = db.exec(stmt).first()
-        if not user:
+        cache = get_user_cache()
+        cached = cache.get(f"user:username:{username.lower()}:id")
+        if cached is not None:
+            return UUID(cached)
+        stmt = select(User.id).where(username_matches(username))
+        user_id = db.exec(stmt).first()
+        if not user_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user.id
+        if not on_replica(db):
+            cache.set(f"user:username:{username.lower()}:id", str(user_id))
+        return user_id
     
     @staticmethod
     def get_user_id_by_email(db: Session, email: str) -> UUID | None:
@@ -116,67 +292,207 @@ class UserCRUD:
         Returns:
             UUID | None: The user ID or None if not found
         """
-        stmt = select(User).where(User.email == email)
-        user = db.exec(stmt).first()
-        if not user:
+        cache = get_user_cache()
+        cached = cache.get(f"user:email:{email.lower()}:id")
+        if cached is not None:
+            return UUID(cached)
+        stmt = select(User.id).where(email_matches(email))
+        user_id = db.exec(stmt).first()
+        if not user_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        return user.id
+        if not on_replica(db):
+            cache.set(f"user:email:{email.lower()}:id", str(user_id))
+        return user_id
     
     @staticmethod
-    def get_all_users(db: Session) -> list[User]:
-        """Fetch all users from the database.
+    def get_users_by(db: Session, field: str, values: list, columns: tuple | None = None) -> dict:
+        """Fetch the users whose ``field`` is one of ``values``, with a single IN query.
+
+        Usernames and emails match case-insensitively, through their lower() indexes.
+        Soft-deleted users are left out.
 
         Args:
             db (Session): Database Session
+            field (str): "id", "username" or "email"
+            values (list): The values to look up; duplicates are harmless
+            columns (tuple | None): Select just these columns (including ``field``) and return rows, not Users
 
         Raises:
-            HTTPException: If no users found
+            ValueError: If ``field`` is not a lookup key
 
         Returns:
-            list[User]: List of all user objects
+            dict: Users (or rows) keyed by the requested value; values without a user are absent
         """
-        users = db.exec(select(User)).all()
-        if not users:
+        if field not in ("id", "username", "email"):
+            raise ValueError(f"Cannot look users up by {field}")
+        if not values:
+            return {}
+        column = getattr(User, field)
+        stmt = select(*columns) if columns else select(User)
+        stmt = stmt.where(USER_IS_LIVE)
+        if field == "id":
+            return {user.id: user for user in db.exec(stmt.where(column.in_(set(values))))}
+        stmt = stmt.where(func.lower(column).in_([func.lower(value) for value in set(values)]))
+        found = {getattr(user, field).lower(): user for user in db.exec(stmt)}
+        return {value: found[value.lower()] for value in values if value.lower() in found}
+
+    @staticmethod
+    def get_users_page(db: Session, limit: int, cursor: str | None = None, columns: tuple | None = None) -> tuple[list[User], str | None]:
+        """Fetch one page of users ordered by (created_at, id).
+
+        Uses keyset pagination: the cursor carries the last (created_at, id)
+        seen, so every page is a single index range scan however deep it is.
+
+        Args:
+            db (Session): Database Session
+            limit (int): Maximum number of users on the page
+            cursor (str | None): Opaque cursor returned by the previous page
+            columns (tuple | None): Select just these columns (including created_at and id) and return rows, not Users
+
+        Raises:
+            HTTPException: If the cursor is invalid or there are no users at all
+
+        Returns:
+            tuple[list[User], str | None]: The users and the cursor of the next page, if any
+        """
+        stmt = select(*columns) if columns else select(User)
+        stmt = stmt.where(USER_IS_LIVE).order_by(User.created_at, User.id).limit(limit + 1)
+        if cursor:
+            created_at, user_id = decode_cursor(cursor)
+            stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(created_at, user_id))
+        users = db.exec(stmt).all()
+        if not users and not cursor:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No users found")
-        return users
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_cursor(users[-1].created_at, users[-1].id)
+
+    @staticmethod
+    async def stream_users(db: DBSession, batch_size: int = 1000, columns: tuple | None = None) -> AsyncIterator[list[User]]:
+        """Stream every user ordered by (created_at, id), a batch at a time.
+
+        Rows are fetched ``batch_size`` at a time over a server-side cursor,
+        so memory use does not grow with the size of the table.
+
+        Args:
+            db (DBSession): Sync or async database session
+            batch_size (int): Rows fetched per round trip
+            columns (tuple | None): Select just these columns and yield rows, not Users
+
+        Returns:
+            AsyncIterator[list[User]]: The users, in lists of up to ``batch_size``
+        """
+        stmt = select(*columns) if columns else select(User)
+        stmt = stmt.where(USER_IS_LIVE).order_by(User.created_at, User.id).execution_options(yield_per=batch_size)
+        async for batch in stream_batches(db, stmt, batch_size):
+            yield batch
 
 ###############################################
 # UPDATE
 ###############################################
 
     @staticmethod
-    def update_user(db: Session, user_id: UUID, user_update: UserUpdate) -> User | None:
-        """Update a user in the database.
+    def update_user(db: Session, user_id: UUID, user_update: UserUpdate, expected_etags: list[str] | None = None) -> User:
+        """Update the fields set on ``user_update`` with one UPDATE ... RETURNING.
+
+        Only the supplied columns are written, and updated_at is bumped in
+        the same statement, so there is no load/refresh round trip. With
+        ``expected_etags`` (from If-Match) the current ETag must be one of
+        them, and the UPDATE only matches while updated_at is still the one
+        read, so a concurrent edit is reported instead of silently
+        overwritten. A rename reads the old username/email first, whose
+        cached entries must be invalidated too. With nothing to change the
+        row is returned as it is, keeping its updated_at and ETag.
 
         Args:
             db (Session): Database Session
             user_id (UUID): user ID type UUID
-            user_update (UserUpdate): Pydantic model for updating a user
+            user_update (UserUpdate): Pydantic model for updating a user; unset and null fields are left alone
+            expected_etags (list[str] | None): ETags one of which the user must still have
 
         Raises:
-            HTTPException: If user not found
+            HTTPException: 404 if user not found, 412 if its version changed,
+                400 if the new email or username is taken
 
         Returns:
-            User | None: The updated user object or None if not found
+            User: The updated user
+        """
+        changes = user_update.model_dump(exclude_unset=True, exclude_none=True)
+        if not changes:
+            db_user = db.exec(select(User).where(User.id == user_id, USER_IS_LIVE)).first()
+            if db_user is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            if expected_etags is not None and make_etag(db_user.id, db_user.updated_at) not in expected_etags:
+                raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User was modified by another request")
+            return db_user
+        stale_keys = [f"user:id:{user_id}"]
+        stmt = update(User).where(User.id == user_id, USER_IS_LIVE).values(**changes, updated_at=datetime.utcnow()).returning(User)
+        if expected_etags is not None or "username" in changes or "email" in changes:
+            old = db.exec(select(User.id, User.username, User.email, User.updated_at).where(User.id == user_id, USER_IS_LIVE)).first()
+            if old is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            stale_keys = _user_cache_keys(old)
+            if expected_etags is not None:
+                if make_etag(old.id, old.updated_at) not in expected_etags:
+                    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User was modified by another request")
+                stmt = stmt.where(User.updated_at == old.updated_at)
+        try:
+            db_user = db.execute(stmt).scalar_one_or_none()
+            if db_user is not None and "password" in changes:
+                # Sessions opened with the old password end with it
+                revocation_store.revoke_user(db, user_id)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            clash = SimpleNamespace(username=changes.get("username"), email=changes.get("email"))
+            UserCRUD._raise_duplicate(db, clash, ("email", "username"))
+            raise
+        if db_user is None:
+            # Nothing matched: tell a missing user from a failed precondition
+            if db.exec(select(User.id).where(User.id == user_id, USER_IS_LIVE)).first() is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User was modified by another request")
+        get_user_cache().delete(*stale_keys, *_user_cache_keys(db_user))
+        search_indexer.mark_dirty("user", db_user.id)
+        return db_user
+
+    @staticmethod
+    def set_password_hash(db: Session, user_id: UUID, hashed_password: str) -> None:
+        """Replace a user's stored password hash, e.g. when it is rehashed on login.
+
+        updated_at is left alone: nothing the API returns changes, so the
+        user's ETag and Last-Modified stay valid.
+
+        Args:
+            db (Session): Database Session
+            user_id (UUID): user ID type UUID
+            hashed_password (str): The new hash
+
+        Raises:
+            HTTPException: If user not found
         """
         db_user = db.get(User, user_id)
         if not db_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        for key, value in user_update.model_dump(exclude_unset=True).items():
-            setattr(db_user, key, value)
-        db_user.updated_at = datetime.now(timezone.utc)
+        db_user.password = hashed_password
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
-        return db_user
+        get_user_cache().delete(*_user_cache_keys(db_user))
 
 ###############################################
 # DELETE
 ###############################################
 
     @staticmethod
-    def delete_user(db: Session, user_id: UUID) -> str:
-        """Delete a user from the database.
+    def delete_user(db: Session, user_id: UUID) -> None:
+        """Soft-delete a user: one UPDATE setting the tombstone.
+
+        The user and their posts disappear from every read at once and their
+        username and email are free again; the background purger removes the
+        row and everything the user owns later, in small batches. Every token
+        the user holds is revoked in the same transaction. Their posts leave
+        the search index on the indexer's next flush.
 
         Args:
             db (Session): Database Session
@@ -184,13 +500,16 @@ class UserCRUD:
 
         Raises:
             HTTPException: If user not found
-
-        Returns:
-            str: Success message
         """
-        db_user = db.get(User, user_id)
-        if not db_user:
+        stmt = update(User).where(User.id == user_id, USER_IS_LIVE).values(deleted_at=datetime.utcnow()).returning(User.id, User.username, User.email)
+        deleted = db.execute(stmt).first()
+        if not deleted:
+            db.rollback()
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        db.delete(db_user)
+        revocation_store.revoke_user(db, user_id)
+        post_ids = db.exec(select(Post.id).where(Post.author_id == user_id, Post.status == PostStatus.PUBLISHED)).all()
         db.commit()
-        
+        get_user_cache().delete(*_user_cache_keys(deleted))
+        search_indexer.mark_dirty("user", user_id)
+        search_indexer.mark_dirty("post", *post_ids)
+        user_purger.mark(user_id)
@@ -1,27 +1,402 @@
-from sqlmodel import SQLModel, create_engine
-from dotenv import load_dotenv
-from .models.users import User 
-import os
+import asyncio
+import itertools
+import logging
+import threading
+from contextvars import ContextVar
+from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from .models.auth import RevokedToken
+from .models.blogs import Comment, Post, PostLike
+from .models.schema import SchemaMigration
+from .models.social import Follow, FollowerCount, TimelineEntry
+from .migrations import migrate
+from .models.users import User
+from .settings import settings
+from .utils.metrics import attach_query_hooks
+from .utils.pool_metrics import PoolStats
+
+logger = logging.getLogger(__name__)
 
 ###############################################
 # Database Configuration
 ###############################################
-load_dotenv()
-database_url = os.getenv("DATABASE_URL")
-engine = create_engine(database_url, echo=True)
+database_url = settings.database_url
+DB_ASYNC = settings.db_async
+DB_ECHO = settings.db_echo
+DB_POOL_SIZE = settings.db_pool_size
+DB_MAX_OVERFLOW = settings.db_max_overflow
+DB_POOL_TIMEOUT = settings.db_pool_timeout
+DB_POOL_RECYCLE = settings.db_pool_recycle
+DB_POOL_PRE_PING = settings.db_pool_pre_ping
+DATABASE_REPLICA_URLS = [url.strip() for url in (settings.database_replica_urls or "").split(",") if url.strip()]
+# After a write, the same client reads from the primary for this long (see ReplicaRoutingMiddleware)
+DB_REPLICA_STICKY_SECONDS = settings.db_replica_sticky_seconds
+DB_REPLICA_CHECK_SECONDS = settings.db_replica_check_seconds
+
+# Async drivers used in place of the sync ones when DB_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Maps a sync database URL onto its async driver (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def engine_options(url: str, stats: PoolStats, is_async: bool = False) -> dict:
+    """Builds create_engine keyword arguments from the DB_* settings.
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool, since a
+    sized queue pool would hand out separate, empty databases.
+    """
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=stats.pool_class(AsyncAdaptedQueuePool if is_async else QueuePool),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+###############################################
+# Engines
+###############################################
+# Built on first use rather than at import, so importing the app needs no
+# database and no driver; ``database.engine`` and ``database.async_engine``
+# still read like module attributes through __getattr__ below.
+pool_stats = PoolStats()
+async_pool_stats = PoolStats() if DB_ASYNC else None
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """Returns the sync engine, creating it on first call.
+
+    Raises:
+        RuntimeError: If DATABASE_URL is not set
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if not database_url:
+                    raise RuntimeError("DATABASE_URL is not set")
+                engine = create_engine(database_url, **engine_options(database_url, pool_stats))
+                pool_stats.attach(engine)
+                attach_query_hooks(engine)
+                event.listen(engine, "before_cursor_execute", _track_write)
+                _engine = engine
+    return _engine
+
+def get_async_engine() -> AsyncEngine | None:
+    """Returns the async engine when DB_ASYNC is enabled, creating it on first call."""
+    global _async_engine
+    if DB_ASYNC and _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                if not (settings.async_database_url or database_url):
+                    raise RuntimeError("DATABASE_URL is not set")
+                async_database_url = settings.async_database_url or to_async_url(database_url)
+                engine = create_async_engine(async_database_url, **engine_options(async_database_url, async_pool_stats, is_async=True))
+                async_pool_stats.attach(engine.sync_engine)
+                attach_query_hooks(engine.sync_engine)
+                event.listen(engine.sync_engine, "before_cursor_execute", _track_write)
+                _async_engine = engine
+    return _async_engine
+
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+async def dispose_engines() -> None:
+    """Closes every pooled connection of the engines built so far."""
+    global _engine, _async_engine
+    await replicas.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+###############################################
+# Read Replicas
+###############################################
+# "replica" for requests that may read from a replica, set by ReplicaRoutingMiddleware;
+# everything else (writes, background workers, scripts) uses the primary
+read_preference: ContextVar[str] = ContextVar("read_preference", default="primary")
+
+
+class WriteFlag:
+    """Whether a request wrote to the primary, raised by a hook on the primary engines."""
+
+    __slots__ = ("wrote",)
+
+    def __init__(self):
+        self.wrote = False
+
+# Set by ReplicaRoutingMiddleware around non-GET requests; a mutable flag, since the
+# threadpool and run_sync run queries in a copy of the context
+request_writes: ContextVar[WriteFlag | None] = ContextVar("request_writes", default=None)
+READ_VERBS = ("SELECT", "SHOW", "EXPLAIN", "PRAGMA")
+
+def _track_write(conn, cursor, statement, parameters, context, executemany):
+    flag = request_writes.get()
+    if flag is None or flag.wrote:
+        return
+    if context is not None and context.compiled is not None:
+        flag.wrote = context.isinsert or context.isupdate or context.isdelete
+    else:
+        flag.wrote = not statement.lstrip()[:8].upper().startswith(READ_VERBS)
+
+class Replica:
+    """One read replica: its engines, built on first use, and its health."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.pool_stats = PoolStats()
+        self.async_pool_stats = PoolStats() if DB_ASYNC else None
+        self._engine: Engine | None = None
+        self._async_engine: AsyncEngine | None = None
+        self._lock = threading.Lock()
+        self.healthy = True
+        self.reads = 0
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return make_url(self.url).render_as_string(hide_password=True)
+
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = create_engine(self.url, **engine_options(self.url, self.pool_stats))
+                    self.pool_stats.attach(engine)
+                    attach_query_hooks(engine)
+                    event.listen(engine, "handle_error", self._handle_error)
+                    self._engine = engine
+        return self._engine
+
+    def async_engine(self) -> AsyncEngine:
+        if self._async_engine is None:
+            with self._lock:
+                if self._async_engine is None:
+                    url = to_async_url(self.url)
+                    engine = create_async_engine(url, **engine_options(url, self.async_pool_stats, is_async=True))
+                    self.async_pool_stats.attach(engine.sync_engine)
+                    attach_query_hooks(engine.sync_engine)
+                    event.listen(engine.sync_engine, "handle_error", self._handle_error)
+                    self._async_engine = engine
+        return self._async_engine
+
+    def _handle_error(self, context) -> None:
+        # A lost or refused connection takes the replica out of rotation until the next check passes
+        if context.is_disconnect or context.connection is None:
+            self._mark(False)
+
+    def _mark(self, healthy: bool) -> None:
+        if healthy == self.healthy:
+            return
+        logger.warning("read replica %s is %s", self.name, "back" if healthy else "down")
+        # Counts the times the replica left the rotation
+        self.failures += not healthy
+        self.healthy = healthy
+
+    def check(self) -> bool:
+        """Runs ``SELECT 1`` on the replica and records whether it answered."""
+        try:
+            with self.engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except SQLAlchemyError:
+            self._mark(False)
+        else:
+            self._mark(True)
+        return self.healthy
+
+    async def dispose(self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+
+class ReplicaSet:
+    """Round-robin over the healthy read replicas.
+
+    A replica leaves the rotation as soon as one of its connections fails,
+    and a background task re-checks every replica each ``check_interval``
+    seconds to bring it back. With no healthy replica, reads go to the
+    primary.
+    """
+
+    def __init__(self, urls: list[str], check_interval: float = DB_REPLICA_CHECK_SECONDS):
+        self.replicas = [Replica(url) for url in urls]
+        self.check_interval = check_interval
+        self._turn = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        replica = healthy[next(self._turn) % len(healthy)]
+        replica.reads += 1
+        return replica
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            replica.check()
+
+    def start(self) -> None:
+        """Starts the periodic health check on the running event loop."""
+        if self.replicas and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await run_in_threadpool(self.check)
+            except Exception:
+                logger.exception("read replica check failed")
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def stats(self) -> list[dict]:
+        stats = []
+        for replica in self.replicas:
+            entry = {"replica": replica.name, "healthy": replica.healthy, "reads": replica.reads, "failures": replica.failures}
+            if replica._engine is not None:
+                entry["pool"] = replica.pool_stats.snapshot(replica._engine.pool)
+            stats.append(entry)
+        return stats
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS)
+
+def _read_replica() -> Replica | None:
+    return replicas.choose() if replicas and read_preference.get() == "replica" else None
+
+# Either session flavour can be handed to the routers
+DBSession = Session | AsyncSession
 
 ###############################################
 # Database Helper Functions
 ###############################################
 
-def get_session():
-    """Creates a new database session."""
-    from sqlmodel import Session
-    with Session(engine) as session:
+def get_sync_session():
+    """Creates a new blocking database session, on a replica for reads when there is one.
+
+    Objects are not expired on commit, so returning a freshly written row
+    does not trigger a reload SELECT. ``session.info["replica"]`` tells
+    which one it is (see ``on_replica``).
+    """
+    replica = _read_replica()
+    with Session(replica.engine() if replica else get_engine(), expire_on_commit=False, info={"replica": replica is not None}) as session:
         yield session
-    
+
+async def get_async_session():
+    """Creates a new async database session, on a replica for reads when there is one."""
+    replica = _read_replica()
+    async with AsyncSession(replica.async_engine() if replica else get_async_engine(), expire_on_commit=False, info={"replica": replica is not None}) as session:
+        yield session
+
+def get_primary_sync_session():
+    """Creates a blocking session on the primary, for reads that must never lag."""
+    with Session(get_engine(), expire_on_commit=False) as session:
+        yield session
+
+async def get_primary_async_session():
+    """Creates an async session on the primary, for reads that must never lag."""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+# Dependencies used by the routers, chosen by DB_ASYNC
+get_session = get_async_session if DB_ASYNC else get_sync_session
+get_primary_session = get_primary_async_session if DB_ASYNC else get_primary_sync_session
+
+def on_replica(db: Session) -> bool:
+    """Whether ``db`` reads from a replica, whose rows may lag behind the primary."""
+    return db.info.get("replica", False)
+
+async def run_db(db: DBSession, fn, *args, **kwargs):
+    """Runs a sync CRUD function ``fn(session, *args)`` against either session flavour.
+
+    With an AsyncSession the function runs on the event loop through
+    ``run_sync`` and every query is awaited on the async driver; with a
+    blocking Session it is pushed to the threadpool instead.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def stream_batches(db: DBSession, stmt, batch_size: int):
+    """Yields the results of ``stmt`` in lists of up to ``batch_size``, without loading the whole result.
+
+    A select of one entity yields ORM objects, a select of columns yields
+    rows, as ``exec`` would return them. Combine with
+    ``execution_options(yield_per=batch_size)`` so rows are fetched in
+    batches over a server-side cursor where the driver supports one. A sync
+    session fetches each batch in one threadpool hop, not one per row.
+    """
+    if isinstance(db, AsyncSession):
+        result = await (db.stream_scalars(stmt) if isinstance(stmt, SelectOfScalar) else db.stream(stmt))
+        async for batch in result.partitions(batch_size):
+            yield batch
+    else:
+        batches = await run_in_threadpool(lambda: db.exec(stmt).partitions(batch_size))
+        async for batch in iterate_in_threadpool(batches):
+            yield batch
+
+
+def get_pool_stats() -> dict:
+    """Returns pool counters and gauges for every configured engine."""
+    stats = {"sync": pool_stats.snapshot(get_engine().pool)}
+    if DB_ASYNC:
+        stats["async"] = async_pool_stats.snapshot(get_async_engine().sync_engine.pool)
+    if replicas:
+        stats["replicas"] = replicas.stats()
+    return stats
 
 
 def create_db_and_tables():
-    """Creates the database and tables."""
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    """Brings the database schema up to date; see ``migrations``."""
+    migrate(get_engine())
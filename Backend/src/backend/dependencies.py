@@ -0,0 +1,124 @@
+import asyncio
+import secrets
+from uuid import UUID
+from fastapi import Depends, Header, HTTPException, status
+from .cruds.crud_auth import revocation_store, token_revocation_ids
+from .cruds.crud_user import UserCRUD
+from .database import DBSession, get_primary_session, get_session, run_db
+from .schemas.user_schema import UserRead
+from .settings import settings
+from .utils.dataloader import DataLoader
+from .utils.security import oauth2_scheme, optional_oauth2_scheme, verify_access_token_cached
+
+###############################################
+# Environment Variables
+###############################################
+INTERNAL_API_TOKEN = settings.internal_api_token
+
+###############################################
+# Authentication Dependencies
+###############################################
+
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def _verify_claims(token: str, db: DBSession) -> dict:
+    try:
+        claims = verify_access_token_cached(token)
+    except ValueError:
+        raise _credentials_error()
+    revocation_ids = token_revocation_ids(claims)
+    if revocation_store.needs_sync() or revocation_store.might_be_revoked(*revocation_ids):
+        if await run_db(db, revocation_store.is_revoked, *revocation_ids, issued_at=claims.get("iat")):
+            raise _credentials_error()
+    return claims
+
+def _user_id(claims: dict) -> UUID:
+    try:
+        return UUID(claims["sub"])
+    except (KeyError, ValueError):
+        raise _credentials_error()
+
+async def get_token_claims(token: str = Depends(oauth2_scheme), db: DBSession = Depends(get_primary_session)) -> dict:
+    """Decodes and verifies the bearer token.
+
+    FastAPI caches dependency results per request, so the token is decoded
+    once however many dependencies ask for it. The token's login session and
+    user are checked against the revocation store; the Bloom filter answers
+    that in memory unless the session may have been logged out or the user
+    deleted. Revocations are read on the primary whatever the request's
+    read preference, since a sync against a lagging replica would miss them
+    for good.
+
+    Raises:
+        HTTPException: If the token is missing, invalid, expired or revoked
+    """
+    return await _verify_claims(token, db)
+
+def get_current_user_id(claims: dict = Depends(get_token_claims)) -> UUID:
+    """Returns the authenticated user's ID straight from the token, without a DB hit."""
+    return _user_id(claims)
+
+async def get_optional_user_id(token: str | None = Depends(optional_oauth2_scheme), db: DBSession = Depends(get_primary_session)) -> UUID | None:
+    """Returns the caller's ID, or None when no token was sent.
+
+    Raises:
+        HTTPException: If a token was sent but is invalid, expired or revoked
+    """
+    if token is None:
+        return None
+    return _user_id(await _verify_claims(token, db))
+
+async def get_current_user(user_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_session)) -> UserRead:
+    """Returns the authenticated user's public fields, served from the user cache when possible."""
+    return await run_db(db, UserCRUD.get_user_by_id, user_id)
+
+def require_internal_token(x_internal_token: str | None = Header(default=None)) -> None:
+    """Guards the operational endpoints with the shared INTERNAL_API_TOKEN.
+
+    Without a configured token the endpoints are closed to every caller.
+
+    Raises:
+        HTTPException: If no token is configured, or the X-Internal-Token header is missing or wrong
+    """
+    if (
+        not INTERNAL_API_TOKEN
+        or x_internal_token is None
+        or not secrets.compare_digest(x_internal_token.encode(), INTERNAL_API_TOKEN.encode())
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
+
+
+###############################################
+# Request-scoped Loaders
+###############################################
+
+class UserLoader:
+    """Batches user lookups made while handling one request.
+
+    One DataLoader per lookup key, each resolving its keys with a single
+    IN query. The loaders share the request's session, which must not run
+    two queries at once, so their batches take turns.
+    """
+
+    def __init__(self, db: DBSession, columns: tuple | None = None, max_batch_size: int = 100):
+        self.db = db
+        self.columns = columns
+        self._lock = asyncio.Lock()
+        self.by_id = DataLoader(self._batch("id"), max_batch_size)
+        self.by_username = DataLoader(self._batch("username"), max_batch_size)
+        self.by_email = DataLoader(self._batch("email"), max_batch_size)
+
+    def _batch(self, field: str):
+        async def load(keys: list) -> dict:
+            async with self._lock:
+                return await run_db(self.db, UserCRUD.get_users_by, field, keys, self.columns)
+        return load
+
+def get_user_loader(db: DBSession = Depends(get_session)) -> UserLoader:
+    """A UserLoader for the current request; FastAPI builds it once per request."""
+    return UserLoader(db)
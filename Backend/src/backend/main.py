@@ -1,15 +1,57 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from .routers import auth_routes, user_routes
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from .middleware import ReplicaRoutingMiddleware, TimingMiddleware
+from .routers import auth_routes, internal_routes, metrics_routes, post_routes, search_routes, timeline_routes, user_routes
 from . import database
+from .cruds.crud_auth import revocation_purger
+from .cruds.crud_purge import user_purger
+from .cruds.crud_search import search_indexer
+from .cruds.crud_timeline import timeline_trimmer
+from .settings import settings
+from .utils.hashing_pool import bulk_hashing_pool, hashing_pool
+from .utils.security import dummy_password_hash
 
-app = FastAPI(title="The Blog Project")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs pending migrations and starts the background workers; undoes both on shutdown.
+
+    The engine is first built here (or by the first request when the app
+    runs without its lifespan), never at import.
+    """
+    engine = database.get_engine()
+    if settings.db_migrate_on_startup:
+        await run_in_threadpool(database.migrate, engine)
+    search_indexer.start(engine)
+    timeline_trimmer.start(engine)
+    user_purger.start(engine)
+    revocation_purger.start(engine)
+    database.replicas.start()
+    bulk_hashing_pool.executor()
+    # Built ahead of the first login for an unknown username
+    await run_in_threadpool(dummy_password_hash)
+    yield
+    await database.replicas.stop()
+    await search_indexer.stop()
+    await timeline_trimmer.stop()
+    await user_purger.stop()
+    await revocation_purger.stop()
+    hashing_pool.shutdown()
+    bulk_hashing_pool.shutdown()
+    await database.dispose_engines()
+
+app = FastAPI(title="The Blog Project", default_response_class=ORJSONResponse, lifespan=lifespan)
+app.add_middleware(ReplicaRoutingMiddleware)
+app.add_middleware(TimingMiddleware)
 
 app.include_router(auth_routes.router)
 app.include_router(user_routes.router)
-
-@app.on_event("startup")
-async def on_startup():
-    database.create_db_and_tables()
+app.include_router(post_routes.router)
+app.include_router(search_routes.router)
+app.include_router(timeline_routes.router)
+app.include_router(internal_routes.router)
+app.include_router(metrics_routes.router)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,110 @@
+import time
+from http.cookies import CookieError, SimpleCookie
+from . import database
+from .utils.metrics import RequestStats, current_request, metrics
+
+###############################################
+# Timing Middleware
+###############################################
+
+class TimingMiddleware:
+    """Records per-route latency and SQL stats, and reports them in ``Server-Timing``.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, so responses
+    are not re-wrapped and streaming keeps working. Routes are labelled by
+    their path template, which keeps the metric cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - start) * 1000
+                timing = f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", app;dur={elapsed:.2f}'
+                message.setdefault("headers", []).append((b"server-timing", timing.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            route_name = route.path if route is not None else "unmatched"
+            metrics.record_request(scope["method"], route_name, status, time.perf_counter() - start, stats)
+
+
+###############################################
+# Replica Routing Middleware
+###############################################
+
+# Cookie holding the time until which a client that just wrote reads from the primary
+STICKY_COOKIE = "read_primary_until"
+SAFE_METHODS = ("GET", "HEAD")
+
+class ReplicaRoutingMiddleware:
+    """Lets reads go to a replica, except shortly after the same client wrote.
+
+    GET and HEAD requests set ``database.read_preference`` to "replica";
+    every other method uses the primary. A successful request that wrote to
+    the primary answers with a cookie holding ``now + DB_REPLICA_STICKY_SECONDS``,
+    and reads carrying an unexpired one stay on the primary, so a client
+    never reads data older than its own last write while replicas catch up.
+    Read-only POSTs such as /users/batch write nothing and set no cookie.
+    The cookie keeps the window per client without state shared between
+    workers. Does nothing when no replica is configured.
+    """
+
+    def __init__(self, app, sticky_seconds: float = database.DB_REPLICA_STICKY_SECONDS):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not database.replicas:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in SAFE_METHODS:
+            preference = "primary" if self._sticky_until(scope) > time.time() else "replica"
+            token = database.read_preference.set(preference)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                database.read_preference.reset(token)
+            return
+
+        writes = database.WriteFlag()
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400 and writes.wrote:
+                until = time.time() + self.sticky_seconds
+                cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={max(1, round(self.sticky_seconds))}; Path=/; HttpOnly; SameSite=Lax"
+                message.setdefault("headers", []).append((b"set-cookie", cookie.encode("latin-1")))
+            await send(message)
+
+        token = database.request_writes.set(writes)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            database.request_writes.reset(token)
+
+    @staticmethod
+    def _sticky_until(scope) -> float:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                try:
+                    morsel = SimpleCookie(value.decode("latin-1")).get(STICKY_COOKIE)
+                    return float(morsel.value) if morsel else 0.0
+                except (CookieError, ValueError):
+                    return 0.0
+        return 0.0
@@ -0,0 +1,156 @@
+"""Schema migrations, applied at startup (DB_MIGRATE_ON_STARTUP) or from a deploy step.
+
+Usage (from the Backend directory):
+
+    python -m src.backend.migrations
+
+A fresh database is built from the current models and stamped with every
+version. An existing database runs the migrations it has not applied yet,
+in order, inside one transaction.
+"""
+from collections.abc import Callable
+from datetime import datetime
+from sqlalchemy import insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+from .models.schema import SchemaMigration
+from .models.social import FollowerCount
+from .models.users import User
+from .utils.search import SEARCH_BACKENDS, get_search_backend
+
+# Arbitrary key for the Postgres advisory lock that serializes concurrent migrators
+MIGRATION_LOCK_KEY = 7_204_611
+
+# (version, description, upgrade), in version order
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = []
+
+
+def migration(version: int, description: str):
+    """Registers ``upgrade(conn)`` as the step that takes an existing database to ``version``.
+
+    Fresh databases never run it, since create_all already builds the
+    current models; an upgrade only has to bring the previous version up.
+    """
+    def register(upgrade: Callable[[Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} is out of order")
+        MIGRATIONS.append((version, description, upgrade))
+        return upgrade
+    return register
+
+
+# Partial indexes on USERS. Reads filter "deleted_at IS NULL" (USER_IS_LIVE), which
+# lets the planner use the live-user indexes; usernames and emails are unique among
+# live users and looked up through lower(), so lookups must compare lower(column)
+USER_INDEXES = {
+    # Keyset pagination order for GET /users/
+    "ix_USERS_created_at_id": "(created_at, id) WHERE deleted_at IS NULL",
+    "ix_USERS_lower_username": "(lower(username)) WHERE deleted_at IS NULL",
+    "ix_USERS_lower_email": "(lower(email)) WHERE deleted_at IS NULL",
+    # The purger's queue of tombstones
+    "ix_USERS_deleted_at": "(deleted_at) WHERE deleted_at IS NOT NULL",
+}
+UNIQUE_USER_INDEXES = ("ix_USERS_lower_username", "ix_USERS_lower_email")
+
+
+def create_user_indexes(conn: Connection) -> None:
+    for name, definition in USER_INDEXES.items():
+        unique = "UNIQUE " if name in UNIQUE_USER_INDEXES else ""
+        conn.execute(text(f'CREATE {unique}INDEX IF NOT EXISTS "{name}" ON "USERS" {definition}'))
+
+
+def _create_search_schema(conn: Connection) -> None:
+    if conn.dialect.name in SEARCH_BACKENDS:
+        get_search_backend(conn.dialect.name).create_schema(conn)
+
+
+###############################################
+# Migrations
+###############################################
+
+@migration(1, "baseline schema")
+def _baseline(conn: Connection) -> None:
+    # Databases built by create_all before migrations existed: only adds what is missing
+    SQLModel.metadata.create_all(conn)
+    _create_search_schema(conn)
+
+
+@migration(2, "case-insensitive unique usernames and emails")
+def _case_insensitive_identities(conn: Connection) -> None:
+    # Existing users differing only in case would break the new indexes; they need a human
+    for column in ("username", "email"):
+        clashes = conn.execute(text(
+            f'SELECT lower({column}) FROM "USERS" GROUP BY lower({column}) HAVING count(*) > 1 LIMIT 5'
+        )).scalars().all()
+        if clashes:
+            raise RuntimeError(f"Cannot make {column}s case-insensitive, these clash: {', '.join(clashes)}")
+    for column in ("username", "email"):
+        conn.execute(text(f'CREATE UNIQUE INDEX IF NOT EXISTS "ix_USERS_lower_{column}" ON "USERS" (lower({column}))'))
+    # The exact-match indexes are covered by the lower() ones and no query uses them any more
+    conn.execute(text('DROP INDEX IF EXISTS "ix_USERS_username"'))
+    conn.execute(text('DROP INDEX IF EXISTS "ix_USERS_email"'))
+
+
+@migration(3, "soft-deleted users and partial indexes over live users")
+def _soft_delete(conn: Connection) -> None:
+    if "deleted_at" not in {column["name"] for column in inspect(conn).get_columns(User.__tablename__)}:
+        column_type = User.__table__.c.deleted_at.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE "USERS" ADD COLUMN deleted_at {column_type}'))
+    # Rebuilt as partial indexes over live users, plus the purger's index over tombstones
+    for name in USER_INDEXES:
+        conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+    create_user_indexes(conn)
+
+
+@migration(4, "remember which posts of popular authors were pulled instead of pushed")
+def _pulled_until(conn: Connection) -> None:
+    if "pulled_until" not in {column["name"] for column in inspect(conn).get_columns(FollowerCount.__tablename__)}:
+        column_type = FollowerCount.__table__.c.pulled_until.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE "FOLLOWER_COUNTS" ADD COLUMN pulled_until {column_type}'))
+
+
+###############################################
+# Runner
+###############################################
+
+def applied_versions(conn: Connection) -> set[int] | None:
+    """The versions recorded in SCHEMA_MIGRATIONS, or None when the table does not exist."""
+    if not inspect(conn).has_table(SchemaMigration.__tablename__):
+        return None
+    return set(conn.execute(select(SchemaMigration.version)).scalars())
+
+
+def migrate(engine: Engine) -> list[int]:
+    """Brings the schema up to date and returns the versions applied.
+
+    On a current database this is two catalog reads, unlike create_all,
+    which checks every table and index on every boot.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Workers booting together wait here instead of racing
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        applied = applied_versions(conn)
+        if applied is None and not inspect(conn).has_table(User.__tablename__):
+            SQLModel.metadata.create_all(conn)
+            create_user_indexes(conn)
+            _create_search_schema(conn)
+            pending = MIGRATIONS
+        else:
+            pending = [step for step in MIGRATIONS if step[0] not in (applied or set())]
+            for _, _, upgrade in pending:
+                upgrade(conn)
+        if pending:
+            now = datetime.utcnow()
+            conn.execute(insert(SchemaMigration), [
+                {"version": version, "description": description, "applied_at": now}
+                for version, description, _ in pending
+            ])
+    return [version for version, _, _ in pending]
+
+
+if __name__ == "__main__":
+    from .database import get_engine
+
+    applied = migrate(get_engine())
+    print(f"applied {', '.join(map(str, applied))}" if applied else "schema is up to date")
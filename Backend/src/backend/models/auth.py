@@ -0,0 +1,10 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class RevokedToken(SQLModel, table=True):
+    __tablename__ = "REVOKED_TOKENS"
+    __description__ = "Revoked refresh token IDs (jti) and login sessions (sid)."
+
+    token_id: str = Field(primary_key=True)
+    expires_at: datetime = Field(nullable=False, index=True)
+    revoked_at: datetime = Field(nullable=False, default_factory=datetime.utcnow, index=True)
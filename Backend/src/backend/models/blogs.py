@@ -0,0 +1,59 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID, uuid4
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Index, select
+from .users import USER_IS_LIVE, User
+
+class PostStatus(str, Enum):
+    DRAFT = "draft"
+    PUBLISHED = "published"
+    ARCHIVED = "archived"
+
+class Post(SQLModel, table=True):
+    __tablename__ = "POSTS"
+    __description__ = "Blog post written by a user."
+    __table_args__ = (
+        # Home feed: published posts, newest first, keyset on (published_at, id)
+        Index("ix_POSTS_status_published_at", "status", text("published_at DESC"), text("id DESC")),
+        # Author page: one author's published posts, newest first; status is part of
+        # the key so the whole WHERE clause is a prefix and no rows are filtered
+        Index("ix_POSTS_author_status_published_at", "author_id", "status", text("published_at DESC"), text("id DESC")),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    author_id: UUID = Field(foreign_key="USERS.id", nullable=False, ondelete="CASCADE")
+    slug: str = Field(unique=True, index=True, nullable=False)
+    title: str = Field(nullable=False)
+    body: str = Field(nullable=False)
+    status: PostStatus = Field(default=PostStatus.DRAFT, nullable=False)
+    published_at: datetime | None = Field(default=None)
+    # Denormalized so feed pages never count rows per post
+    comment_count: int = Field(default=0, nullable=False)
+    like_count: int = Field(default=0, nullable=False)
+    created_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
+    updated_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
+
+# A soft-deleted author's posts stay in POSTS until the purger gets to them; every read of posts filters on this
+AUTHOR_IS_LIVE = select(User.id).where(User.id == Post.author_id, USER_IS_LIVE).exists()
+
+class Comment(SQLModel, table=True):
+    __tablename__ = "COMMENTS"
+    __description__ = "Comment left by a user on a post."
+    __table_args__ = (
+        Index("ix_COMMENTS_post_created_at", "post_id", "created_at", "id"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    post_id: UUID = Field(foreign_key="POSTS.id", nullable=False, ondelete="CASCADE")
+    author_id: UUID = Field(foreign_key="USERS.id", nullable=False, index=True, ondelete="CASCADE")
+    body: str = Field(nullable=False)
+    created_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
+
+class PostLike(SQLModel, table=True):
+    __tablename__ = "POST_LIKES"
+    __description__ = "A user's like on a post; one per user and post."
+
+    post_id: UUID = Field(foreign_key="POSTS.id", primary_key=True, ondelete="CASCADE")
+    user_id: UUID = Field(foreign_key="USERS.id", primary_key=True, index=True, ondelete="CASCADE")
+    created_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
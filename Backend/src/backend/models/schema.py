@@ -0,0 +1,10 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class SchemaMigration(SQLModel, table=True):
+    __tablename__ = "SCHEMA_MIGRATIONS"
+    __description__ = "Schema migrations applied to this database, one row per version."
+
+    version: int = Field(primary_key=True)
+    description: str = Field(nullable=False)
+    applied_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
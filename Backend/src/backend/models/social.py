@@ -0,0 +1,41 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import text
+from sqlmodel import SQLModel, Field, Index
+
+class Follow(SQLModel, table=True):
+    __tablename__ = "FOLLOWS"
+    __description__ = "A user following another user's posts."
+    __table_args__ = (
+        # Fan-out: every follower of an author
+        Index("ix_FOLLOWS_followee_follower", "followee_id", "follower_id"),
+    )
+
+    follower_id: UUID = Field(foreign_key="USERS.id", primary_key=True, ondelete="CASCADE")
+    followee_id: UUID = Field(foreign_key="USERS.id", primary_key=True, ondelete="CASCADE")
+    created_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
+
+class FollowerCount(SQLModel, table=True):
+    __tablename__ = "FOLLOWER_COUNTS"
+    __description__ = "Denormalized number of followers per user."
+
+    user_id: UUID = Field(foreign_key="USERS.id", primary_key=True, ondelete="CASCADE")
+    follower_count: int = Field(default=0, nullable=False)
+    # Latest post published while above TIMELINE_FANOUT_LIMIT: posts up to here were never pushed
+    pulled_until: datetime | None = Field(default=None, nullable=True)
+
+class TimelineEntry(SQLModel, table=True):
+    __tablename__ = "TIMELINE_ENTRIES"
+    __description__ = "A post pushed into a follower's precomputed timeline."
+    __table_args__ = (
+        # Timeline read: one user's entries, newest first, keyset on (published_at, post_id)
+        Index("ix_TIMELINE_ENTRIES_user_published_at", "user_id", text("published_at DESC"), text("post_id DESC")),
+        # Retracting a deleted or unpublished post from every timeline
+        Index("ix_TIMELINE_ENTRIES_post_id", "post_id"),
+    )
+
+    user_id: UUID = Field(foreign_key="USERS.id", primary_key=True, ondelete="CASCADE")
+    post_id: UUID = Field(foreign_key="POSTS.id", primary_key=True, ondelete="CASCADE")
+    # Copied from the post so unfollowing and paging never join POSTS
+    author_id: UUID = Field(nullable=False)
+    published_at: datetime = Field(nullable=False)
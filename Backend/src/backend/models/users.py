@@ -6,12 +6,20 @@ from sqlmodel import SQLModel,Field
 class User(SQLModel,table = True):
     __tablename__ = "USERS"
     __description__ = "User model representing a user in the system."
-        
+    # Every index on USERS is partial, over live users (or over tombstones, for the purger).
+    # They are created by migrations.create_user_indexes: declaring partial indexes here
+    # would load the dialect modules at import
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    username: str = Field(unique=True, index=True, nullable=False)
+    username: str = Field(nullable=False)
     first_name: str = Field(nullable=False)
     last_name: str = Field(nullable=False)
-    email: EmailStr = Field(unique=True, index=True, nullable=False)
+    email: EmailStr = Field(nullable=False)
     password: str = Field(nullable=False)
     created_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
-    updated_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
\ No newline at end of file
+    updated_at: datetime = Field(nullable=False, default_factory=datetime.utcnow)
+    # Tombstone set by DELETE /users/{id}; the purger removes the row and everything it owns
+    deleted_at: datetime | None = Field(default=None)
+
+# Every read of USERS filters on this, so soft-deleted users are invisible and the partial indexes apply
+USER_IS_LIVE = User.deleted_at.is_(None)
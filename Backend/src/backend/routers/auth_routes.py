@@ -1,59 +1,123 @@
-from select import select
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
-from ..database import get_session
-from ..models.users import User
-from ..utils.security import verify_password, create_access_token, hash_password
+from ..database import DBSession, get_session, run_db
+from ..cruds.crud_auth import revocation_store, token_revocation_ids
+from ..cruds.crud_user import UserCRUD, username_matches
+from ..models.users import USER_IS_LIVE, User
+from ..schemas.auth_schema import RefreshRequest, TokenPair
+from ..schemas.user_schema import UserCreate, UserRead
+from ..utils.security import (
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    create_access_token,
+    create_refresh_token,
+    dummy_password_hash,
+    password_needs_rehash,
+    verify_refresh_token,
+)
+from ..utils.hashing_pool import hash_password_async, verify_password_async
+from ..utils.rate_limit import login_limiter
 
 # Router for authentication-related endpoints
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+###############################################
+# Database Helpers
+###############################################
+def _get_user_by_username(db: Session, username: str) -> User | None:
+    return db.exec(select(User).where(username_matches(username))).first()
+
+def _is_live(db: Session, user_id: str) -> bool:
+    try:
+        user_id = UUID(user_id)
+    except (TypeError, ValueError):
+        return False
+    return db.exec(select(User.id).where(User.id == user_id, USER_IS_LIVE)).first() is not None
+
+###############################################
+# Token Helpers
+###############################################
+def _issue_tokens(user_id: str, username: str | None, session_id: str) -> TokenPair:
+    claims = {"sub": user_id, "username": username, "sid": session_id}
+    refresh_token, _ = create_refresh_token(claims)
+    return TokenPair(access_token=create_access_token(data=claims), refresh_token=refresh_token)
+
+def _refresh_claims(token: str) -> dict:
+    try:
+        return verify_refresh_token(token)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
 ###############################################
 # Authentication Endpoints
 ###############################################
-@router.post("/login", status_code=status.HTTP_200_OK)
-def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_session)):
-    user = db.exec(select(User).where(User.username == form.username)).first()
-    if not user or not verify_password(form.password, user.password):
+@router.post("/login", status_code=status.HTTP_200_OK, response_model=TokenPair)
+async def login(request: Request, form: OAuth2PasswordRequestForm = Depends(), db: DBSession = Depends(get_session)):
+    """Exchanges a username and password for a token pair.
+
+    Throttled attempts are rejected with 429 before the user lookup and the
+    hash check. Unknown users are checked against a dummy hash, so they cost
+    the same as a wrong password. A hash made under an older policy is
+    replaced with one under the current policy while the password is known.
+    The limiter runs in the threadpool, since the Redis backend blocks on I/O.
+    """
+    await run_in_threadpool(login_limiter.check, request.client.host if request.client else None, form.username)
+    user = await run_db(db, _get_user_by_username, form.username)
+    # The dummy hash is built on first use, a full hash that must not run on the event loop
+    hashed = user.password if user else await run_in_threadpool(dummy_password_hash)
+    valid = await verify_password_async(form.password, hashed)
+    if not user or not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": access_token, "token_type": "bearer"}
-
-
-@router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(new_user: User, db: Session = Depends(get_session)):
-    # Check if username already exists
-    existing_username = db.exec(select(User).where(User.username == new_user.username)).first()
-    if existing_username:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered",
-        )
-
-    # Check if email already exists
-    existing_email = db.exec(select(User).where(User.email == new_user.email)).first()
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+    await run_in_threadpool(login_limiter.succeeded, form.username)
+    if password_needs_rehash(user.password):
+        await run_db(db, UserCRUD.set_password_hash, user.id, await hash_password_async(form.password))
+    return _issue_tokens(str(user.id), user.username, str(uuid4()))
 
+
+@router.post("/refresh", status_code=status.HTTP_200_OK, response_model=TokenPair)
+async def refresh(body: RefreshRequest, db: DBSession = Depends(get_session)):
+    """Rotates a refresh token into a new token pair, without any password hashing.
+
+    Tokens of a revoked session, of a deleted user, or issued before the
+    user's last password change are refused.
+    """
+    claims = _refresh_claims(body.refresh_token)
+    revoked = await run_db(db, revocation_store.is_revoked, *token_revocation_ids(claims), issued_at=claims.get("iat"))
+    if revoked or not await run_db(db, _is_live, claims.get("sub")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    # Each refresh token works once; revoking it is also the atomic claim on it
+    if not await run_db(db, revocation_store.revoke, claims["jti"], datetime.utcfromtimestamp(claims["exp"])):
+        # Reuse of an already rotated token: assume it leaked and end the whole session
+        session_expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        await run_db(db, revocation_store.revoke, claims["sid"], session_expires_at)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return _issue_tokens(claims["sub"], claims.get("username"), claims["sid"])
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(body: RefreshRequest, db: DBSession = Depends(get_session)):
+    """Revokes the login session: its refresh tokens and, via ``sid``, its access tokens."""
+    claims = _refresh_claims(body.refresh_token)
+    session_expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    await run_db(db, revocation_store.revoke, claims["jti"], datetime.utcfromtimestamp(claims["exp"]))
+    await run_db(db, revocation_store.revoke, claims["sid"], session_expires_at)
+
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(new_user: User, db: DBSession = Depends(get_session)):
     # Hash password
-    hashed_password = hash_password(new_user.password)
+    hashed_password = await hash_password_async(new_user.password)
 
-    # Create user object
-    user = User(
+    # Create user, relying on the unique indexes to reject duplicates
+    user = UserCreate(
         username=new_user.username,
         email=new_user.email,
         first_name=new_user.first_name,
         last_name=new_user.last_name,
         password=hashed_password,
     )
-
-    # Save user
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    return user
+    return await run_db(db, UserCRUD.create_user, user, ("username", "email"))
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends
+from ..cruds.crud_auth import revocation_purger, revocation_store
+from ..cruds.crud_purge import user_purger
+from ..cruds.crud_search import search_indexer
+from ..cruds.crud_timeline import timeline_trimmer
+from ..database import DBSession, get_pool_stats, get_session as get_db, run_db
+from ..dependencies import require_internal_token
+from ..utils.cache import get_user_cache
+from ..utils.rate_limit import login_limiter
+
+# Router for operational endpoints that are not part of the public API;
+# every call needs the X-Internal-Token header
+router = APIRouter(prefix="/internal", tags=["internal"], dependencies=[Depends(require_internal_token)])
+
+###############################################
+# Database
+###############################################
+@router.get("/db-pool")
+def db_pool_stats():
+    return get_pool_stats()
+
+###############################################
+# Caches
+###############################################
+@router.get("/cache")
+def cache_stats():
+    return {"users": get_user_cache().stats()}
+
+@router.get("/revocations")
+def revocation_stats():
+    return {**revocation_store.stats(), "purge": revocation_purger.stats()}
+
+###############################################
+# Rate Limits
+###############################################
+@router.get("/rate-limits")
+def rate_limit_stats():
+    return {"login": login_limiter.stats()}
+
+###############################################
+# Search Index
+###############################################
+@router.get("/search")
+def search_index_stats():
+    return search_indexer.stats()
+
+@router.post("/search/rebuild")
+async def rebuild_search_index(db: DBSession = Depends(get_db)):
+    """Re-indexes every user and published post from scratch."""
+    return {"indexed": await run_db(db, search_indexer.rebuild)}
+
+###############################################
+# Timelines
+###############################################
+@router.get("/timelines")
+def timeline_stats():
+    return timeline_trimmer.stats()
+
+###############################################
+# User Purge
+###############################################
+@router.get("/user-purge")
+async def user_purge_stats(db: DBSession = Depends(get_db)):
+    """The purger's progress, and how many soft-deleted users are still waiting for it."""
+    return {**user_purger.stats(), "tombstones": await run_db(db, user_purger.tombstones)}
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..utils.metrics import metrics
+
+# Scraped by Prometheus; kept out of the OpenAPI schema
+router = APIRouter(tags=["internal"], include_in_schema=False)
+
+###############################################
+# Prometheus
+###############################################
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,148 @@
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from uuid import UUID
+from ..database import DBSession, get_session as get_db, run_db
+from ..cruds.crud_post import PostCRUD
+from ..dependencies import get_current_user_id, get_optional_user_id
+from ..models.blogs import Post, PostStatus
+from ..schemas.post_schema import PostCreate, PostUpdate, PostRead, PostPage, CommentCreate, CommentRead, CommentPage
+from ..utils.serialization import page_response, schema_columns
+from ..utils.http_cache import PRIVATE_LISTING, PRIVATE_REVALIDATE, PUBLIC_LISTING, PUBLIC_REVALIDATE, is_conditional, is_not_modified, make_etag, not_modified, set_validators
+
+router = APIRouter(prefix="/posts",tags=["Posts"])
+
+# Upper bound for the page size of the feed, author and comment listings
+MAX_PAGE_SIZE = 100
+
+# The feed and author pages select just these and encode the rows directly
+POST_READ_COLUMNS = schema_columns(Post, PostRead)
+
+def _post_etag(version) -> str:
+    # Likes and comments bump the counters but not updated_at, so there is no
+    # Last-Modified for posts: it would answer 304 to a stale like count
+    return make_etag(version.id, version.updated_at, version.like_count, version.comment_count)
+
+def _post_cache_control(post) -> str:
+    # Only the author can see an unpublished post, so it must stay out of shared caches
+    return PUBLIC_REVALIDATE if post.status == PostStatus.PUBLISHED else PRIVATE_REVALIDATE
+
+###############################################
+# CREATE
+###############################################
+@router.post("/", response_model=PostRead, status_code=status.HTTP_201_CREATED)
+async def create_post(post: PostCreate, author_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, PostCRUD.create_post, author_id, post)
+
+###############################################
+# READ
+###############################################
+@router.get("/", response_model=PostPage)
+async def get_feed(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: DBSession = Depends(get_db),
+):
+    posts, next_cursor = await run_db(db, PostCRUD.get_feed_page, limit, cursor, POST_READ_COLUMNS)
+    return page_response(posts, next_cursor, {"Cache-Control": PUBLIC_LISTING})
+
+@router.get("/slug/{slug}", response_model=PostRead)
+async def get_post_by_slug(
+    slug: str,
+    request: Request,
+    response: Response,
+    viewer_id: UUID | None = Depends(get_optional_user_id),
+    db: DBSession = Depends(get_db),
+):
+    """Drafts and archived posts are 404 for everyone but their author."""
+    if is_conditional(request):
+        version = await run_db(db, PostCRUD.get_post_version, slug=slug, viewer_id=viewer_id)
+        etag = _post_etag(version)
+        if is_not_modified(request, etag):
+            return not_modified(etag, None, _post_cache_control(version))
+    post = await run_db(db, PostCRUD.get_post_by_slug, slug, viewer_id)
+    set_validators(response, _post_etag(post), None, _post_cache_control(post))
+    return post
+
+@router.get("/author/{author_id}", response_model=PostPage)
+async def get_author_posts(
+    author_id: UUID,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: DBSession = Depends(get_db),
+):
+    posts, next_cursor = await run_db(db, PostCRUD.get_author_page, author_id, limit, cursor, POST_READ_COLUMNS)
+    return page_response(posts, next_cursor, {"Cache-Control": PUBLIC_LISTING})
+
+@router.get("/{post_id}", response_model=PostRead)
+async def get_post_by_id(
+    post_id: UUID,
+    request: Request,
+    response: Response,
+    viewer_id: UUID | None = Depends(get_optional_user_id),
+    db: DBSession = Depends(get_db),
+):
+    """Conditional requests are answered from the version columns alone, without loading the post.
+
+    Drafts and archived posts are 404 for everyone but their author.
+    """
+    if is_conditional(request):
+        version = await run_db(db, PostCRUD.get_post_version, post_id=post_id, viewer_id=viewer_id)
+        etag = _post_etag(version)
+        if is_not_modified(request, etag):
+            return not_modified(etag, None, _post_cache_control(version))
+    post = await run_db(db, PostCRUD.get_post_by_id, post_id, viewer_id)
+    set_validators(response, _post_etag(post), None, _post_cache_control(post))
+    return post
+
+###############################################
+# UPDATE
+###############################################
+@router.put("/update/{post_id}", response_model=PostRead)
+async def update_post(
+    post_id: UUID,
+    post_update: PostUpdate,
+    author_id: UUID = Depends(get_current_user_id),
+    db: DBSession = Depends(get_db),
+):
+    return await run_db(db, PostCRUD.update_post, post_id, author_id, post_update)
+
+###############################################
+# DELETE
+###############################################
+@router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_post(post_id: UUID, author_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, PostCRUD.delete_post, post_id, author_id)
+
+###############################################
+# LIKES AND COMMENTS
+###############################################
+@router.post("/{post_id}/likes", status_code=status.HTTP_204_NO_CONTENT)
+async def like_post(post_id: UUID, user_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, PostCRUD.like_post, post_id, user_id)
+
+@router.delete("/{post_id}/likes", status_code=status.HTTP_204_NO_CONTENT)
+async def unlike_post(post_id: UUID, user_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, PostCRUD.unlike_post, post_id, user_id)
+
+@router.post("/{post_id}/comments", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
+async def add_comment(
+    post_id: UUID,
+    comment: CommentCreate,
+    author_id: UUID = Depends(get_current_user_id),
+    db: DBSession = Depends(get_db),
+):
+    return await run_db(db, PostCRUD.add_comment, post_id, author_id, comment)
+
+@router.get("/{post_id}/comments", response_model=CommentPage)
+async def get_comments(
+    post_id: UUID,
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    viewer_id: UUID | None = Depends(get_optional_user_id),
+    db: DBSession = Depends(get_db),
+):
+    """A draft's comments are 404 for everyone but its author."""
+    comments, next_cursor = await run_db(db, PostCRUD.get_comments_page, post_id, limit, cursor, viewer_id)
+    # An authenticated page may be a draft's, which must stay out of shared caches
+    response.headers["Cache-Control"] = PUBLIC_LISTING if viewer_id is None else PRIVATE_LISTING
+    return {"items": comments, "next_cursor": next_cursor}
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from ..database import DBSession, get_session as get_db, run_db
+from ..cruds.crud_search import SearchCRUD
+from ..schemas.search_schema import SearchKind, SearchResults
+
+router = APIRouter(prefix="/search",tags=["Search"])
+
+# Upper bound for the number of hits returned by GET /search/
+MAX_RESULTS = 100
+
+###############################################
+# READ
+###############################################
+@router.get("/", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: SearchKind | None = None,
+    limit: int = Query(20, ge=1, le=MAX_RESULTS),
+    db: DBSession = Depends(get_db),
+):
+    """Ranked prefix search over users (username, first and last name) and published posts (title, body)."""
+    hits = await run_db(db, SearchCRUD.search, q, kind.value if kind else None, limit)
+    return {"items": hits}
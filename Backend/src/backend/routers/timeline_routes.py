@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query, Response
+from uuid import UUID
+from ..database import DBSession, get_session as get_db, run_db
+from ..cruds.crud_timeline import TimelineCRUD
+from ..dependencies import get_current_user_id
+from ..schemas.post_schema import PostPage
+from ..utils.http_cache import PRIVATE_LISTING
+
+router = APIRouter(prefix="/timeline",tags=["Timeline"])
+
+# Upper bound for the page size of GET /timeline/
+MAX_PAGE_SIZE = 100
+
+###############################################
+# READ
+###############################################
+@router.get("/", response_model=PostPage)
+async def get_timeline(
+    response: Response,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_id: UUID = Depends(get_current_user_id),
+    db: DBSession = Depends(get_db),
+):
+    """Posts by the authors the current user follows, newest first."""
+    posts, next_cursor = await run_db(db, TimelineCRUD.get_timeline_page, user_id, limit, cursor)
+    response.headers["Cache-Control"] = PRIVATE_LISTING
+    return {"items": posts, "next_cursor": next_cursor}
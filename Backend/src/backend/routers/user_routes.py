@@ -1,53 +1,235 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+from itertools import islice
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from uuid import UUID
-from ..database import get_session as get_db
-from ..cruds.crud_user import UserCRUD
-from ..schemas.user_schema import UserCreate, UserUpdate, UserRead
+from ..database import DBSession, get_session as get_db, run_db
+from ..cruds.crud_follow import FollowCRUD
+from ..cruds.crud_user import USER_READ_COLUMNS, UserCRUD
+from ..dependencies import UserLoader, get_current_user, get_current_user_id, get_user_loader, require_internal_token
+from ..schemas.user_schema import UserCreate, UserUpdate, UserRead, UserPage, UserImportIssue, UserImportReport, UserBatchRequest, UserBatchResult
+from ..utils.hashing_pool import hash_password_async, hash_passwords_bulk
+from ..utils.http_cache import PRIVATE_REVALIDATE, PUBLIC_LISTING, PUBLIC_REVALIDATE, if_match_etags, is_conditional, is_not_modified, make_etag, not_modified, set_validators
+from ..utils.serialization import ndjson_lines, page_response
+from ..utils.user_import import detect_format, iter_import_rows
 
 router = APIRouter(prefix="/users",tags=["Users"])
 
+# Upper bound for the page size of GET /users/
+MAX_PAGE_SIZE = 200
+
+# Upper bound for the keys of one POST /users/batch, across ids, usernames and emails
+MAX_BATCH_SIZE = 100
+
+# Upper bound for rows per INSERT in POST /users/import (SQLite caps bound parameters)
+MAX_IMPORT_BATCH = 2000
+
 ###############################################
 # CREATE
 ###############################################
 @router.post("/createuser", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
-    return UserCRUD.create_user(db, user)
+async def create_user(user: UserCreate, db: DBSession = Depends(get_db)):
+    return await run_db(db, UserCRUD.create_user, user)
+
+@router.post("/import", response_model=UserImportReport, dependencies=[Depends(require_internal_token)])
+async def import_users(
+    file: UploadFile,
+    batch_size: int = Query(500, ge=1, le=MAX_IMPORT_BATCH),
+    db: DBSession = Depends(get_db),
+):
+    """Bulk-creates users from a JSONL or CSV upload.
+
+    Rows are validated, hashed on the shared bulk process pool and inserted
+    batch by batch. Invalid rows and duplicates are reported per line without
+    aborting. Operators only: the X-Internal-Token header is required.
+    """
+    report = UserImportReport()
+    rows = iter_import_rows(file.file, detect_format(file.filename, file.content_type))
+    while chunk := await run_in_threadpool(lambda: list(islice(rows, batch_size))):
+        await _import_batch(db, chunk, report)
+    return report
+
+async def _import_batch(db: DBSession, chunk: list, report: UserImportReport) -> None:
+    valid: list[tuple[int, UserCreate]] = []
+    for line, row, error in chunk:
+        report.total += 1
+        if error is None:
+            try:
+                valid.append((line, UserCreate.model_validate(row)))
+                continue
+            except ValidationError as exc:
+                first = exc.errors()[0]
+                error = f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}"
+        row = row or {}
+        report.invalid.append(UserImportIssue(line=line, username=row.get("username"), email=row.get("email"), detail=error))
+    if not valid:
+        return
+
+    hashed = await hash_passwords_bulk([user.password for _, user in valid])
+    hashable: list[tuple[int, UserCreate]] = []
+    for (line, user), password in zip(valid, hashed):
+        if isinstance(password, ValueError):
+            report.invalid.append(UserImportIssue(line=line, username=user.username, email=user.email, detail=f"password: {password}"))
+        else:
+            hashable.append((line, user.model_copy(update={"password": password})))
+    if not hashable:
+        return
+
+    users = [user for _, user in hashable]
+    conflicts = await run_db(db, UserCRUD.bulk_create_users, users)
+    report.inserted += len(users) - len(conflicts)
+    for index, detail in conflicts.items():
+        line, user = hashable[index]
+        report.conflicts.append(UserImportIssue(line=line, username=user.username, email=user.email, detail=detail))
 
 ###############################################
 # READ
 ###############################################
+@router.get("/export")
+async def export_users(db: DBSession = Depends(get_db)):
+    """Streams every user as newline-delimited JSON, one chunk per fetched batch.
+
+    Like the user listing, the rows are encoded straight from their columns
+    without re-validating them.
+    """
+    async def lines():
+        async for rows in UserCRUD.stream_users(db, columns=USER_READ_COLUMNS):
+            yield ndjson_lines(rows)
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/me", response_model=UserRead)
+async def get_me(request: Request, response: Response, current_user: UserRead = Depends(get_current_user)):
+    etag = make_etag(current_user.id, current_user.updated_at)
+    if is_not_modified(request, etag, current_user.updated_at):
+        return not_modified(etag, current_user.updated_at, PRIVATE_REVALIDATE)
+    set_validators(response, etag, current_user.updated_at, PRIVATE_REVALIDATE)
+    return current_user
+
 @router.get("/{user_id}", response_model=UserRead)
-def get_user_by_id(user_id: UUID, db: Session = Depends(get_db)):
-    return UserCRUD.get_user_by_id(db, user_id)
+async def get_user_by_id(user_id: UUID, request: Request, response: Response, db: DBSession = Depends(get_db)):
+    """Conditional requests are answered from ``updated_at`` alone, without loading the user."""
+    if is_conditional(request):
+        updated_at = await run_db(db, UserCRUD.get_user_version, user_id)
+        etag = make_etag(user_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at, PUBLIC_REVALIDATE)
+    user = await run_db(db, UserCRUD.get_user_by_id, user_id)
+    set_validators(response, make_etag(user.id, user.updated_at), user.updated_at, PUBLIC_REVALIDATE)
+    return user
 
 @router.get("/email/{email}", response_model=UserRead)
-def get_user_by_email(email: str, db: Session = Depends(get_db)):
-    return UserCRUD.get_user_by_email(db, email)
+async def get_user_by_email(email: str, request: Request, response: Response, db: DBSession = Depends(get_db)):
+    if is_conditional(request):
+        user_id, updated_at = await run_db(db, UserCRUD.get_user_version_by_email, email)
+        etag = make_etag(user_id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at, PUBLIC_REVALIDATE)
+    user = await run_db(db, UserCRUD.get_user_by_email, email)
+    set_validators(response, make_etag(user.id, user.updated_at), user.updated_at, PUBLIC_REVALIDATE)
+    return user
 
 @router.get("/username/{username}/id", response_model=UUID)
-def get_user_id_by_username(username: str, db: Session = Depends(get_db)):
-    return UserCRUD.get_user_id_by_username(db, username)
+async def get_user_id_by_username(username: str, db: DBSession = Depends(get_db)):
+    return await run_db(db, UserCRUD.get_user_id_by_username, username)
 
 @router.get("/email/{email}/id", response_model=UUID)
-def get_user_id_by_email(email: str, db: Session = Depends(get_db)):
-    return UserCRUD.get_user_id_by_email(db, email)
+async def get_user_id_by_email(email: str, db: DBSession = Depends(get_db)):
+    return await run_db(db, UserCRUD.get_user_id_by_email, email)
 
-@router.get("/", response_model=List[UserRead])
-def get_all_users(db: Session = Depends(get_db)):
-    return UserCRUD.get_all_users(db)
+@router.post("/batch", response_model=UserBatchResult)
+async def get_users_batch(batch: UserBatchRequest, loader: UserLoader = Depends(get_user_loader)):
+    """Resolves many users at once, with one query per kind of key.
+
+    Every requested key comes back, mapped to null when no user matches.
+    """
+    keys = len(batch.ids) + len(batch.usernames) + len(batch.emails)
+    if keys > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may hold at most {MAX_BATCH_SIZE} keys, got {keys}",
+        )
+    ids, usernames, emails = await asyncio.gather(
+        loader.by_id.load_many(batch.ids),
+        loader.by_username.load_many(batch.usernames),
+        loader.by_email.load_many(batch.emails),
+    )
+    return UserBatchResult(
+        ids=dict(zip(batch.ids, ids)),
+        usernames=dict(zip(batch.usernames, usernames)),
+        emails=dict(zip(batch.emails, emails)),
+    )
+
+@router.get("/{user_id}/following", response_model=list[UUID])
+async def get_following(user_id: UUID, db: DBSession = Depends(get_db)):
+    return await run_db(db, FollowCRUD.get_following, user_id)
+
+@router.get("/", response_model=UserPage)
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: DBSession = Depends(get_db),
+):
+    users, next_cursor = await run_db(db, UserCRUD.get_users_page, limit, cursor, USER_READ_COLUMNS)
+    return page_response(users, next_cursor, {"Cache-Control": PUBLIC_LISTING})
+
+###############################################
+# FOLLOW
+###############################################
+@router.post("/{user_id}/follow", status_code=status.HTTP_204_NO_CONTENT)
+async def follow_user(user_id: UUID, follower_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, FollowCRUD.follow, follower_id, user_id)
+
+@router.delete("/{user_id}/follow", status_code=status.HTTP_204_NO_CONTENT)
+async def unfollow_user(user_id: UUID, follower_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    return await run_db(db, FollowCRUD.unfollow, follower_id, user_id)
 
 ###############################################
 # UPDATE
 ###############################################
+def _require_self(user_id: UUID, current_user_id: UUID) -> None:
+    if user_id != current_user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to change another user")
+
+@router.patch("/{user_id}", response_model=UserRead)
+async def patch_user(
+    user_id: UUID,
+    user_update: UserUpdate,
+    request: Request,
+    response: Response,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: DBSession = Depends(get_db),
+):
+    """Updates only the fields sent, in a single UPDATE ... RETURNING.
+
+    Users may only change their own account. Send the ETag of a previous
+    GET as If-Match to update only if nobody changed the user since;
+    otherwise the answer is 412. A new password is hashed before it is
+    stored, and every token issued before it stops working.
+    """
+    _require_self(user_id, current_user_id)
+    if user_update.password is not None:
+        user_update = user_update.model_copy(update={"password": await hash_password_async(user_update.password)})
+    user = await run_db(db, UserCRUD.update_user, user_id, user_update, if_match_etags(request))
+    response.headers["ETag"] = make_etag(user.id, user.updated_at)
+    return user
+
 @router.put("/update/{user_id}", response_model=UserRead)
-def update_user(user_id: UUID, user_update: UserUpdate, db: Session = Depends(get_db)):
-    return UserCRUD.update_user(db, user_id, user_update)
+async def update_user(
+    user_id: UUID,
+    user_update: UserUpdate,
+    request: Request,
+    response: Response,
+    current_user_id: UUID = Depends(get_current_user_id),
+    db: DBSession = Depends(get_db),
+):
+    return await patch_user(user_id, user_update, request, response, current_user_id, db)
 
 ###############################################
 # DELETE
 ###############################################
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: UUID, db: Session = Depends(get_db)):
-    return UserCRUD.delete_user(db, user_id)
+async def delete_user(user_id: UUID, current_user_id: UUID = Depends(get_current_user_id), db: DBSession = Depends(get_db)):
+    _require_self(user_id, current_user_id)
+    return await run_db(db, UserCRUD.delete_user, user_id)
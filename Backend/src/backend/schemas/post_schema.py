@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+from ..models.blogs import PostStatus
+
+class PostCreate(BaseModel):
+    title: str = Field(min_length=1, max_length=200)
+    body: str
+    slug: Optional[str] = Field(default=None, pattern=r"^[a-z0-9]+(?:-[a-z0-9]+)*$", max_length=120)
+    status: PostStatus = PostStatus.DRAFT
+
+class PostUpdate(BaseModel):
+    title: Optional[str] = Field(default=None, min_length=1, max_length=200)
+    body: Optional[str] = None
+    status: Optional[PostStatus] = None
+
+class PostRead(BaseModel):
+    id: UUID
+    author_id: UUID
+    slug: str
+    title: str
+    body: str
+    status: PostStatus
+    published_at: Optional[datetime]
+    comment_count: int
+    like_count: int
+    created_at: datetime
+    updated_at: datetime
+
+class PostPage(BaseModel):
+    items: List[PostRead]
+    next_cursor: Optional[str] = None
+
+class CommentCreate(BaseModel):
+    body: str = Field(min_length=1)
+
+class CommentRead(BaseModel):
+    id: UUID
+    post_id: UUID
+    author_id: UUID
+    body: str
+    created_at: datetime
+
+class CommentPage(BaseModel):
+    items: List[CommentRead]
+    next_cursor: Optional[str] = None
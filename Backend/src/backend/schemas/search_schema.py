@@ -0,0 +1,17 @@
+from enum import Enum
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel
+
+class SearchKind(str, Enum):
+    USER = "user"
+    POST = "post"
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: UUID
+    title: str
+    rank: float
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
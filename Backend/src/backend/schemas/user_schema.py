@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 class UserCreate(BaseModel):
     username: str
@@ -11,6 +11,8 @@ class UserCreate(BaseModel):
     password: str
 
 class UserRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     username: str
     first_name: str
@@ -19,12 +21,36 @@ class UserRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        orm_mode = True
+class UserPage(BaseModel):
+    items: List[UserRead]
+    next_cursor: Optional[str] = None
+
+class UserBatchRequest(BaseModel):
+    ids: List[UUID] = []
+    usernames: List[str] = []
+    emails: List[str] = []
+
+class UserBatchResult(BaseModel):
+    """Every requested key, mapped to its user or to null when there is none."""
+    ids: Dict[UUID, Optional[UserRead]] = {}
+    usernames: Dict[str, Optional[UserRead]] = {}
+    emails: Dict[str, Optional[UserRead]] = {}
+
+class UserImportIssue(BaseModel):
+    line: int
+    username: Optional[str] = None
+    email: Optional[str] = None
+    detail: str
+
+class UserImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    conflicts: List[UserImportIssue] = []
+    invalid: List[UserImportIssue] = []
 
 class UserUpdate(BaseModel):
-    username: Optional[str]
-    first_name: Optional[str]
-    last_name: Optional[str]
-    email: Optional[EmailStr]
-    password: Optional[str]
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    password: Optional[str] = None
@@ -0,0 +1,120 @@
+import os
+from dataclasses import dataclass, fields
+
+###############################################
+# Settings
+###############################################
+
+def _parse(name: str, raw: str, kind):
+    try:
+        if kind is bool:
+            return raw.lower() in ("1", "true", "yes")
+        if kind in (int, float):
+            return kind(raw)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {raw!r}")
+    return raw
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Every environment variable the app reads, parsed once at import.
+
+    Each field comes from the upper-cased variable of the same name, after
+    loading ``.env``, and falls back to the default here. Nothing is
+    required at import time: a missing DATABASE_URL only fails when the
+    engine is first built, a missing SECRET_KEY when a token is signed.
+    """
+
+    # Database
+    database_url: str | None = None
+    async_database_url: str | None = None
+    db_async: bool = False
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_migrate_on_startup: bool = True
+    # Comma-separated read replica URLs; GET requests read from them round-robin
+    database_replica_urls: str | None = None
+    db_replica_sticky_seconds: float = 5
+    db_replica_check_seconds: float = 5
+
+    # Tokens
+    secret_key: str | None = None
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 14
+    token_cache_size: int = 4096
+    token_backend: str = "pyjwt"
+    jwt_jwks_path: str | None = None
+    jwt_signing_jwk_path: str | None = None
+    jwt_keys_refresh_seconds: float = 30
+    revocation_bloom_capacity: int = 100000
+    revocation_sync_seconds: float = 5
+    # Longest a transaction may run between stamping revoked_at and committing
+    revocation_sync_overlap_seconds: float = 60
+    revocation_purge_seconds: float = 3600
+
+    # Password hashing
+    password_hash_scheme: str = "bcrypt"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536  # KiB
+    argon2_parallelism: int = 4
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = os.cpu_count() or 1
+    password_hash_queue_size: int = 64
+    password_import_workers: int = os.cpu_count() or 1
+
+    # Login rate limiting
+    login_rate_limit_backend: str = "memory"
+    login_rate_limit_url: str = "redis://localhost:6379/0"
+    login_ip_burst: int = 60
+    login_ip_per_minute: float = 60
+    login_username_burst: int = 10
+    login_username_per_minute: float = 1
+    rate_limit_max_keys: int = 100000
+
+    # User cache
+    user_cache_backend: str = "memory"
+    user_cache_ttl: int = 60
+    user_cache_max_entries: int = 10000
+    user_cache_url: str = "redis://localhost:6379/0"
+
+    # Background workers
+    search_index_interval: float = 1
+    search_index_batch: int = 500
+    timeline_fanout_limit: int = 10000
+    timeline_max_entries: int = 500
+    timeline_trim_seconds: float = 5
+    timeline_trim_batch: int = 500
+    user_purge_interval: float = 5
+    user_purge_batch: int = 500
+    user_purge_pause: float = 0.05
+
+    # Observability
+    # Shared token for the /internal endpoints; unset keeps them closed
+    internal_api_token: str | None = None
+    slow_query_ms: float = 200
+    n_plus_one_threshold: int = 10
+
+    @classmethod
+    def from_env(cls, load_env_file: bool = True) -> "Settings":
+        """Reads every field from the environment, loading ``.env`` first unless told not to."""
+        if load_env_file:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+        values = {}
+        for field in fields(cls):
+            raw = os.environ.get(field.name.upper())
+            if raw is not None:
+                kind = field.type if field.type in (bool, int, float) else str
+                values[field.name] = _parse(field.name.upper(), raw, kind)
+        return cls(**values)
+
+
+settings = Settings.from_env()
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlush:
+    """Runs ``flush(db)`` on a background task every ``interval`` seconds.
+
+    Subclasses queue work in memory from request handlers and implement
+    ``pending`` and ``flush``; the task only opens a session when there is
+    something to do. ``stop`` flushes once more so queued work survives a
+    clean shutdown.
+    """
+
+    name = "background"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._engine: Engine | None = None
+        self._task: asyncio.Task | None = None
+        self.failures = 0
+
+    @property
+    def pending(self) -> int:
+        raise NotImplementedError
+
+    def flush(self, db: Session) -> int:
+        raise NotImplementedError
+
+    def start(self, engine: Engine) -> None:
+        """Starts the periodic flush on the running event loop."""
+        self._engine = engine
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the periodic flush and processes whatever is still pending."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await run_in_threadpool(self._flush_engine)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.pending:
+                continue
+            try:
+                await run_in_threadpool(self._flush_engine)
+            except Exception:
+                self.failures += 1
+                logger.exception("%s flush failed", self.name)
+
+    def _flush_engine(self) -> int:
+        with Session(self._engine) as db:
+            return self.flush(db)
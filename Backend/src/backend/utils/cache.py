@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+USER_CACHE_BACKEND = settings.user_cache_backend
+USER_CACHE_TTL = settings.user_cache_ttl
+USER_CACHE_MAX_ENTRIES = settings.user_cache_max_entries
+USER_CACHE_URL = settings.user_cache_url
+
+
+###############################################
+# Cache Backends
+###############################################
+
+class CacheBackend:
+    """Key/value cache for JSON-serializable values.
+
+    Subclasses implement ``_get``, ``_set`` and ``_delete``; the public
+    methods keep the hit/miss/eviction counters.
+    """
+
+    name = "base"
+
+    def __init__(self, ttl: int = 60):
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key: str) -> Any | None:
+        """Returns the cached value, or None on a miss."""
+        value = self._get(key)
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self._set(key, value, self.ttl if ttl is None else ttl)
+        self._count("sets")
+
+    def delete(self, *keys: str) -> None:
+        """Invalidates every given key."""
+        if keys:
+            self._delete(keys)
+            self._count("invalidations", len(keys))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "sets": self.sets,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def _delete(self, keys: tuple[str, ...]) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Cache that never stores anything; every lookup is a miss."""
+
+    name = "none"
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, value, ttl):
+        pass
+
+    def _delete(self, keys):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process cache with a per-entry TTL and LRU eviction at ``max_entries``.
+
+    Values are stored as given, so callers should store plain data rather
+    than objects they go on mutating.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl: int = 60, max_entries: int = 10000):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._count("evictions")
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._count("evictions")
+
+    def _delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data.update(size=len(self._entries), max_entries=self.max_entries)
+        return data
+
+
+class RedisCache(CacheBackend):
+    """Cache stored in Redis (or anything speaking its protocol).
+
+    ``client`` only needs redis-py's ``get``, ``set(..., ex=)`` and ``delete``,
+    so tests can pass a small in-memory fake. Expiry and eviction happen on
+    the server, so ``evictions`` stays at zero here.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: int = 60, prefix: str = "blog:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int = 60) -> "RedisCache":
+        import redis
+
+        return cls(redis.Redis.from_url(url), ttl=ttl)
+
+    def _get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def _set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def _delete(self, keys):
+        self.client.delete(*(self.prefix + key for key in keys))
+
+
+def cache_from_env() -> CacheBackend:
+    """Builds the user cache selected by USER_CACHE_BACKEND (memory, redis or none)."""
+    if USER_CACHE_BACKEND == "redis":
+        return RedisCache.from_url(USER_CACHE_URL, ttl=USER_CACHE_TTL)
+    if USER_CACHE_BACKEND == "none":
+        return NullCache(ttl=USER_CACHE_TTL)
+    return MemoryCache(ttl=USER_CACHE_TTL, max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+# Cache in front of the UserCRUD getters; swap it with set_user_cache
+user_cache: CacheBackend = cache_from_env()
+
+def set_user_cache(backend: CacheBackend) -> None:
+    """Replaces the cache used by UserCRUD."""
+    global user_cache
+    user_cache = backend
+
+def get_user_cache() -> CacheBackend:
+    return user_cache
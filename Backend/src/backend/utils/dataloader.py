@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+
+###############################################
+# DataLoader
+###############################################
+
+class DataLoader:
+    """Coalesces ``load(key)`` calls into batched ``batch_fn(keys)`` calls.
+
+    Every key requested before the event loop gets back to the loader (for
+    example by coroutines started together with ``asyncio.gather``) is
+    fetched by one call, at most ``max_batch_size`` keys at a time.
+    ``batch_fn`` returns a dict; keys missing from it load as None. Results
+    are memoized for the loader's lifetime, so create one per request.
+    """
+
+    def __init__(self, batch_fn: Callable[[list], Awaitable[dict]], max_batch_size: int = 100):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self._queue: list[Hashable] = []
+
+    async def load(self, key: Hashable) -> Any | None:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # Runs after every callback already scheduled, so their loads join this batch
+                loop.call_soon(lambda: loop.create_task(self._dispatch()))
+        return await future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any | None]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = keys[start:start + self.max_batch_size]
+            self.batches += 1
+            try:
+                results = await self.batch_fn(batch)
+            except Exception as exc:
+                for key in batch:
+                    # Forget failures, so a later load can try again
+                    self._futures.pop(key).set_exception(exc)
+                continue
+            for key in batch:
+                self._futures[key].set_result(results.get(key))
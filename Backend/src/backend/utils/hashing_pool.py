@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from .security import hash_password, verify_password
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+PASSWORD_HASH_EXECUTOR = settings.password_hash_executor
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_QUEUE_SIZE = settings.password_hash_queue_size
+PASSWORD_IMPORT_WORKERS = settings.password_import_workers
+
+
+###############################################
+# Password Hashing Pool
+###############################################
+
+class PasswordHashingPool:
+    """Bounded executor that keeps bcrypt work off the event loop and Starlette's threadpool.
+
+    At most ``max_workers + max_queue`` jobs are admitted at once; anything beyond
+    that is rejected immediately with a 503 instead of queueing without limit.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 1, max_queue: int = 0):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pwhash")
+        return self._executor
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def executor(self) -> Executor:
+        """The pool's executor, created on first use. Work submitted to it directly skips admission."""
+        with self._lock:
+            return self._get_executor()
+
+    async def run(self, fn, *args):
+        """Runs ``fn(*args)`` on the pool, raising 503 if the pool is saturated."""
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor(), fn, *args)
+        finally:
+            self._release()
+
+    def shutdown(self) -> None:
+        """Stops the workers. The pool is recreated on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = PasswordHashingPool(
+    kind=PASSWORD_HASH_EXECUTOR,
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_queue=PASSWORD_HASH_QUEUE_SIZE,
+)
+
+# Process pool for bulk imports, kept apart from the request hashing pool.
+# Imports would otherwise fill the bounded pool and turn logins into 503s.
+bulk_hashing_pool = PasswordHashingPool(kind="process", max_workers=PASSWORD_IMPORT_WORKERS)
+
+
+###############################################
+# Async Helpers
+###############################################
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a plaintext password on the hashing pool."""
+    return await hashing_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password against its hash on the hashing pool."""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+###############################################
+# Bulk Hashing
+###############################################
+
+async def hash_passwords_bulk(passwords: list[str]) -> list[str | ValueError]:
+    """Hashes many passwords in parallel on the bulk pool, preserving their order.
+
+    A password the policy refuses (bcrypt's 72-byte limit) yields its
+    ValueError in place of a hash, so one bad row does not fail the rest.
+    """
+    loop = asyncio.get_running_loop()
+    executor = bulk_hashing_pool.executor()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, hash_password, password) for password in passwords),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, ValueError):
+            raise result
+    return results
@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response, status
+
+###############################################
+# Cache-Control Policies
+###############################################
+# Single resources: caches may store them but must revalidate, which is a cheap 304
+PUBLIC_REVALIDATE = "public, no-cache"
+# Anything that depends on the bearer token must never sit in a shared cache
+PRIVATE_REVALIDATE = "private, no-cache"
+# Listings change with every new row, so a short freshness window absorbs polling
+PUBLIC_LISTING = "public, max-age=5"
+PRIVATE_LISTING = "private, max-age=5"
+
+
+###############################################
+# Validators
+###############################################
+def _utc(moment: datetime) -> datetime:
+    """Naive timestamps from the database are UTC; aware ones are converted."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+def make_etag(*parts) -> str:
+    """Builds a strong ETag from the values that identify one version of a resource."""
+    raw = ":".join(_utc(part).isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+def if_match_etags(request: Request) -> list[str] | None:
+    """The entity tags named by If-Match.
+
+    Returns None when there is no precondition (no header, or ``*``, which
+    only asks that the resource exists). If-Match uses the strong
+    comparison, so weak tags are dropped; an empty list means nothing can
+    match.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tags = (tag.strip() for tag in if_match.split(","))
+    return [tag for tag in tags if tag.startswith('"') and tag.endswith('"') and len(tag) > 1]
+
+def http_date(moment: datetime) -> str:
+    """Formats a timestamp as an IMF-fixdate for Last-Modified."""
+    return format_datetime(_utc(moment).replace(microsecond=0), usegmt=True)
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Evaluates If-None-Match, or If-Modified-Since when no ETag was sent (RFC 9110 13.2.2).
+
+    If-None-Match uses the weak comparison, so a ``W/`` prefix added by a
+    compressing proxy still matches. Last-Modified has one-second precision,
+    so ``last_modified`` is truncated before comparing.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return _utc(last_modified).replace(microsecond=0) <= since
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Cache-Control"] = cache_control
+
+def not_modified(etag: str, last_modified: datetime | None, cache_control: str) -> Response:
+    """An empty 304 carrying the same validators a 200 would have."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified, cache_control)
+    return response
@@ -0,0 +1,215 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+###############################################
+# Environment Variables
+###############################################
+SLOW_QUERY_MS = settings.slow_query_ms
+# A request running one statement more often than this is logged as a likely N+1
+N_PLUS_ONE_THRESHOLD = settings.n_plus_one_threshold
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+###############################################
+# Prometheus Primitives
+###############################################
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in self._values.items()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, as Prometheus expects."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for labels, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == "+Inf" else f'le="{_number(bound)}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total[0])}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+###############################################
+# Application Metrics
+###############################################
+
+class RequestStats:
+    """Queries run on behalf of one HTTP request, filled in by the SQL hooks."""
+
+    __slots__ = ("queries", "db_time", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: dict[str, int] = {}
+
+    def repeated(self) -> tuple[str, int] | None:
+        """The statement run most often, if it ran more than N_PLUS_ONE_THRESHOLD times."""
+        if not self.statements:
+            return None
+        statement, count = max(self.statements.items(), key=lambda item: item[1])
+        return (statement, count) if count > N_PLUS_ONE_THRESHOLD else None
+
+
+# Set by the timing middleware; the threadpool and run_sync both copy the context,
+# so the hooks see the same object whichever thread runs the query
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Metrics:
+    """Every metric the app exposes on /metrics."""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status")
+        )
+        self.request_db_duration = Histogram(
+            "http_request_db_duration_seconds", "Time spent in SQL per request.", ("method", "route")
+        )
+        self.request_queries = Histogram(
+            "http_request_queries", "SQL statements per request.", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+        )
+        self.n_plus_one = Counter(
+            "http_request_n_plus_one_total", "Requests that repeated one statement above the threshold.", ("method", "route")
+        )
+        self.queries = Counter("db_queries_total", "SQL statements executed, in requests or not.")
+        self.query_duration = Counter("db_query_duration_seconds_total", "Time spent executing SQL.")
+        self.slow_queries = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+
+    def all(self) -> list:
+        return [
+            self.request_duration, self.request_db_duration, self.request_queries, self.n_plus_one,
+            self.queries, self.query_duration, self.slow_queries,
+        ]
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        self.queries.inc()
+        self.query_duration.inc(amount=seconds)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += seconds
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+        if seconds * 1000 >= SLOW_QUERY_MS:
+            self.slow_queries.inc()
+            logger.warning("slow query (%.1fms): %s", seconds * 1000, " ".join(statement.split()))
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        self.request_duration.observe(seconds, method, route, str(status))
+        self.request_db_duration.observe(stats.db_time, method, route)
+        self.request_queries.observe(stats.queries, method, route)
+        repeated = stats.repeated()
+        if repeated is not None:
+            self.n_plus_one.inc(method, route)
+            statement, count = repeated
+            logger.warning("possible N+1 in %s %s: %d queries, one statement %d times: %s",
+                           method, route, stats.queries, count, " ".join(statement.split())[:200])
+
+    def render(self, extra: list[str] | None = None) -> str:
+        """The Prometheus text exposition of every metric, plus preformatted ``extra`` lines."""
+        lines = []
+        for metric in self.all():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        lines.extend(extra or [])
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+###############################################
+# SQL Hooks
+###############################################
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics.record_query(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+def attach_query_hooks(engine) -> None:
+    """Times every statement of a sync engine (``async_engine.sync_engine`` for async)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
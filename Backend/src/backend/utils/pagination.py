@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+from fastapi import HTTPException, status
+
+###############################################
+# Keyset Cursors
+###############################################
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encodes the keyset position of the last row on a page as an opaque token."""
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodes a cursor produced by ``encode_cursor``.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
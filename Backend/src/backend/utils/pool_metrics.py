@@ -0,0 +1,96 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+###############################################
+# Connection Pool Metrics
+###############################################
+
+class PoolStats:
+    """Counters fed by SQLAlchemy pool events for one engine.
+
+    Checkout wait time is measured around the pool's internal ``_do_get``,
+    which is where a request blocks when every connection is checked out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _record_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def _bump(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def pool_class(self, base: type[Pool] = QueuePool) -> type[Pool]:
+        """Returns a subclass of ``base`` that reports checkout wait time here.
+
+        The subclass survives ``Pool.recreate`` (used by ``engine.dispose``)
+        because the stats object is captured in the class, not the instance.
+        """
+        stats = self
+
+        class InstrumentedPool(base):
+            def _do_get(self):
+                start = time.perf_counter()
+                timed_out = False
+                try:
+                    return super()._do_get()
+                except PoolTimeoutError:
+                    timed_out = True
+                    raise
+                finally:
+                    stats._record_wait(time.perf_counter() - start, timed_out)
+
+        InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def attach(self, engine) -> None:
+        """Listens to the pool events of a sync engine (``async_engine.sync_engine`` for async)."""
+        event.listen(engine, "connect", lambda *_: self._bump("connects"))
+        event.listen(engine, "checkout", lambda *_: self._bump("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self._bump("checkins"))
+        event.listen(engine, "invalidate", lambda *_: self._bump("invalidations"))
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Returns the counters together with the pool's live gauges."""
+        with self._lock:
+            data = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.wait_count, 3) if self.wait_count else 0.0,
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout=pool.timeout(),
+            )
+        return data
@@ -0,0 +1,214 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, status
+from ..settings import settings
+
+###############################################
+# Environment Variables
+###############################################
+LOGIN_RATE_LIMIT_BACKEND = settings.login_rate_limit_backend
+LOGIN_RATE_LIMIT_URL = settings.login_rate_limit_url
+# Burst size and sustained attempts per minute, per client IP and per username
+LOGIN_IP_BURST = settings.login_ip_burst
+LOGIN_IP_PER_MINUTE = settings.login_ip_per_minute
+LOGIN_USERNAME_BURST = settings.login_username_burst
+LOGIN_USERNAME_PER_MINUTE = settings.login_username_per_minute
+RATE_LIMIT_MAX_KEYS = settings.rate_limit_max_keys
+
+
+###############################################
+# Token Bucket Backends
+###############################################
+
+class TokenBuckets:
+    """Token buckets keyed by string.
+
+    ``take`` removes one token from the bucket at ``key`` (created full),
+    after refilling it at ``rate`` tokens per second up to ``capacity``.
+    It returns 0 when a token was taken, otherwise the seconds until one
+    will be available.
+    """
+
+    name = "base"
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        raise NotImplementedError
+
+    def reset(self, key: str) -> None:
+        """Refills the bucket at ``key``."""
+        raise NotImplementedError
+
+
+class NullBuckets(TokenBuckets):
+    """Never limits anything."""
+
+    name = "none"
+
+    def take(self, key, capacity, rate):
+        return 0.0
+
+    def reset(self, key):
+        pass
+
+
+class MemoryBuckets(TokenBuckets):
+    """Per-process buckets, with LRU eviction past ``max_keys``.
+
+    An evicted bucket comes back full, so the bound trades a little
+    precision under a very wide attack for fixed memory.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key, capacity, rate):
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisBuckets(TokenBuckets):
+    """Buckets shared by every worker, stored in Redis as (tokens, updated_at) hashes.
+
+    The refill-and-take runs as one Lua script, so concurrent workers never
+    both spend the last token. Timestamps come from the caller's wall clock.
+    """
+
+    name = "redis"
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, client, prefix: str = "blog:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBuckets":
+        import redis
+
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key, capacity, rate):
+        return float(self._script(keys=[self.prefix + key], args=[capacity, rate, time.time()]))
+
+    def reset(self, key):
+        self.client.delete(self.prefix + key)
+
+
+def buckets_from_env() -> TokenBuckets:
+    """Builds the backend selected by LOGIN_RATE_LIMIT_BACKEND (memory, redis or none)."""
+    if LOGIN_RATE_LIMIT_BACKEND == "redis":
+        return RedisBuckets.from_url(LOGIN_RATE_LIMIT_URL)
+    if LOGIN_RATE_LIMIT_BACKEND == "none":
+        return NullBuckets()
+    return MemoryBuckets(max_keys=RATE_LIMIT_MAX_KEYS)
+
+
+###############################################
+# Login Limiter
+###############################################
+
+class LoginLimiter:
+    """Throttles login attempts per client IP and per username.
+
+    Checked before the user lookup and the password hash, so a rejected
+    attempt costs two bucket operations. The IP bucket stops one source
+    spraying many accounts; the username bucket stops many sources
+    guessing one account. A successful login refills its username bucket.
+    """
+
+    def __init__(self, buckets: TokenBuckets,
+                 ip_burst: int = LOGIN_IP_BURST, ip_per_minute: float = LOGIN_IP_PER_MINUTE,
+                 username_burst: int = LOGIN_USERNAME_BURST, username_per_minute: float = LOGIN_USERNAME_PER_MINUTE):
+        self.buckets = buckets
+        self.ip_policy = (ip_burst, ip_per_minute / 60)
+        self.username_policy = (username_burst, username_per_minute / 60)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_username = 0
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def check(self, ip: str | None, username: str) -> None:
+        """Spends one attempt for the IP and the username.
+
+        Raises:
+            HTTPException: 429 with Retry-After when either bucket is empty
+        """
+        wait = self.buckets.take(f"ip:{ip}", *self.ip_policy) if ip else 0.0
+        if wait:
+            self._count("rejected_ip")
+            self._reject(wait)
+        wait = self.buckets.take(f"user:{username.lower()}", *self.username_policy)
+        if wait:
+            self._count("rejected_username")
+            self._reject(wait)
+        self._count("allowed")
+
+    def _reject(self, wait: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+    def succeeded(self, username: str) -> None:
+        self.buckets.reset(f"user:{username.lower()}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": self.buckets.name,
+                "allowed": self.allowed,
+                "rejected_ip": self.rejected_ip,
+                "rejected_username": self.rejected_username,
+            }
+
+
+login_limiter = LoginLimiter(buckets_from_env())
@@ -0,0 +1,202 @@
+import re
+from uuid import UUID
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session
+
+###############################################
+# Query Parsing
+###############################################
+
+# Words beyond this are ignored; every term must match, so more only narrows
+SEARCH_MAX_TERMS = 8
+
+def search_terms(query: str) -> list[str]:
+    """Splits a user query into lowercase word terms.
+
+    Only letters and digits survive, which matches how both the FTS5
+    unicode61 tokenizer and Postgres' ``simple`` parser split documents and
+    keeps query syntax characters out of the MATCH / to_tsquery input.
+    """
+    return re.findall(r"[^\W_]+", query.lower())[:SEARCH_MAX_TERMS]
+
+
+###############################################
+# Search Backends
+###############################################
+
+class SearchBackend:
+    """Stores search documents and runs ranked, prefix-matching queries.
+
+    A document is ``(kind, ref_id, title, body)``; the title weighs more
+    than the body when ranking. Every term of a query must match, and the
+    last characters of each term may be missing (``"pyth"`` finds
+    ``"python"``).
+    """
+
+    dialect = "base"
+
+    def create_schema(self, conn: Connection) -> None:
+        raise NotImplementedError
+
+    def upsert(self, db: Session, documents: list[tuple[str, UUID, str, str]]) -> None:
+        raise NotImplementedError
+
+    def remove(self, db: Session, kind: str, ref_ids: list[UUID]) -> None:
+        raise NotImplementedError
+
+    def clear(self, db: Session) -> None:
+        raise NotImplementedError
+
+    def search(self, db: Session, terms: list[str], kind: str | None, limit: int) -> list[dict]:
+        """Returns up to ``limit`` hits as ``{"kind", "id", "title", "rank"}``, best first."""
+        raise NotImplementedError
+
+
+class PostgresSearch(SearchBackend):
+    """tsvector column with a GIN index, ranked with ``ts_rank_cd``.
+
+    The vector is a stored generated column, so it is always consistent with
+    the title and body it was computed from. The ``simple`` configuration
+    (no stemming, no stop words) keeps usernames intact and behaves like
+    the SQLite fallback.
+    """
+
+    dialect = "postgresql"
+
+    def create_schema(self, conn):
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS "SEARCH_DOCUMENTS" ('
+            " kind VARCHAR(16) NOT NULL,"
+            " ref_id UUID NOT NULL,"
+            " title TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " document TSVECTOR GENERATED ALWAYS AS ("
+            "  setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')"
+            " ) STORED,"
+            " PRIMARY KEY (kind, ref_id))"
+        ))
+        conn.execute(text('CREATE INDEX IF NOT EXISTS "ix_SEARCH_DOCUMENTS_document" ON "SEARCH_DOCUMENTS" USING GIN (document)'))
+
+    def upsert(self, db, documents):
+        if not documents:
+            return
+        db.execute(
+            text(
+                'INSERT INTO "SEARCH_DOCUMENTS" (kind, ref_id, title, body) VALUES (:kind, :ref_id, :title, :body)'
+                " ON CONFLICT (kind, ref_id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body"
+            ),
+            [{"kind": kind, "ref_id": ref_id, "title": title, "body": body} for kind, ref_id, title, body in documents],
+        )
+
+    def remove(self, db, kind, ref_ids):
+        if not ref_ids:
+            return
+        stmt = text('DELETE FROM "SEARCH_DOCUMENTS" WHERE kind = :kind AND ref_id IN :ref_ids')
+        db.execute(stmt.bindparams(bindparam("ref_ids", expanding=True)), {"kind": kind, "ref_ids": ref_ids})
+
+    def clear(self, db):
+        db.execute(text('TRUNCATE "SEARCH_DOCUMENTS"'))
+
+    def search(self, db, terms, kind, limit):
+        if not terms:
+            return []
+        sql = (
+            "SELECT kind, ref_id, title, ts_rank_cd(document, query) AS rank"
+            ' FROM "SEARCH_DOCUMENTS", to_tsquery(\'simple\', :query) AS query'
+            " WHERE document @@ query"
+            + (" AND kind = :kind" if kind else "")
+            + " ORDER BY rank DESC LIMIT :limit"
+        )
+        rows = db.execute(text(sql), {"query": " & ".join(f"{term}:*" for term in terms), "kind": kind, "limit": limit})
+        return [{"kind": row.kind, "id": row.ref_id, "title": row.title, "rank": row.rank} for row in rows]
+
+
+class SQLiteSearch(SearchBackend):
+    """FTS5 virtual table ranked with ``bm25``; the local and test fallback.
+
+    FTS5 rows are keyed by an integer rowid, so SEARCH_DOCUMENTS maps each
+    ``(kind, ref_id)`` to one and updates replace the FTS row in place. The
+    kind is also an FTS column, so filtering and ranking happen inside FTS5
+    and only the top ``limit`` rows are joined back. The bm25 weights are
+    stored as the table's ``rank`` so ``ORDER BY rank`` takes FTS5's sort
+    path. Prefix indexes on 2 and 3 characters keep short prefix queries from
+    scanning the whole term list.
+    """
+
+    dialect = "sqlite"
+
+    def create_schema(self, conn):
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS "SEARCH_DOCUMENTS" ('
+            " id INTEGER PRIMARY KEY,"
+            " kind VARCHAR(16) NOT NULL,"
+            " ref_id CHAR(32) NOT NULL,"
+            " UNIQUE (kind, ref_id))"
+        ))
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'SEARCH_FTS'")).first()
+        if not exists:
+            conn.execute(text(
+                'CREATE VIRTUAL TABLE "SEARCH_FTS" USING fts5('
+                "kind, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            ))
+            # Weights per column: kind, title, body
+            conn.execute(text("""INSERT INTO "SEARCH_FTS" ("SEARCH_FTS", rank) VALUES ('rank', 'bm25(0.0, 4.0, 1.0)')"""))
+
+    def _rowids(self, db, kind, ref_ids):
+        stmt = text('SELECT ref_id, id FROM "SEARCH_DOCUMENTS" WHERE kind = :kind AND ref_id IN :ref_ids')
+        stmt = stmt.bindparams(bindparam("ref_ids", expanding=True))
+        return dict(db.execute(stmt, {"kind": kind, "ref_ids": ref_ids}).all())
+
+    def upsert(self, db, documents):
+        if not documents:
+            return
+        rows = [{"kind": kind, "ref_id": ref_id.hex, "title": title, "body": body} for kind, ref_id, title, body in documents]
+        db.execute(text('INSERT OR IGNORE INTO "SEARCH_DOCUMENTS" (kind, ref_id) VALUES (:kind, :ref_id)'), rows)
+        for kind in {row["kind"] for row in rows}:
+            rowids = self._rowids(db, kind, [row["ref_id"] for row in rows if row["kind"] == kind])
+            for row in rows:
+                if row["kind"] == kind:
+                    row["rowid"] = rowids[row["ref_id"]]
+        db.execute(text('INSERT OR REPLACE INTO "SEARCH_FTS" (rowid, kind, title, body) VALUES (:rowid, :kind, :title, :body)'), rows)
+
+    def remove(self, db, kind, ref_ids):
+        if not ref_ids:
+            return
+        rowids = list(self._rowids(db, kind, [ref_id.hex for ref_id in ref_ids]).values())
+        if not rowids:
+            return
+        for table in ("SEARCH_FTS", "SEARCH_DOCUMENTS"):
+            column = "rowid" if table == "SEARCH_FTS" else "id"
+            stmt = text(f'DELETE FROM "{table}" WHERE {column} IN :rowids').bindparams(bindparam("rowids", expanding=True))
+            db.execute(stmt, {"rowids": rowids})
+
+    def clear(self, db):
+        db.execute(text('DELETE FROM "SEARCH_FTS"'))
+        db.execute(text('DELETE FROM "SEARCH_DOCUMENTS"'))
+
+    def search(self, db, terms, kind, limit):
+        if not terms:
+            return []
+        query = " ".join(f'"{term}"*' for term in terms)
+        if kind:
+            query = f'kind : "{kind}" AND {{title body}} : ({query})'
+        else:
+            query = f"{{title body}} : ({query})"
+        sql = (
+            "SELECT d.kind, d.ref_id, hits.title, -hits.rank AS rank FROM ("
+            ' SELECT rowid, title, rank FROM "SEARCH_FTS" WHERE "SEARCH_FTS" MATCH :query ORDER BY rank LIMIT :limit'
+            ') AS hits JOIN "SEARCH_DOCUMENTS" AS d ON d.id = hits.rowid ORDER BY hits.rank'
+        )
+        rows = db.execute(text(sql), {"query": query, "limit": limit})
+        return [{"kind": row.kind, "id": UUID(row.ref_id), "title": row.title, "rank": row.rank} for row in rows]
+
+
+SEARCH_BACKENDS = {backend.dialect: backend for backend in (PostgresSearch, SQLiteSearch)}
+
+def get_search_backend(dialect: str) -> SearchBackend:
+    """Instantiates the search backend for a SQLAlchemy dialect name."""
+    try:
+        return SEARCH_BACKENDS[dialect]()
+    except KeyError:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
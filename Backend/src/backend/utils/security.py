@@ -1,24 +1,270 @@
+import json
 import os
-import bcrypt
+import uuid
+import threading
+import time
+from typing import Any
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
-from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from .cache import MemoryCache
+from ..settings import settings
 
 ###############################################
 # Environment Variables
 ###############################################
-load_dotenv()
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+TOKEN_CACHE_SIZE = settings.token_cache_size
+TOKEN_BACKEND = settings.token_backend
+JWT_JWKS_PATH = settings.jwt_jwks_path
+JWT_SIGNING_JWK_PATH = settings.jwt_signing_jwk_path
+JWT_KEYS_REFRESH_SECONDS = settings.jwt_keys_refresh_seconds
+# Hashing policy for new and rehashed passwords: "bcrypt" or "argon2id" (needs argon2-cffi)
+PASSWORD_HASH_SCHEME = settings.password_hash_scheme
+BCRYPT_ROUNDS = settings.bcrypt_rounds
+ARGON2_TIME_COST = settings.argon2_time_cost
+ARGON2_MEMORY_COST = settings.argon2_memory_cost  # KiB
+ARGON2_PARALLELISM = settings.argon2_parallelism
 
 # Define OAuth2 scheme for token extraction and validation
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Same, for routes anonymous callers may use too: a missing token yields None instead of a 401
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-# Configuration for password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+###############################################
+# JWT Backends
+###############################################
+
+class TokenBackend:
+    """Encodes and decodes JWTs with one JWT library.
+
+    Keys are either a shared secret (HS*) or a JWK dict (RS*, ES*, EdDSA).
+    Every failure surfaces as ``ValueError("Invalid token")``.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._converted: dict[int, tuple[dict, Any]] = {}
+
+    def _key(self, key: Any, algorithm: str) -> Any:
+        """Returns the library's key object for a JWK dict, converting it only once."""
+        if not isinstance(key, dict):
+            return key
+        # JWK dicts are replaced, never mutated, on reload, so identity is a safe memo key
+        cached = self._converted.get(id(key))
+        if cached is None or cached[0] is not key:
+            cached = (key, self._convert(key, algorithm))
+            self._converted[id(key)] = cached
+        return cached[1]
+
+    def _convert(self, jwk: dict, algorithm: str) -> Any:
+        raise NotImplementedError
+
+    def encode(self, claims: dict, key: Any, algorithm: str, kid: str | None = None) -> str:
+        raise NotImplementedError
+
+    def decode(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        raise NotImplementedError
+
+    def unverified_kid(self, token: str) -> str | None:
+        """Returns the ``kid`` header without checking the signature."""
+        raise NotImplementedError
+
+
+class PyJWTBackend(TokenBackend):
+    """PyJWT with ``cryptography``; faster than python-jose and supports EdDSA."""
+
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+
+        super().__init__()
+        self._jwt = jwt
+
+    def _convert(self, jwk, algorithm):
+        return self._jwt.PyJWK(jwk, algorithm).key
+
+    def encode(self, claims, key, algorithm, kid=None):
+        headers = {"kid": kid} if kid else None
+        return self._jwt.encode(claims, self._key(key, algorithm), algorithm=algorithm, headers=headers)
+
+    def decode(self, token, key, algorithms):
+        try:
+            return self._jwt.decode(token, self._key(key, algorithms[0]), algorithms=algorithms)
+        except self._jwt.PyJWTError:
+            raise ValueError("Invalid token")
+
+    def unverified_kid(self, token):
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._jwt.PyJWTError:
+            raise ValueError("Invalid token")
+
+
+class JoseBackend(TokenBackend):
+    """python-jose, the original implementation. Has no EdDSA support."""
+
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwk, jwt
+
+        super().__init__()
+        self._jwt = jwt
+        self._jwk = jwk
+        self._error = JWTError
+
+    def _convert(self, jwk, algorithm):
+        return self._jwk.construct(jwk, algorithm)
+
+    def encode(self, claims, key, algorithm, kid=None):
+        headers = {"kid": kid} if kid else None
+        return self._jwt.encode(claims, self._key(key, algorithm), algorithm=algorithm, headers=headers)
+
+    def decode(self, token, key, algorithms):
+        try:
+            return self._jwt.decode(token, self._key(key, algorithms[0]), algorithms=algorithms)
+        except self._error:
+            raise ValueError("Invalid token")
+
+    def unverified_kid(self, token):
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._error:
+            raise ValueError("Invalid token")
+
+
+TOKEN_BACKENDS = {backend.name: backend for backend in (PyJWTBackend, JoseBackend)}
+
+def get_token_backend(name: str) -> TokenBackend:
+    """Instantiates the token backend registered under ``name``."""
+    try:
+        return TOKEN_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown token backend: {name}")
+
+
+###############################################
+# Token Keys
+###############################################
+
+# JWK members that only exist on private RSA / EC / OKP keys
+PRIVATE_JWK_MEMBERS = ("d", "p", "q", "dp", "dq", "qi", "oth")
+
+class KeySet:
+    """Signing and verification keys, indexed by ``kid``.
+
+    Symmetric setups use SECRET_KEY for both. Asymmetric setups sign with the
+    private JWK at ``signing_jwk_path`` and verify against the public JWKS at
+    ``jwks_path``, so verifier nodes never need the signing key. Both files
+    are re-read when their mtime changes (checked at most every
+    ``refresh_seconds``, and immediately for an unknown ``kid``), so keys can
+    be rotated without a restart: publish the new public key in the JWKS,
+    swap the signing JWK, and drop the old public key once its tokens expire.
+    """
+
+    def __init__(
+        self,
+        secret: str | None = None,
+        jwks_path: str | None = None,
+        signing_jwk_path: str | None = None,
+        refresh_seconds: float = 30.0,
+    ):
+        self.secret = secret
+        self.jwks_path = jwks_path
+        self.signing_jwk_path = signing_jwk_path
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._signing: tuple[str | None, Any] | None = None
+        self._verification: dict[str | None, Any] = {}
+        self._mtimes: dict[str, int] = {}
+        self._checked_at = 0.0
+        self.reload()
+
+    @property
+    def paths(self) -> list[str]:
+        return [path for path in (self.jwks_path, self.signing_jwk_path) if path]
+
+    def reload(self) -> None:
+        """Reads the key files again and swaps the keys in atomically."""
+        mtimes = {path: os.stat(path).st_mtime_ns for path in self.paths}
+        signing = None
+        verification: dict[str | None, Any] = {}
+        if not self.paths and self.secret:
+            signing = (None, self.secret)
+            verification[None] = self.secret
+        if self.signing_jwk_path:
+            with open(self.signing_jwk_path) as file:
+                jwk = json.load(file)
+            signing = (jwk.get("kid"), jwk)
+            if jwk.get("kty") == "oct":
+                verification[jwk.get("kid")] = jwk
+            else:
+                verification[jwk.get("kid")] = {name: value for name, value in jwk.items() if name not in PRIVATE_JWK_MEMBERS}
+        if self.jwks_path:
+            with open(self.jwks_path) as file:
+                for jwk in json.load(file)["keys"]:
+                    verification[jwk.get("kid")] = jwk
+        with self._lock:
+            self._signing = signing
+            self._verification = verification
+            self._mtimes = mtimes
+            self._checked_at = time.monotonic()
+
+    def _refresh(self, force: bool = False) -> None:
+        if not self.paths:
+            return
+        if not force and time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = time.monotonic()
+        if {path: os.stat(path).st_mtime_ns for path in self.paths} != self._mtimes:
+            self.reload()
+
+    def signing_key(self) -> tuple[str | None, Any]:
+        """Returns ``(kid, key)`` for new tokens."""
+        self._refresh()
+        if self._signing is None:
+            raise RuntimeError("No token signing key configured")
+        return self._signing
+
+    def verification_key(self, kid: str | None) -> Any | None:
+        """Returns the key for ``kid``, or None if it is not (or no longer) trusted."""
+        self._refresh()
+        key = self._verification.get(kid)
+        if key is None and kid is not None:
+            self._refresh(force=True)
+            key = self._verification.get(kid)
+        return key
+
+
+_token_setup: tuple[TokenBackend, KeySet] | None = None
+_token_setup_lock = threading.Lock()
+
+def token_setup() -> tuple[TokenBackend, KeySet]:
+    """The configured token backend and keys, built on first use.
+
+    Deferred so importing the app neither loads the JWT libraries nor reads
+    key files; a missing SECRET_KEY only fails when a token is signed.
+    """
+    global _token_setup
+    if _token_setup is None:
+        with _token_setup_lock:
+            if _token_setup is None:
+                _token_setup = (
+                    get_token_backend(TOKEN_BACKEND),
+                    KeySet(
+                        secret=SECRET_KEY,
+                        jwks_path=JWT_JWKS_PATH,
+                        signing_jwk_path=JWT_SIGNING_JWK_PATH,
+                        refresh_seconds=JWT_KEYS_REFRESH_SECONDS,
+                    ),
+                )
+    return _token_setup
 
 
 ###############################################
@@ -32,16 +278,75 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Fractional iat, so a revocation only cancels tokens issued strictly before it
+    to_encode.update({"exp": expire, "iat": time.time()})
+    token_backend, token_keys = token_setup()
+    kid, key = token_keys.signing_key()
+    return token_backend.encode(to_encode, key, ALGORITHM, kid)
+
+def _decode_token(token: str) -> dict:
+    token_backend, token_keys = token_setup()
+    key = token_keys.verification_key(token_backend.unverified_kid(token))
+    if key is None:
+        raise ValueError("Invalid token")
+    return token_backend.decode(token, key, [ALGORITHM])
 
 def verify_access_token(token: str) -> dict:
     """Verifies an access token and returns the decoded data."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+    payload = _decode_token(token)
+    if payload.get("type", "access") != "access":
         raise ValueError("Invalid token")
+    return payload
+
+def create_refresh_token(data: dict) -> tuple[str, dict]:
+    """Creates a long-lived refresh token.
+
+    ``data`` must carry ``sub`` and the login session ID ``sid``; a fresh
+    ``jti`` identifies this token for rotation and revocation.
+
+    Returns:
+        tuple[str, dict]: The token and its claims
+    """
+    claims = data.copy()
+    claims.update(
+        jti=str(uuid.uuid4()),
+        type="refresh",
+        exp=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        iat=time.time(),
+    )
+    token_backend, token_keys = token_setup()
+    kid, key = token_keys.signing_key()
+    return token_backend.encode(claims, key, ALGORITHM, kid), claims
+
+def verify_refresh_token(token: str) -> dict:
+    """Verifies a refresh token's signature, expiry and type (not its revocation)."""
+    payload = _decode_token(token)
+    if payload.get("type") != "refresh" or "jti" not in payload or "sid" not in payload:
+        raise ValueError("Invalid token")
+    return payload
+
+
+###############################################
+# Verified Token Cache
+###############################################
+
+# Claims of recently verified tokens, each kept no longer than its own exp
+token_cache = MemoryCache(ttl=0, max_entries=TOKEN_CACHE_SIZE)
+
+def verify_access_token_cached(token: str) -> dict:
+    """Like verify_access_token, but skips the signature check for tokens seen recently.
+
+    Entries expire at the token's ``exp``, so an expired token is never
+    served from the cache.
+    """
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    claims = verify_access_token(token)
+    ttl = int(claims.get("exp", 0) - time.time())
+    if ttl > 0:
+        token_cache.set(token, claims, ttl=ttl)
+    return claims
 
 
 
@@ -49,15 +354,142 @@ def verify_access_token(token: str) -> dict:
 # Password Hashing and Verification
 ###############################################
 
+class PasswordPolicy:
+    """How new password hashes are made, and which stored hashes are outdated.
+
+    ``verify`` accepts any bcrypt or argon2 hash whatever its parameters;
+    ``needs_rehash`` tells whether a stored hash differs from the policy, so
+    it can be replaced while the plaintext is at hand after a login.
+    """
+
+    SCHEMES = ("bcrypt", "argon2id")
+
+    def __init__(self, scheme: str = "bcrypt", bcrypt_rounds: int = 12,
+                 argon2_time_cost: int = 3, argon2_memory_cost: int = 65536, argon2_parallelism: int = 4):
+        if scheme not in self.SCHEMES:
+            raise ValueError(f"Unknown password hash scheme: {scheme}")
+        self.scheme = scheme
+        self.bcrypt_rounds = bcrypt_rounds
+        self.argon2_time_cost = argon2_time_cost
+        self.argon2_memory_cost = argon2_memory_cost
+        self.argon2_parallelism = argon2_parallelism
+        self._argon2 = None
+
+    @classmethod
+    def from_env(cls) -> "PasswordPolicy":
+        return cls(PASSWORD_HASH_SCHEME, BCRYPT_ROUNDS, ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM)
+
+    def describe(self) -> str:
+        if self.scheme == "argon2id":
+            return f"argon2id t={self.argon2_time_cost} m={self.argon2_memory_cost}KiB p={self.argon2_parallelism}"
+        return f"bcrypt rounds={self.bcrypt_rounds}"
+
+    def _argon2_hasher(self):
+        if self._argon2 is None:
+            # Optional dependency, only needed once an argon2 hash exists or is wanted
+            from argon2 import PasswordHasher, Type
+
+            self._argon2 = PasswordHasher(
+                time_cost=self.argon2_time_cost,
+                memory_cost=self.argon2_memory_cost,
+                parallelism=self.argon2_parallelism,
+                type=Type.ID,
+            )
+        return self._argon2
+
+    def hash(self, password: str) -> str:
+        if self.scheme == "argon2id":
+            return self._argon2_hasher().hash(password)
+        import bcrypt
+
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.bcrypt_rounds)).decode('utf-8')
+
+    def verify(self, password: str, hashed: str) -> bool:
+        if hashed.startswith("$argon2"):
+            from argon2.exceptions import InvalidHashError, VerificationError
+
+            try:
+                return self._argon2_hasher().verify(hashed, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        import bcrypt
+
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        if self.scheme == "argon2id":
+            return not hashed.startswith("$argon2id$") or self._argon2_hasher().check_needs_rehash(hashed)
+        # bcrypt hashes read $2b$<rounds>$<salt+digest>
+        parts = hashed.split("$")
+        return not hashed.startswith("$2") or len(parts) < 4 or int(parts[2]) != self.bcrypt_rounds
+
+
+password_policy = PasswordPolicy.from_env()
+
 def hash_password(password: str) -> str:
-    """Hashes a plaintext password.
+    """Hashes a plaintext password with the current policy.
     
     NOTE: Bcrypt has a maximum password length of 72 bytes.
     """
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed_password.decode('utf-8')
+    return password_policy.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a hashed password against a plaintext password."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    return password_policy.verify(plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made with other parameters than the current policy."""
+    return password_policy.needs_rehash(hashed_password)
+
+_dummy_hash: tuple[PasswordPolicy, str] | None = None
+
+def dummy_password_hash() -> str:
+    """Hash of a random password, for verifying attempts against unknown users.
+
+    Checking it costs the same as checking a real hash, so a login for a
+    missing user takes as long as a wrong password and does not reveal
+    which usernames exist. It is rebuilt whenever the policy changes.
+    """
+    global _dummy_hash
+    if _dummy_hash is None or _dummy_hash[0] is not password_policy:
+        _dummy_hash = (password_policy, hash_password(uuid.uuid4().hex))
+    return _dummy_hash[1]
+
+def calibrate_password_policy(scheme: str, target_ms: float, measure=None, **params) -> tuple[PasswordPolicy, float]:
+    """Finds the highest cost whose verify takes at most ``target_ms`` on this machine.
+
+    bcrypt raises its rounds (each one doubles the cost) from 4; argon2id
+    raises its time cost at the memory cost and parallelism in ``params``.
+    When even the lowest cost is over the target, the lowest is returned.
+
+    Args:
+        scheme (str): "bcrypt" or "argon2id"
+        target_ms (float): Verify time to stay under, in milliseconds
+        measure: Callable returning the verify time of a policy in milliseconds;
+            defaults to the median of three real verifies
+        params: Extra PasswordPolicy arguments, e.g. argon2_memory_cost
+
+    Returns:
+        tuple[PasswordPolicy, float]: The chosen policy and its measured verify time
+    """
+    def timed_verify(policy: PasswordPolicy) -> float:
+        hashed = policy.hash("calibration")
+        samples = []
+        for _ in range(3):
+            start = time.perf_counter()
+            policy.verify("calibration", hashed)
+            samples.append((time.perf_counter() - start) * 1000)
+        return sorted(samples)[1]
+
+    measure = measure or timed_verify
+    cost_name, costs = ("bcrypt_rounds", range(4, 32)) if scheme == "bcrypt" else ("argon2_time_cost", range(1, 64))
+    chosen = None
+    for cost in costs:
+        policy = PasswordPolicy(scheme, **{**params, cost_name: cost})
+        elapsed = measure(policy)
+        if chosen is not None and elapsed > target_ms:
+            break
+        chosen = (policy, elapsed)
+        if elapsed > target_ms:
+            break
+    return chosen
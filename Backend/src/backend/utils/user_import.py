@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from typing import BinaryIO
+
+###############################################
+# Bulk Import File Parsing
+###############################################
+
+# Columns expected in every JSONL object / CSV header
+IMPORT_FIELDS = ("username", "first_name", "last_name", "email", "password")
+
+def detect_format(filename: str | None, content_type: str | None) -> str:
+    """Returns ``"csv"`` or ``"jsonl"`` from the upload's name or content type."""
+    if (filename or "").lower().endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    return "jsonl"
+
+def iter_import_rows(fileobj: BinaryIO, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yields ``(line, row, error)`` for every record in a JSONL or CSV upload.
+
+    The file is read incrementally, so uploads larger than memory are fine.
+    Blank lines are skipped; a record that cannot be parsed is yielded with
+    ``row=None`` and an error message instead of stopping the import.
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
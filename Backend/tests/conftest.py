@@ -0,0 +1,80 @@
+import os
+from dataclasses import dataclass, field
+from uuid import uuid4
+import pytest
+
+# The /internal endpoints stay closed without a token, which is read at import
+os.environ.setdefault("INTERNAL_API_TOKEN", "test-internal-token")
+
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.settings import settings
+
+TEST_PASSWORD = "testpassword"
+
+client = TestClient(app)
+
+
+@dataclass
+class RegisteredUser:
+    """A user created through /auth/register, with the tokens /auth/login gave it."""
+
+    user: dict
+    tokens: dict = field(default_factory=dict)
+
+    @property
+    def id(self) -> str:
+        return self.user["id"]
+
+    @property
+    def username(self) -> str:
+        return self.user["username"]
+
+    @property
+    def access_token(self) -> str:
+        return self.tokens["access_token"]
+
+    @property
+    def refresh_token(self) -> str:
+        return self.tokens["refresh_token"]
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+###############################################
+# Fixtures
+###############################################
+
+@pytest.fixture
+def register_user():
+    """Registers a fresh user named ``<prefix>_<random>`` per call, then logs them in.
+
+    Pass ``login=False`` to skip the login, e.g. where login attempts are counted.
+    """
+    def register(prefix: str = "user", first_name: str = "Test", last_name: str = "User", login: bool = True) -> RegisteredUser:
+        username = f"{prefix}_{uuid4().hex[:8]}"
+        response = client.post(
+            "/auth/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "first_name": first_name,
+                "last_name": last_name,
+                "password": TEST_PASSWORD,
+            },
+        )
+        assert response.status_code == 201, response.text
+        registered = RegisteredUser(response.json())
+        if login:
+            response = client.post("/auth/login", data={"username": username, "password": TEST_PASSWORD})
+            assert response.status_code == 200, response.text
+            registered.tokens = response.json()
+        return registered
+    return register
+
+@pytest.fixture
+def internal_headers() -> dict:
+    """Headers that pass the X-Internal-Token check of the /internal endpoints."""
+    return {"X-Internal-Token": settings.internal_api_token}
@@ -36,6 +36,8 @@ def test_register_user():
     assert "id" in response.json()
     assert "created_at" in response.json()
     assert "updated_at" in response.json()
+    assert "password" not in response.json()
+    assert "deleted_at" not in response.json()
     
 
 def test_register_existingUser():
@@ -0,0 +1,46 @@
+import asyncio
+from benchmarks.harness import compare, drive, load_baseline, save_baseline, summarize
+
+def _result(p95: float, rps: float, errors: int = 0) -> dict:
+    return {"requests": 100, "errors": errors, "seconds": 1.0, "rps": rps, "p50": p95 / 2, "p95": p95, "p99": p95 * 2, "mean": p95 / 2}
+
+###############################################
+# Test Load Driver
+###############################################
+
+def test_drive_counts_every_request():
+    seen = []
+
+    async def send(index):
+        seen.append(index)
+        await asyncio.sleep(0)
+        return index % 10 != 0
+
+    result = asyncio.run(drive(send, 50, 8))
+    assert sorted(seen) == list(range(50))
+    assert result["requests"] == 50
+    assert result["errors"] == 5
+    assert result["p50"] <= result["p95"] <= result["p99"]
+
+def test_summarize_percentiles():
+    result = summarize([i / 1000 for i in range(1, 101)], errors=0, elapsed=2.0)
+    assert result["rps"] == 50.0
+    assert result["p50"] == 51.0
+    assert result["p99"] == 100.0
+
+###############################################
+# Test Baselines
+###############################################
+
+def test_compare_flags_regressions(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, {"get_user": _result(10, 500), "login": _result(100, 10)}, {"users": 10})
+    baseline = load_baseline(path)
+
+    assert compare({"get_user": _result(11.9, 450), "login": _result(100, 10)}, baseline, 0.2) == []
+    regressions = compare({"get_user": _result(12.5, 400), "login": _result(100, 10, errors=3), "new": _result(1, 1)}, baseline, 0.2)
+    assert regressions == [
+        "get_user: p95 10.0ms -> 12.5ms",
+        "get_user: throughput 500.0 -> 400.0 req/s",
+        "login: errors 0 -> 3",
+    ]
@@ -1,11 +1,18 @@
+import json
+from uuid import uuid4
 from fastapi.testclient import TestClient
 from src.backend.main import app
+from src.backend.utils.security import create_access_token
 ###############################################
 # Test CRUD operations for User endpoints
 ###############################################
 client = TestClient(app)
 test_user_id = None
 
+def _auth_headers(user_id: str) -> dict:
+    token = create_access_token({"sub": user_id, "sid": uuid4().hex})
+    return {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
+
 ###############################################
 # Test Create User
 ###############################################
@@ -137,8 +144,41 @@ def test_get_all_users():
     )
 
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
-    assert any(user["id"] == test_user_id for user in response.json())
+    assert isinstance(response.json()["items"], list)
+    assert any(user["id"] == test_user_id for user in response.json()["items"])
+
+def test_get_all_users_paginated():
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/users/", params=params)
+        assert response.status_code == 200
+        assert len(response.json()["items"]) <= 1
+        seen.extend(user["id"] for user in response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    assert test_user_id in seen
+    assert len(seen) == len(set(seen))
+
+def test_get_all_users_invalid_cursor():
+    response = client.get("/users/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_export_users():
+    response = client.get("/users/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert any(row["id"] == test_user_id for row in rows)
+    assert all("password" not in row for row in rows)
 
 ###############################################
 # Test GETTER ERRORS
@@ -185,7 +225,7 @@ def test_update_user():
             "email": "testuserupdated@example.com",
             "password": "newpassword"
         },
-        headers={"Content-Type": "application/json"}
+        headers=_auth_headers(test_user_id)
     )
 
     assert response.status_code == 200
@@ -207,11 +247,12 @@ def test_update_user_not_found():
             "last_name": "User",
             "password": "nonexistentpassword"
         },
-        headers={"Content-Type": "application/json"}
+        headers=_auth_headers(test_user_id)
     )
 
-    assert response.status_code == 404
-    assert response.json()["detail"] == "User not found"
+    # Only the account itself may be updated, so any other ID is refused
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Not allowed to change another user"
 
 ###############################################
 # Test Delete User
@@ -220,7 +261,7 @@ def test_update_user_not_found():
 def test_delete_user():
     response = client.delete(
         f"/users/{test_user_id}",
-        headers={"Content-Type": "application/json"}
+        headers=_auth_headers(test_user_id)
     )
 
     assert response.status_code == 204
@@ -0,0 +1,53 @@
+import asyncio
+from uuid import uuid4
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.backend import database
+from src.backend.cruds.crud_user import UserCRUD
+from src.backend.schemas.user_schema import UserCreate
+
+###############################################
+# Test Session Helpers
+###############################################
+
+def test_to_async_url():
+    assert database.to_async_url("sqlite:///./blog.db") == "sqlite+aiosqlite:///./blog.db"
+    assert database.to_async_url("postgresql://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+    assert database.to_async_url("postgresql+psycopg2://u:p@db/blog") == "postgresql+asyncpg://u:p@db/blog"
+
+def test_run_db_with_sync_session():
+    suffix = uuid4().hex[:8]
+    with Session(database.engine) as session:
+        created = asyncio.run(database.run_db(session, UserCRUD.create_user, UserCreate(
+            username=f"sync_{suffix}",
+            first_name="Sync",
+            last_name="User",
+            email=f"sync_{suffix}@example.com",
+            password="testpassword",
+        )))
+        fetched = asyncio.run(database.run_db(session, UserCRUD.get_user_by_id, created.id))
+    assert fetched.username == f"sync_{suffix}"
+
+def test_run_db_with_async_session():
+    """
+    UserCRUD methods run unchanged on an AsyncSession through run_sync
+    """
+    suffix = uuid4().hex[:8]
+    async_engine = create_async_engine(database.to_async_url(database.database_url))
+
+    async def scenario():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            created = await database.run_db(session, UserCRUD.create_user, UserCreate(
+                username=f"async_{suffix}",
+                first_name="Async",
+                last_name="User",
+                email=f"async_{suffix}@example.com",
+                password="testpassword",
+            ))
+            fetched = await database.run_db(session, UserCRUD.get_user_id_by_username, f"async_{suffix}")
+        await async_engine.dispose()
+        return created, fetched
+
+    created, fetched_id = asyncio.run(scenario())
+    assert fetched_id == created.id
@@ -0,0 +1,42 @@
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.utils.security import create_access_token, token_cache
+
+client = TestClient(app)
+
+###############################################
+# Test Current User Dependency
+###############################################
+
+def test_get_me(register_user):
+    user = register_user("me", "Current")
+    hits = token_cache.hits
+
+    for _ in range(2):
+        response = client.get("/users/me", headers=user.headers)
+        assert response.status_code == 200
+        assert response.json()["id"] == user.id
+        assert "password" not in response.json()
+    assert token_cache.hits == hits + 1
+
+def test_get_me_without_token():
+    response = client.get("/users/me")
+
+    assert response.status_code == 401
+
+def test_get_me_invalid_token():
+    response = client.get("/users/me", headers={"Authorization": "Bearer not-a-token"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Could not validate credentials"
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+def test_expired_token_is_rejected_and_not_cached(register_user):
+    user = register_user("me", "Current")
+    token = create_access_token({"sub": user.id}, expires_delta=timedelta(seconds=-1))
+
+    response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    assert token_cache.get(token) is None
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from src.backend.utils.hashing_pool import PasswordHashingPool
+from src.backend.utils.security import hash_password
+
+###############################################
+# Password Hashing Pool Tests
+###############################################
+
+def test_pool_hashes_and_verifies():
+    pool = PasswordHashingPool(kind="thread", max_workers=2, max_queue=2)
+    hashed = asyncio.run(pool.run(hash_password, "secret"))
+    assert hashed.startswith("$2")
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+def test_pool_rejects_when_saturated():
+    """
+    Fill every worker and queue slot with a blocked job, then check that
+    one more submission is refused with a 503 instead of queueing.
+    """
+    pool = PasswordHashingPool(kind="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def flood():
+        jobs = [asyncio.create_task(pool.run(release.wait)) for _ in range(pool.capacity)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*jobs)
+        return exc.value
+
+    error = asyncio.run(flood())
+    assert error.status_code == 503
+    assert pool.rejected == 1
+    assert pool.in_flight == 0
+    pool.shutdown()
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from uuid import UUID, uuid4
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import User
+from src.backend.utils.cache import get_user_cache
+
+client = TestClient(app)
+
+###############################################
+# Test Users
+###############################################
+
+def test_user_etag_round_trip(register_user):
+    user = register_user("cache", "Cache").user
+    first = client.get(f"/users/{user['id']}")
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    assert etag.startswith('"') and not etag.startswith('W/')
+    assert first.headers["Cache-Control"] == "public, no-cache"
+    assert "Last-Modified" in first.headers
+
+    cached = client.get(f"/users/{user['id']}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert client.get(f"/users/{user['id']}", headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+
+def test_user_etag_changes_on_update(register_user):
+    registered = register_user("cache", "Cache")
+    user = registered.user
+    etag = client.get(f"/users/{user['id']}").headers["ETag"]
+    update = {field: user[field] for field in ("username", "last_name", "email")}
+    client.put(f"/users/update/{user['id']}", json={**update, "first_name": "Renamed", "password": "testpassword"}, headers=registered.headers)
+
+    response = client.get(f"/users/{user['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+
+def test_user_etags_differ_for_equal_timestamps(register_user):
+    users = [register_user("cache", "Cache").user for _ in range(2)]
+    with Session(database.engine) as session:
+        session.execute(update(User).where(User.id.in_([UUID(user["id"]) for user in users])).values(updated_at=datetime(2024, 1, 1)))
+        session.commit()
+    get_user_cache().delete(*(f"user:id:{user['id']}" for user in users))
+
+    first, second = (client.get(f"/users/{user['id']}").headers["ETag"] for user in users)
+    assert first != second
+    assert client.get(f"/users/email/{users[0]['email']}").headers["ETag"] == first
+    assert client.get(f"/users/{users[1]['id']}", headers={"If-None-Match": first}).status_code == 200
+
+def test_user_if_modified_since(register_user):
+    user = register_user("cache", "Cache").user
+    last_modified = client.get(f"/users/{user['id']}").headers["Last-Modified"]
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+
+    assert client.get(f"/users/{user['id']}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(f"/users/{user['id']}", headers={"If-Modified-Since": earlier}).status_code == 200
+    assert client.get(f"/users/{user['id']}", headers={"If-Modified-Since": "garbage"}).status_code == 200
+    # If-None-Match wins over If-Modified-Since
+    stale = {"If-None-Match": '"stale"', "If-Modified-Since": last_modified}
+    assert client.get(f"/users/{user['id']}", headers=stale).status_code == 200
+
+def test_conditional_get_skips_full_load(register_user):
+    user = register_user("cache", "Cache").user
+    etag = client.get(f"/users/{user['id']}").headers["ETag"]
+    get_user_cache().delete(f"user:id:{user['id']}")
+
+    assert client.get(f"/users/{user['id']}", headers={"If-None-Match": etag}).status_code == 304
+    # Only the version column was read, so the user was not cached again
+    assert get_user_cache().get(f"user:id:{user['id']}") is None
+    assert client.get(f"/users/{uuid4()}", headers={"If-None-Match": etag}).status_code == 404
+
+def test_me_is_private(register_user):
+    headers = register_user("cache", "Cache").headers
+    first = client.get("/users/me", headers=headers)
+
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert client.get("/users/me", headers={**headers, "If-None-Match": first.headers["ETag"]}).status_code == 304
+
+###############################################
+# Test Posts
+###############################################
+
+def test_post_etag_tracks_likes(register_user):
+    headers = register_user("cache", "Cache").headers
+    post = client.post("/posts/", json={"title": "Cached", "body": "Body", "status": "published"}, headers=headers).json()
+    first = client.get(f"/posts/{post['id']}")
+    etag = first.headers["ETag"]
+
+    assert "Last-Modified" not in first.headers
+    assert client.get(f"/posts/slug/{post['slug']}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post(f"/posts/{post['id']}/likes", headers=headers)
+    response = client.get(f"/posts/{post['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["like_count"] == 1
+
+def test_listing_cache_control():
+    assert client.get("/posts/").headers["Cache-Control"] == "public, max-age=5"
@@ -0,0 +1,74 @@
+import logging
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.utils import metrics as metrics_module
+from src.backend.utils.metrics import Metrics, RequestStats, metrics
+
+client = TestClient(app)
+
+def _create_user() -> dict:
+    suffix = uuid4().hex[:8]
+    return client.post(
+        "/users/createuser",
+        json={
+            "username": f"metrics_{suffix}",
+            "email": f"metrics_{suffix}@example.com",
+            "first_name": "Metrics",
+            "last_name": "User",
+            "password": "testpassword",
+        },
+    ).json()
+
+###############################################
+# Test Request Timing
+###############################################
+
+def test_server_timing_counts_queries():
+    user = _create_user()
+    response = client.get(f"/users/{uuid4()}")
+
+    assert response.status_code == 404
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "app;dur=" in client.get(f"/users/{user['id']}").headers["Server-Timing"]
+
+def test_metrics_endpoint_uses_route_templates():
+    user = _create_user()
+    before = metrics.request_duration.count("GET", "/users/{user_id}", "200")
+    client.get(f"/users/{user['id']}")
+    body = client.get("/metrics").text
+
+    assert metrics.request_duration.count("GET", "/users/{user_id}", "200") == before + 1
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/users/{user_id}",status="200"}' in body
+    assert 'le="+Inf"' in body
+    assert str(user["id"]) not in body
+    assert "db_queries_total " in body
+
+###############################################
+# Test Query Diagnostics
+###############################################
+
+def test_slow_query_log(monkeypatch, caplog):
+    monkeypatch.setattr(metrics_module, "SLOW_QUERY_MS", 0)
+    before = metrics.slow_queries.value()
+    with caplog.at_level(logging.WARNING, logger="src.backend.utils.metrics"):
+        client.get(f"/users/{uuid4()}")
+
+    assert metrics.slow_queries.value() > before
+    assert any("slow query" in record.message for record in caplog.records)
+
+def test_n_plus_one_flagged(caplog):
+    local = Metrics()
+    stats = RequestStats()
+    stats.queries = 12
+    stats.statements = {"SELECT * FROM POSTS WHERE id = ?": 11, "SELECT 1": 1}
+    with caplog.at_level(logging.WARNING, logger="src.backend.utils.metrics"):
+        local.record_request("GET", "/posts/", 200, 0.01, stats)
+        local.record_request("GET", "/posts/", 200, 0.01, RequestStats())
+
+    assert local.n_plus_one.value("GET", "/posts/") == 1
+    assert local.request_queries.count("GET", "/posts/") == 2
+    assert sum("possible N+1" in record.message for record in caplog.records) == 1
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import User
+from src.backend.utils import security
+from src.backend.utils.security import PasswordPolicy, calibrate_password_policy
+
+client = TestClient(app)
+
+def _stored_hash(username: str) -> str:
+    with Session(database.engine) as session:
+        return session.exec(select(User.password).where(User.username == username)).one()
+
+###############################################
+# Test Password Policy
+###############################################
+
+def test_bcrypt_needs_rehash_on_other_rounds():
+    old, new = PasswordPolicy(bcrypt_rounds=4), PasswordPolicy(bcrypt_rounds=5)
+    hashed = old.hash("secret")
+
+    assert hashed.startswith("$2b$04$")
+    assert new.verify("secret", hashed) and not new.verify("other", hashed)
+    assert not old.needs_rehash(hashed)
+    assert new.needs_rehash(hashed)
+    assert new.needs_rehash("not-a-hash")
+
+def test_argon2id_policy():
+    pytest.importorskip("argon2")
+    bcrypt_hash = PasswordPolicy(bcrypt_rounds=4).hash("secret")
+    policy = PasswordPolicy("argon2id", argon2_time_cost=1, argon2_memory_cost=1024, argon2_parallelism=1)
+    hashed = policy.hash("secret")
+
+    assert hashed.startswith("$argon2id$")
+    assert policy.verify("secret", hashed) and not policy.verify("other", hashed)
+    assert policy.verify("secret", bcrypt_hash)
+    assert policy.needs_rehash(bcrypt_hash) and not policy.needs_rehash(hashed)
+
+def test_calibrate_picks_highest_cost_under_target():
+    doubling = lambda policy: 2 ** policy.bcrypt_rounds / 16
+    policy, elapsed = calibrate_password_policy("bcrypt", 250, measure=doubling)
+    assert (policy.bcrypt_rounds, elapsed) == (11, 128)
+
+    policy, _ = calibrate_password_policy("bcrypt", 0.1, measure=doubling)
+    assert policy.bcrypt_rounds == 4
+
+###############################################
+# Test Rehash on Login
+###############################################
+
+def test_login_rehashes_outdated_hash(monkeypatch, register_user):
+    monkeypatch.setattr(security, "password_policy", PasswordPolicy(bcrypt_rounds=4))
+    username = register_user("rehash", "Re", "Hash", login=False).username
+    assert _stored_hash(username).startswith("$2b$04$")
+
+    monkeypatch.setattr(security, "password_policy", PasswordPolicy(bcrypt_rounds=5))
+    assert client.post("/auth/login", data={"username": username, "password": "wrong"}).status_code == 401
+    assert _stored_hash(username).startswith("$2b$04$")
+
+    assert client.post("/auth/login", data={"username": username, "password": "testpassword"}).status_code == 200
+    assert _stored_hash(username).startswith("$2b$05$")
+    assert client.post("/auth/login", data={"username": username, "password": "testpassword"}).status_code == 200
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.main import app
+from src.backend.utils.pool_metrics import PoolStats
+
+client = TestClient(app)
+
+###############################################
+# Test Pool Stats Endpoint
+###############################################
+
+def test_db_pool_stats(internal_headers):
+    client.get("/users/00000000-0000-0000-0000-000000000000")
+    response = client.get("/internal/db-pool", headers=internal_headers)
+
+    assert response.status_code == 200
+    stats = response.json()["async" if database.DB_ASYNC else "sync"]
+    assert stats["checkouts"] >= 1
+    assert stats["checked_out"] == 0
+    assert {"size", "overflow", "wait_count", "wait_max_ms", "timeouts"} <= stats.keys()
+
+def test_internal_endpoints_require_token():
+    assert client.get("/internal/db-pool").status_code == 403
+    assert client.get("/internal/db-pool", headers={"X-Internal-Token": "wrong"}).status_code == 403
+    assert client.post("/internal/search/rebuild").status_code == 403
+
+###############################################
+# Test Pool Stats Counters
+###############################################
+
+def test_pool_stats_counts_waits_and_timeouts(tmp_path):
+    """
+    With a single connection and no overflow, a second checkout has to wait
+    and then times out; both show up in the counters.
+    """
+    stats = PoolStats()
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=stats.pool_class(),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    stats.attach(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        snapshot = stats.snapshot(engine.pool)
+
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checked_out"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_max_ms"] >= 50
+    engine.dispose()
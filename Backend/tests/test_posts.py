@@ -0,0 +1,165 @@
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.backend.main import app
+
+client = TestClient(app)
+
+def _publish(headers: dict, title: str = "Hello World") -> dict:
+    response = client.post("/posts/", json={"title": title, "body": "Body", "status": "published"}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+###############################################
+# Test Create and Read
+###############################################
+
+def test_create_post_requires_auth():
+    response = client.post("/posts/", json={"title": "Anonymous", "body": "Body"})
+    assert response.status_code == 401
+
+def test_create_post_generates_slug(register_user):
+    post = _publish(register_user("author").headers, "Hello, World!")
+
+    assert post["slug"].startswith("hello-world-")
+    assert post["published_at"] is not None
+    assert client.get(f"/posts/slug/{post['slug']}").json()["id"] == post["id"]
+
+def test_draft_is_not_published(register_user):
+    headers = register_user("author").headers
+    draft = client.post("/posts/", json={"title": "Draft", "body": "Body"}, headers=headers).json()
+
+    assert draft["status"] == "draft"
+    assert draft["published_at"] is None
+    feed_ids = [post["id"] for post in client.get("/posts/?limit=100").json()["items"]]
+    assert draft["id"] not in feed_ids
+
+def test_draft_is_visible_only_to_its_author(register_user):
+    headers = register_user("author").headers
+    draft = client.post("/posts/", json={"title": "Draft", "body": "Body"}, headers=headers).json()
+    etag = client.get(f"/posts/{draft['id']}", headers=headers).headers["ETag"]
+
+    for path in (f"/posts/{draft['id']}", f"/posts/slug/{draft['slug']}"):
+        assert client.get(path).status_code == 404
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 404
+        assert client.get(path, headers=register_user("author").headers).status_code == 404
+        own = client.get(path, headers=headers)
+        assert own.status_code == 200
+        assert own.headers["Cache-Control"] == "private, no-cache"
+    assert client.get(f"/posts/{draft['id']}", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+
+def test_draft_takes_no_likes_or_comments_from_others(register_user):
+    headers = register_user("author").headers
+    reader = register_user("author").headers
+    draft = client.post("/posts/", json={"title": "Draft", "body": "Body"}, headers=headers).json()
+
+    assert client.post(f"/posts/{draft['id']}/likes", headers=reader).status_code == 404
+    assert client.post(f"/posts/{draft['id']}/comments", json={"body": "Hi"}, headers=reader).status_code == 404
+    assert client.get(f"/posts/{draft['id']}/comments").status_code == 404
+    assert client.get(f"/posts/{draft['id']}/comments", headers=reader).status_code == 404
+    own = client.get(f"/posts/{draft['id']}", headers=headers).json()
+    assert (own["like_count"], own["comment_count"]) == (0, 0)
+
+    # The author still can
+    assert client.post(f"/posts/{draft['id']}/likes", headers=headers).status_code == 204
+    assert client.post(f"/posts/{draft['id']}/comments", json={"body": "Note"}, headers=headers).status_code == 201
+    comments = client.get(f"/posts/{draft['id']}/comments", headers=headers)
+    assert comments.status_code == 200
+    assert comments.headers["Cache-Control"] == "private, max-age=5"
+    assert [comment["body"] for comment in comments.json()["items"]] == ["Note"]
+
+def test_duplicate_slug(register_user):
+    headers = register_user("author").headers
+    slug = f"fixed-{uuid4().hex[:8]}"
+    client.post("/posts/", json={"title": "One", "body": "Body", "slug": slug}, headers=headers)
+    response = client.post("/posts/", json={"title": "Two", "body": "Body", "slug": slug}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Slug already in use"
+
+def test_get_post_not_found():
+    response = client.get(f"/posts/{uuid4()}")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Post not found"
+
+###############################################
+# Test Feed Pagination
+###############################################
+
+def test_author_feed_pages_newest_first(register_user):
+    headers = register_user("author").headers
+    created = [_publish(headers, f"Post {i}") for i in range(5)]
+    author_id = created[0]["author_id"]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/posts/author/{author_id}", params=params).json()
+        seen.extend(post["id"] for post in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [post["id"] for post in reversed(created)]
+
+def test_feed_invalid_cursor():
+    response = client.get("/posts/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+###############################################
+# Test Ownership
+###############################################
+
+def test_only_author_can_update_or_delete(register_user):
+    post = _publish(register_user("author").headers)
+    other = register_user("author").headers
+
+    assert client.put(f"/posts/update/{post['id']}", json={"title": "Hijacked"}, headers=other).status_code == 403
+    assert client.delete(f"/posts/{post['id']}", headers=other).status_code == 403
+
+def test_update_and_delete_post(register_user):
+    headers = register_user("author").headers
+    post = _publish(headers)
+
+    response = client.put(f"/posts/update/{post['id']}", json={"title": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["body"] == "Body"
+    # An explicit null leaves the field alone, like an absent one
+    response = client.put(f"/posts/update/{post['id']}", json={"title": None, "status": None}, headers=headers)
+    assert response.status_code == 200
+    assert (response.json()["title"], response.json()["status"]) == ("Renamed", "published")
+
+    assert client.delete(f"/posts/{post['id']}", headers=headers).status_code == 204
+    assert client.get(f"/posts/{post['id']}").status_code == 404
+
+###############################################
+# Test Denormalized Counters
+###############################################
+
+def test_like_counter(register_user):
+    post = _publish(register_user("author").headers)
+    reader = register_user("author").headers
+
+    assert client.post(f"/posts/{post['id']}/likes", headers=reader).status_code == 204
+    assert client.post(f"/posts/{post['id']}/likes", headers=reader).status_code == 400
+    assert client.get(f"/posts/{post['id']}").json()["like_count"] == 1
+
+    assert client.delete(f"/posts/{post['id']}/likes", headers=reader).status_code == 204
+    assert client.delete(f"/posts/{post['id']}/likes", headers=reader).status_code == 404
+    assert client.get(f"/posts/{post['id']}").json()["like_count"] == 0
+
+def test_comment_counter(register_user):
+    post = _publish(register_user("author").headers)
+    reader = register_user("author").headers
+
+    for body in ("First", "Second"):
+        response = client.post(f"/posts/{post['id']}/comments", json={"body": body}, headers=reader)
+        assert response.status_code == 201
+
+    assert client.get(f"/posts/{post['id']}").json()["comment_count"] == 2
+    comments = client.get(f"/posts/{post['id']}/comments").json()["items"]
+    assert [comment["body"] for comment in comments] == ["First", "Second"]
+
+def test_like_missing_post(register_user):
+    response = client.post(f"/posts/{uuid4()}/likes", headers=register_user("author").headers)
+    assert response.status_code == 404
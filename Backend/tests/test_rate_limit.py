@@ -0,0 +1,92 @@
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.routers import auth_routes
+from src.backend.utils.rate_limit import LoginLimiter, MemoryBuckets
+
+client = TestClient(app)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def _count_hashes(monkeypatch) -> list:
+    calls = []
+    verify = auth_routes.verify_password_async
+
+    async def counting(plain, hashed):
+        calls.append(hashed)
+        return await verify(plain, hashed)
+
+    monkeypatch.setattr(auth_routes, "verify_password_async", counting)
+    return calls
+
+###############################################
+# Test Token Buckets
+###############################################
+
+def test_memory_buckets_refill():
+    clock = FakeClock()
+    buckets = MemoryBuckets(clock=clock)
+
+    assert [buckets.take("k", 2, 0.5) for _ in range(2)] == [0.0, 0.0]
+    assert buckets.take("k", 2, 0.5) == 2.0
+    clock.now += 2
+    assert buckets.take("k", 2, 0.5) == 0.0
+    clock.now += 100
+    assert [buckets.take("k", 2, 0.5) for _ in range(3)] == [0.0, 0.0, 2.0]
+
+def test_memory_buckets_evict_oldest():
+    buckets = MemoryBuckets(max_keys=2, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        buckets.take(key, 1, 1.0)
+
+    assert len(buckets) == 2
+    assert buckets.take("a", 1, 1.0) == 0.0
+
+###############################################
+# Test Login Limiter
+###############################################
+
+def test_rejects_before_hashing(monkeypatch, register_user):
+    username = register_user("limited", login=False).username
+    limiter = LoginLimiter(MemoryBuckets(), username_burst=2, username_per_minute=1)
+    monkeypatch.setattr(auth_routes, "login_limiter", limiter)
+    hashes = _count_hashes(monkeypatch)
+
+    codes = [client.post("/auth/login", data={"username": username, "password": "wrong"}).status_code for _ in range(3)]
+    response = client.post("/auth/login", data={"username": username.upper(), "password": "testpassword"})
+
+    assert codes == [401, 401, 429]
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert len(hashes) == 2
+    assert limiter.stats() == {"backend": "memory", "allowed": 2, "rejected_ip": 0, "rejected_username": 2}
+
+def test_ip_limit_spans_usernames(monkeypatch):
+    limiter = LoginLimiter(MemoryBuckets(), ip_burst=3, ip_per_minute=1)
+    monkeypatch.setattr(auth_routes, "login_limiter", limiter)
+
+    codes = [client.post("/auth/login", data={"username": f"ghost_{i}", "password": "x"}).status_code for i in range(4)]
+    assert codes == [401, 401, 401, 429]
+    assert limiter.rejected_ip == 1
+
+def test_unknown_user_costs_a_hash(monkeypatch):
+    monkeypatch.setattr(auth_routes, "login_limiter", LoginLimiter(MemoryBuckets()))
+    hashes = _count_hashes(monkeypatch)
+
+    response = client.post("/auth/login", data={"username": f"ghost_{uuid4().hex}", "password": "x"})
+    assert response.status_code == 401
+    assert len(hashes) == 1
+    assert hashes[0].startswith("$2")
+
+def test_success_refills_username_bucket(monkeypatch, register_user):
+    username = register_user("limited", login=False).username
+    monkeypatch.setattr(auth_routes, "login_limiter", LoginLimiter(MemoryBuckets(), username_burst=2, username_per_minute=1))
+
+    for password in ("wrong", "testpassword", "wrong", "testpassword"):
+        response = client.post("/auth/login", data={"username": username, "password": password})
+        assert response.status_code != 429
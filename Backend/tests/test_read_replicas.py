@@ -0,0 +1,117 @@
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from sqlalchemy import create_engine, insert
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.main import app
+from src.backend.middleware import STICKY_COOKIE
+from src.backend.migrations import migrate
+from src.backend.models.users import User
+from src.backend.utils.cache import get_user_cache
+
+client = TestClient(app)
+
+@pytest.fixture
+def replica_set(tmp_path, monkeypatch):
+    """Two SQLite files standing in for replicas of the primary, each with the schema and no rows."""
+    urls = [f"sqlite:///{tmp_path}/replica_{index}.db" for index in range(2)]
+    for url in urls:
+        engine = create_engine(url)
+        migrate(engine)
+        engine.dispose()
+    replicas = database.ReplicaSet(urls)
+    monkeypatch.setattr(database, "replicas", replicas)
+    client.cookies.clear()
+    yield replicas
+    asyncio.run(replicas.dispose())
+
+def _insert_user(*engines) -> str:
+    """Writes the same user straight into ``engines``, as replication would."""
+    suffix = uuid4().hex[:8]
+    row = {"id": uuid4(), "username": f"replica_{suffix}", "email": f"replica_{suffix}@example.com",
+           "first_name": "Replica", "last_name": "User", "password": "x"}
+    for engine in engines:
+        with engine.begin() as conn:
+            conn.execute(insert(User), [row])
+    return str(row["id"])
+
+###############################################
+# Test Routing
+###############################################
+
+def test_reads_round_robin_over_replicas(replica_set):
+    engines = [replica.engine() for replica in replica_set.replicas]
+    user_ids = [_insert_user(*engines) for _ in range(4)]
+
+    # Only on the replicas, so a 200 proves the read did not touch the primary
+    assert all(client.get(f"/users/{user_id}").status_code == 200 for user_id in user_ids)
+    assert [replica.reads for replica in replica_set.replicas] == [2, 2]
+
+def test_writes_go_to_primary_and_stick_reads_to_it(replica_set):
+    on_replicas_only = _insert_user(*(replica.engine() for replica in replica_set.replicas))
+    suffix = uuid4().hex[:8]
+    created = client.post("/users/createuser", json={
+        "username": f"primary_{suffix}", "email": f"primary_{suffix}@example.com",
+        "password": "x", "first_name": "Primary", "last_name": "User",
+    })
+    assert created.status_code == 201
+    assert STICKY_COOKIE in created.cookies
+
+    # Within the window this client reads its own write, from the primary
+    assert client.get(f"/users/{created.json()['id']}").status_code == 200
+    assert client.get(f"/users/{on_replicas_only}").status_code == 404
+    assert sum(replica.reads for replica in replica_set.replicas) == 0
+
+    client.cookies.set(STICKY_COOKIE, f"{time.time() - 1:.3f}")
+    assert client.get(f"/users/{on_replicas_only}").status_code == 200
+    # A client that did not write was never pinned
+    assert TestClient(app).get(f"/users/{on_replicas_only}").status_code == 200
+
+def test_read_only_posts_do_not_stick(replica_set):
+    on_replicas_only = _insert_user(*(replica.engine() for replica in replica_set.replicas))
+
+    response = client.post("/users/batch", json={"ids": [on_replicas_only]})
+    assert response.status_code == 200
+    assert STICKY_COOKIE not in response.cookies
+    assert client.post("/auth/login", data={"username": "nobody", "password": "x"}).status_code == 401
+    assert client.get(f"/users/{on_replicas_only}").status_code == 200
+
+def test_replica_reads_do_not_fill_the_cache(replica_set):
+    on_replicas_only = _insert_user(*(replica.engine() for replica in replica_set.replicas))
+
+    assert client.get(f"/users/{on_replicas_only}").status_code == 200
+    assert get_user_cache().get(f"user:id:{on_replicas_only}") is None
+
+def test_revocations_are_read_on_the_primary(replica_set, register_user):
+    user = register_user("replica")
+    assert client.post("/auth/logout", json={"refresh_token": user.refresh_token}).status_code == 204
+    client.cookies.clear()
+
+    # The replicas never received the revocation; the check must not trust them
+    assert client.get("/users/me", headers=user.headers).status_code == 401
+
+###############################################
+# Test Health Checks
+###############################################
+
+def test_unhealthy_replicas_leave_the_rotation(replica_set, tmp_path):
+    broken = database.Replica(f"sqlite:///{tmp_path}/missing/replica.db")
+    replica_set.replicas.append(broken)
+    healthy = replica_set.replicas[0]
+    user_id = _insert_user(healthy.engine())
+    replica_set.replicas[1].healthy = False
+
+    replica_set.check()
+
+    assert broken.healthy is False and broken.failures == 1
+    assert replica_set.replicas[1].healthy is True
+    replica_set.replicas[1].healthy = False
+    assert all(client.get(f"/users/{user_id}").status_code == 200 for _ in range(3))
+    assert healthy.reads == 3
+
+    healthy.healthy = False
+    # No healthy replica left: reads fall back to the primary, which does not have the user
+    assert client.get(f"/users/{_insert_user(healthy.engine())}").status_code == 404
+    assert {entry["replica"]: entry["healthy"] for entry in database.get_pool_stats()["replicas"]}[broken.name] is False
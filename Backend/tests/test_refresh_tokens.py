@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from src.backend import database
+from src.backend.cruds.crud_auth import RevocationPurger, RevocationStore, revocation_store
+from src.backend.main import app
+from src.backend.models.auth import RevokedToken
+from src.backend.utils.bloom import BloomFilter
+
+client = TestClient(app)
+
+def _me(access_token: str):
+    return client.get("/users/me", headers={"Authorization": f"Bearer {access_token}"})
+
+###############################################
+# Test Bloom Filter
+###############################################
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(str(uuid4()) in bloom for _ in range(10000))
+    assert false_positives < 300
+
+###############################################
+# Test Refresh Flow
+###############################################
+
+def test_login_issues_token_pair(register_user):
+    tokens = register_user("refresh", "Refresh").tokens
+
+    assert tokens["token_type"] == "bearer"
+    assert tokens["refresh_token"]
+    assert _me(tokens["access_token"]).status_code == 200
+
+def test_refresh_rotates_tokens(register_user):
+    tokens = register_user("refresh", "Refresh").tokens
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert _me(rotated["access_token"]).json()["username"].startswith("refresh_")
+
+def test_refresh_token_is_not_an_access_token(register_user):
+    tokens = register_user("refresh", "Refresh").tokens
+
+    assert _me(tokens["refresh_token"]).status_code == 401
+
+def test_refresh_token_reuse_revokes_session(register_user):
+    """
+    Replaying an already rotated refresh token fails and also ends the
+    session, so the token it was rotated into stops working too
+    """
+    tokens = register_user("refresh", "Refresh").tokens
+    rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    replay = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert replay.status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 401
+    assert _me(rotated["access_token"]).status_code == 401
+
+def test_logout_revokes_session(register_user):
+    tokens = register_user("refresh", "Refresh").tokens
+    assert _me(tokens["access_token"]).status_code == 200
+
+    response = client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 204
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert _me(tokens["access_token"]).status_code == 401
+
+def test_refresh_invalid_token():
+    response = client.post("/auth/refresh", json={"refresh_token": "garbage"})
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid refresh token"
+
+def test_sync_loads_revocations_that_commit_late():
+    store = RevocationStore(sync_seconds=0, overlap_seconds=30)
+    late = f"late-{uuid4()}"
+    with Session(database.engine) as db:
+        store.load(db)
+        # Stamped well before the sync above, committed only after it
+        db.add(RevokedToken(token_id=late, revoked_at=datetime.utcnow() - timedelta(seconds=10), expires_at=datetime.utcnow() + timedelta(days=1)))
+        db.commit()
+        store.sync(db)
+        assert store.might_be_revoked(late) == [late]
+
+###############################################
+# Test Revocation Purge
+###############################################
+
+def test_purger_deletes_only_expired_revocations():
+    expired, live = f"expired-{uuid4()}", f"live-{uuid4()}"
+    now = datetime.utcnow()
+    with Session(database.engine) as db:
+        revocation_store.revoke(db, expired, now - timedelta(seconds=1))
+        revocation_store.revoke(db, live, now + timedelta(days=1))
+
+        purger = RevocationPurger(revocation_store)
+        assert purger.flush(db) >= 1
+        assert db.get(RevokedToken, expired) is None
+        assert db.get(RevokedToken, live) is not None
+        assert purger.stats()["purged"] == purger.purged >= 1
@@ -0,0 +1,97 @@
+import time
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from src.backend import database
+from src.backend.cruds.crud_search import search_indexer
+from src.backend.main import app
+from src.backend.utils.search import search_terms
+
+client = TestClient(app)
+
+def _flush():
+    with Session(database.engine) as session:
+        search_indexer.flush(session)
+
+def _search(q: str, **params) -> list[dict]:
+    response = client.get("/search/", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()["items"]
+
+###############################################
+# Test Query Parsing
+###############################################
+
+def test_search_terms_strip_query_syntax():
+    assert search_terms('Hello "wor*ld" OR NEAR(x) snake_case') == ["hello", "wor", "ld", "or", "near", "x", "snake", "case"]
+    assert search_terms("***") == []
+
+###############################################
+# Test Search
+###############################################
+
+def test_search_users_by_name_prefix(register_user):
+    username = register_user("finder", "Zebulon", "Quixote").username
+    _flush()
+
+    hits = _search("zebu quix", kind="user")
+    assert [hit["title"] for hit in hits] == [username]
+    assert _search(username)[0]["kind"] == "user"
+
+def test_search_ranks_title_matches_first(register_user):
+    headers = register_user("finder", "Search").headers
+    word = f"kw{uuid4().hex[:8]}"
+    in_body = client.post("/posts/", json={"title": "Unrelated", "body": f"mentions {word}", "status": "published"}, headers=headers).json()
+    in_title = client.post("/posts/", json={"title": f"All about {word}", "body": "text", "status": "published"}, headers=headers).json()
+    _flush()
+
+    hits = _search(word, kind="post")
+    assert [hit["id"] for hit in hits] == [in_title["id"], in_body["id"]]
+    assert hits[0]["rank"] > hits[1]["rank"]
+
+def test_drafts_are_not_indexed_until_published(register_user):
+    headers = register_user("finder", "Search").headers
+    word = f"draft{uuid4().hex[:8]}"
+    post = client.post("/posts/", json={"title": word, "body": "text"}, headers=headers).json()
+    _flush()
+    assert _search(word) == []
+
+    client.put(f"/posts/update/{post['id']}", json={"status": "published"}, headers=headers)
+    _flush()
+    assert [hit["id"] for hit in _search(word)] == [post["id"]]
+
+def test_index_follows_updates_and_deletes(register_user):
+    headers = register_user("finder", "Search").headers
+    old, new = f"old{uuid4().hex[:8]}", f"new{uuid4().hex[:8]}"
+    post = client.post("/posts/", json={"title": old, "body": "text", "status": "published"}, headers=headers).json()
+    _flush()
+
+    client.put(f"/posts/update/{post['id']}", json={"title": new}, headers=headers)
+    _flush()
+    assert _search(old) == []
+    assert len(_search(new)) == 1
+
+    client.delete(f"/posts/{post['id']}", headers=headers)
+    _flush()
+    assert _search(new) == []
+
+def test_rebuild_restores_index(register_user, internal_headers):
+    username = register_user("finder", "Search").username
+    _flush()
+
+    response = client.post("/internal/search/rebuild", headers=internal_headers)
+    assert response.status_code == 200
+    assert response.json()["indexed"] >= 1
+    assert _search(username)[0]["title"] == username
+
+def test_background_task_flushes_pending_rows(register_user):
+    search_indexer.interval = 0.05
+    with TestClient(app) as live_client:
+        assert search_indexer.stats()["running"]
+        username = register_user("finder", "Background").username
+        for _ in range(50):
+            if not search_indexer.stats()["pending"]:
+                break
+            time.sleep(0.05)
+        assert live_client.get("/search/", params={"q": username}).json()["items"][0]["title"] == username
+    assert not search_indexer.stats()["running"]
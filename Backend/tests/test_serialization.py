@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from src.backend import database
+from src.backend.main import app
+from src.backend.models.users import USER_IS_LIVE, User
+from src.backend.schemas.user_schema import UserRead
+
+client = TestClient(app)
+
+###############################################
+# Test Fast Listing Paths
+###############################################
+
+def test_user_page_matches_response_model(register_user):
+    register_user("fast", login=False)
+    register_user("fast", login=False)
+    tombstone = register_user("fast")
+    client.delete(f"/users/{tombstone.id}", headers=tombstone.headers)
+    response = client.get("/users/?limit=200")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    with Session(database.engine) as session:
+        users = session.exec(select(User).where(USER_IS_LIVE).order_by(User.created_at, User.id).limit(200)).all()
+    expected = [UserRead.model_validate(user).model_dump(mode="json") for user in users]
+    assert response.json()["items"] == expected
+    assert tombstone.id not in {user["id"] for user in expected}
+
+def test_user_page_cursor(register_user):
+    for _ in range(3):
+        register_user("fast", login=False)
+    first = client.get("/users/?limit=2").json()
+    second = client.get(f"/users/?limit=2&cursor={first['next_cursor']}").json()
+
+    assert first["next_cursor"] is not None
+    assert not {user["id"] for user in first["items"]} & {user["id"] for user in second["items"]}
+
+def test_feed_page_matches_single_post(register_user):
+    headers = register_user("fast").headers
+    post = client.post("/posts/", json={"title": "Fast", "body": "Body", "status": "published"}, headers=headers).json()
+    client.post(f"/posts/{post['id']}/likes", headers=headers)
+    single = client.get(f"/posts/{post['id']}").json()
+
+    feed = client.get("/posts/?limit=100").json()["items"]
+    author = client.get(f"/posts/author/{post['author_id']}").json()["items"]
+    assert next(item for item in feed if item["id"] == post["id"]) == single
+    assert author == [single]
@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+from src.backend.migrations import MIGRATIONS, applied_versions, migrate
+
+# Cumulative `python -X importtime` budget for importing the app, in a fresh interpreter
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "2000"))
+# Loaded on first use (tokens, hashing, engines, optional backends), never by importing the app
+LAZY_MODULES = (
+    "jwt", "jose", "cryptography", "bcrypt", "passlib", "argon2", "redis",
+    "aiosqlite", "asyncpg", "psycopg2", "sqlalchemy.dialects.sqlite", "sqlalchemy.dialects.postgresql",
+)
+REQUIRED_ENV = ("DATABASE_URL", "SECRET_KEY", "ALGORITHM", "ACCESS_TOKEN_EXPIRE_MINUTES")
+
+###############################################
+# Test Import Time
+###############################################
+
+def test_app_import_is_light_and_needs_no_env():
+    child = (
+        "import json, sys\n"
+        "import src.backend.main\n"
+        "from src.backend import database\n"
+        f"print(json.dumps({{'engine': database._engine is not None, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    env = {name: value for name, value in os.environ.items() if name not in REQUIRED_ENV}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", child], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    state = json.loads(result.stdout)
+    assert state == {"engine": False, "loaded": []}
+    main_line = next(line for line in result.stderr.splitlines() if line.endswith("| src.backend.main"))
+    import_ms = int(main_line.split("|")[1]) / 1000
+    assert import_ms < IMPORT_BUDGET_MS, f"importing the app took {import_ms:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+###############################################
+# Test Migrations
+###############################################
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrations.db")
+    yield engine
+    engine.dispose()
+
+def test_fresh_database_is_stamped(engine):
+    assert migrate(engine) == [version for version, _, _ in MIGRATIONS]
+    assert inspect(engine).has_table("USERS")
+    assert migrate(engine) == []
+
+def test_existing_database_gets_baseline(engine):
+    # A database created by create_all before migrations existed
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text('DROP TABLE "SCHEMA_MIGRATIONS"'))
+        conn.execute(text("""INSERT INTO "USERS" (id, username, first_name, last_name, email, password, created_at, updated_at)
+                             VALUES ('00000000000000000000000000000001', 'kept', 'K', 'E', 'kept@example.com', 'x',
+                                     '2024-01-01 00:00:00', '2024-01-01 00:00:00')"""))
+
+    assert migrate(engine) == [version for version, _, _ in MIGRATIONS]
+    with engine.connect() as conn:
+        assert applied_versions(conn) == {version for version, _, _ in MIGRATIONS}
+        assert conn.execute(text('SELECT username FROM "USERS"')).scalar_one() == "kept"
+
+def test_case_insensitive_migration(engine):
+    # A version 1 database, with the exact-match unique indexes
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX "ix_USERS_lower_username"'))
+        conn.execute(text('DROP INDEX "ix_USERS_lower_email"'))
+        conn.execute(text('CREATE UNIQUE INDEX "ix_USERS_username" ON "USERS" (username)'))
+        conn.execute(text('CREATE UNIQUE INDEX "ix_USERS_email" ON "USERS" (email)'))
+        conn.execute(text('DELETE FROM "SCHEMA_MIGRATIONS" WHERE version > 1'))
+        for index, username in enumerate(("Bob", "bob"), start=1):
+            conn.execute(text("""INSERT INTO "USERS" (id, username, first_name, last_name, email, password, created_at, updated_at)
+                                 VALUES (:id, :username, 'B', 'O', :email, 'x', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"""),
+                         {"id": f"{index:032d}", "username": username, "email": f"{username}{index}@example.com"})
+
+    with pytest.raises(RuntimeError, match="bob"):
+        migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(text("""UPDATE "USERS" SET username = 'bob2' WHERE username = 'bob'"""))
+
+    assert 2 in migrate(engine)
+    with engine.connect() as conn:
+        # The inspector leaves out expression indexes on SQLite
+        indexes = set(conn.execute(text("""SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'USERS'""")).scalars())
+    assert {"ix_USERS_lower_username", "ix_USERS_lower_email"} <= indexes
+    assert not indexes & {"ix_USERS_username", "ix_USERS_email"}
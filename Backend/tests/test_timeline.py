@@ -0,0 +1,139 @@
+from uuid import UUID, uuid4
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+from src.backend import database
+from src.backend.cruds import crud_timeline
+from src.backend.cruds.crud_timeline import timeline_trimmer
+from src.backend.main import app
+from src.backend.models.social import TimelineEntry
+
+client = TestClient(app)
+
+def _publish(headers: dict, title: str = "Post") -> str:
+    response = client.post("/posts/", json={"title": title, "body": "Body", "status": "published"}, headers=headers)
+    return response.json()["id"]
+
+def _timeline(headers: dict, **params) -> dict:
+    response = client.get("/timeline/", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def _entries(user_id: str) -> int:
+    with Session(database.engine) as session:
+        stmt = select(TimelineEntry.post_id).where(TimelineEntry.user_id == UUID(user_id))
+        return len(session.exec(stmt).all())
+
+###############################################
+# Test Follows
+###############################################
+
+def test_cannot_follow_yourself_or_twice(register_user):
+    author = register_user("social")
+    reader = register_user("social")
+
+    assert client.post(f"/users/{reader.id}/follow", headers=reader.headers).status_code == 400
+    assert client.post(f"/users/{author.id}/follow", headers=reader.headers).status_code == 204
+    assert client.post(f"/users/{author.id}/follow", headers=reader.headers).status_code == 400
+    assert client.get(f"/users/{reader.id}/following").json() == [author.id]
+
+def test_follow_missing_user(register_user):
+    reader = register_user("social")
+    assert client.post(f"/users/{uuid4()}/follow", headers=reader.headers).status_code == 404
+
+###############################################
+# Test Fan-out
+###############################################
+
+def test_follow_backfills_and_publish_fans_out(register_user):
+    author = register_user("social")
+    reader = register_user("social")
+    old_post = _publish(author.headers, "Before follow")
+
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+    new_post = _publish(author.headers, "After follow")
+
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == [new_post, old_post]
+
+def test_unpublish_delete_and_unfollow_retract(register_user):
+    author = register_user("social")
+    reader = register_user("social")
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+    archived, deleted, kept = (_publish(author.headers, title) for title in ("Archived", "Deleted", "Kept"))
+
+    client.put(f"/posts/update/{archived}", json={"status": "archived"}, headers=author.headers)
+    client.delete(f"/posts/{deleted}", headers=author.headers)
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == [kept]
+
+    assert client.delete(f"/users/{author.id}/follow", headers=reader.headers).status_code == 204
+    assert _timeline(reader.headers)["items"] == []
+
+def test_timeline_pages_by_cursor(register_user):
+    author = register_user("social")
+    reader = register_user("social")
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+    published = [_publish(author.headers, f"Post {i}") for i in range(5)]
+
+    seen, cursor = [], None
+    while True:
+        page = _timeline(reader.headers, limit=2, **({"cursor": cursor} if cursor else {}))
+        seen.extend(post["id"] for post in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(reversed(published))
+
+###############################################
+# Test Hybrid Pull
+###############################################
+
+def test_high_follower_authors_are_pulled(monkeypatch, register_user):
+    pushed_author = register_user("social")
+    celebrity = register_user("social")
+    reader = register_user("social")
+    client.post(f"/users/{pushed_author.id}/follow", headers=reader.headers)
+    client.post(f"/users/{celebrity.id}/follow", headers=reader.headers)
+
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 0)
+    # Both authors now have more followers than the limit, so nothing is pushed
+    pulled = _publish(celebrity.headers, "Pulled")
+    assert _entries(reader.id) == 0
+
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 1)
+    # One follower is within a limit of 1, so this post is pushed
+    pushed = _publish(pushed_author.headers, "Pushed")
+    assert _entries(reader.id) == 1
+    # The celebrity is back within the limit, but the post it was never pushed is still pulled
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == [pushed, pulled]
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 0)
+
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == [pushed, pulled]
+
+def test_pulled_posts_survive_dropping_below_limit(monkeypatch, register_user):
+    author = register_user("social")
+    reader = register_user("social")
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 0)
+    pulled = _publish(author.headers, "Pulled")
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 1)
+    pushed = _publish(author.headers, "Pushed")
+
+    assert _entries(reader.id) == 1
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == [pushed, pulled]
+
+###############################################
+# Test Trimming
+###############################################
+
+def test_trimmer_caps_timelines(monkeypatch, register_user):
+    author = register_user("social")
+    reader = register_user("social")
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+    published = [_publish(author.headers, f"Post {i}") for i in range(4)]
+
+    monkeypatch.setattr(timeline_trimmer, "max_entries", 2)
+    with Session(database.engine) as session:
+        timeline_trimmer.flush(session)
+
+    assert _entries(reader.id) == 2
+    assert [post["id"] for post in _timeline(reader.headers)["items"]] == published[:1:-1]
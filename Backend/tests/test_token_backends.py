@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+from src.backend.utils.security import KeySet, get_token_backend
+
+def _claims() -> dict:
+    return {"sub": "user-1", "exp": datetime.utcnow() + timedelta(minutes=5)}
+
+def _rsa_jwk(kid: str) -> dict:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return {**RSAAlgorithm.to_jwk(key, as_dict=True), "kid": kid, "alg": "RS256"}
+
+def _write(path, data) -> str:
+    path.write_text(json.dumps(data))
+    # Bump the mtime explicitly; back-to-back writes can share a timestamp
+    stamp = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+    return str(path)
+
+###############################################
+# Test Backends
+###############################################
+
+@pytest.mark.parametrize("backend_name", ["pyjwt", "jose"])
+def test_hs256_round_trip(backend_name):
+    backend = get_token_backend(backend_name)
+    token = backend.encode(_claims(), "a-long-enough-test-secret-for-hs256", "HS256")
+
+    assert backend.decode(token, "a-long-enough-test-secret-for-hs256", ["HS256"])["sub"] == "user-1"
+    with pytest.raises(ValueError):
+        backend.decode(token, "another-secret-that-does-not-match", ["HS256"])
+
+@pytest.mark.parametrize("backend_name", ["pyjwt", "jose"])
+def test_rs256_round_trip_with_kid(backend_name):
+    backend = get_token_backend(backend_name)
+    jwk = _rsa_jwk("rsa-1")
+    public = {name: value for name, value in jwk.items() if name in ("kty", "n", "e", "kid", "alg")}
+    token = backend.encode(_claims(), jwk, "RS256", kid="rsa-1")
+
+    assert backend.unverified_kid(token) == "rsa-1"
+    assert backend.decode(token, public, ["RS256"])["sub"] == "user-1"
+
+def test_eddsa_round_trip():
+    backend = get_token_backend("pyjwt")
+    jwk = {**OKPAlgorithm.to_jwk(ed25519.Ed25519PrivateKey.generate(), as_dict=True), "kid": "ed-1"}
+    public = {name: value for name, value in jwk.items() if name != "d"}
+    token = backend.encode(_claims(), jwk, "EdDSA", kid="ed-1")
+
+    assert backend.decode(token, public, ["EdDSA"])["sub"] == "user-1"
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_token_backend("nope")
+
+###############################################
+# Test Key Rotation
+###############################################
+
+def test_key_rotation_without_restart(tmp_path):
+    """
+    A verifier that only holds the public JWKS accepts tokens from the old
+    and the new signing key during rotation, then rejects the old key's
+    tokens once it is removed from the JWKS
+    """
+    backend = get_token_backend("pyjwt")
+    old, new = _rsa_jwk("2024-01"), _rsa_jwk("2024-02")
+    public = lambda jwk: {name: jwk[name] for name in ("kty", "n", "e", "kid", "alg")}
+
+    signing_path = _write(tmp_path / "signing.json", old)
+    jwks_path = _write(tmp_path / "jwks.json", {"keys": [public(old)]})
+    signer = KeySet(signing_jwk_path=signing_path, refresh_seconds=0)
+    verifier = KeySet(jwks_path=jwks_path, refresh_seconds=0)
+
+    def issue() -> str:
+        kid, key = signer.signing_key()
+        return backend.encode(_claims(), key, "RS256", kid=kid)
+
+    def verify(token: str) -> dict:
+        key = verifier.verification_key(backend.unverified_kid(token))
+        if key is None:
+            raise ValueError("Invalid token")
+        return backend.decode(token, key, ["RS256"])
+
+    old_token = issue()
+    assert verify(old_token)["sub"] == "user-1"
+
+    _write(tmp_path / "jwks.json", {"keys": [public(old), public(new)]})
+    _write(tmp_path / "signing.json", new)
+    new_token = issue()
+    assert backend.unverified_kid(new_token) == "2024-02"
+    assert verify(new_token)["sub"] == "user-1"
+    assert verify(old_token)["sub"] == "user-1"
+
+    _write(tmp_path / "jwks.json", {"keys": [public(new)]})
+    with pytest.raises(ValueError):
+        verify(old_token)
+    with pytest.raises(RuntimeError):
+        verifier.signing_key()
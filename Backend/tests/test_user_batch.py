@@ -0,0 +1,111 @@
+import asyncio
+from uuid import uuid4
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.main import app
+from src.backend.routers.user_routes import MAX_BATCH_SIZE
+from src.backend.utils.dataloader import DataLoader
+
+client = TestClient(app)
+
+def _create_user() -> dict:
+    suffix = uuid4().hex[:8]
+    return client.post(
+        "/users/createuser",
+        json={
+            "username": f"batch_{suffix}",
+            "email": f"batch_{suffix}@example.com",
+            "password": "testpassword",
+            "first_name": "Batch",
+            "last_name": "User",
+        },
+    ).json()
+
+###############################################
+# Test POST /users/batch
+###############################################
+
+def test_batch_maps_hits_and_misses():
+    first, second = _create_user(), _create_user()
+    missing_id = str(uuid4())
+    response = client.post("/users/batch", json={
+        "ids": [first["id"], missing_id],
+        "usernames": [second["username"], "batch_nobody"],
+        "emails": [first["email"]],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ids"][first["id"]]["username"] == first["username"]
+    assert body["ids"][missing_id] is None
+    assert body["usernames"][second["username"]]["id"] == second["id"]
+    assert body["usernames"]["batch_nobody"] is None
+    assert body["emails"][first["email"]]["id"] == first["id"]
+    assert "password" not in body["ids"][first["id"]]
+
+@pytest.mark.skipif(database.DB_ASYNC, reason="counts statements on the sync engine")
+def test_batch_runs_one_query_per_key_type():
+    users = [_create_user() for _ in range(5)]
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        response = client.post("/users/batch", json={
+            "ids": [user["id"] for user in users],
+            "usernames": [user["username"] for user in users],
+        })
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert len(statements) == 2
+    assert all(" IN " in statement.upper() for statement in statements)
+
+def test_batch_rejects_too_many_keys():
+    response = client.post("/users/batch", json={"usernames": [f"u{i}" for i in range(MAX_BATCH_SIZE + 1)]})
+
+    assert response.status_code == 400
+    assert str(MAX_BATCH_SIZE) in response.json()["detail"]
+
+###############################################
+# Test DataLoader
+###############################################
+
+def test_dataloader_coalesces_and_memoizes():
+    calls = []
+
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    async def scenario():
+        loader = DataLoader(batch_fn, max_batch_size=2)
+        first = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3), loader.load(1))
+        second = await loader.load_many([2, 3])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == [10, 20, None, 10]
+    assert second == [20, None]
+    assert calls == [[1, 2], [3]]
+
+def test_dataloader_propagates_errors_and_retries():
+    attempts = []
+
+    async def batch_fn(keys):
+        attempts.append(list(keys))
+        if len(attempts) == 1:
+            raise RuntimeError("database went away")
+        return {key: key for key in keys}
+
+    async def scenario():
+        loader = DataLoader(batch_fn)
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(loader.load("a"), loader.load("b"))
+        return await loader.load("a")
+
+    assert asyncio.run(scenario()) == "a"
+    assert attempts == [["a", "b"], ["a"]]
@@ -0,0 +1,135 @@
+import time
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.utils.cache import MemoryCache, RedisCache, get_user_cache, set_user_cache
+from src.backend.utils.security import create_access_token
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """Minimal stand-in for the redis-py client methods RedisCache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key)
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value.encode(), time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+###############################################
+# Test Cache Backends
+###############################################
+
+def test_memory_cache_ttl_and_lru():
+    cache = MemoryCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("short", 4, ttl=0)
+    assert cache.get("short") is None
+    stats = cache.stats()
+    # "b" and "c" pushed out by size, "short" dropped on expiry
+    assert stats["evictions"] == 3
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+def test_redis_cache_round_trip():
+    fake = FakeRedis()
+    cache = RedisCache(fake, ttl=60)
+    cache.set("user:id:1", {"username": "cached"})
+
+    assert cache.get("user:id:1") == {"username": "cached"}
+    assert "blog:user:id:1" in fake.data
+    cache.delete("user:id:1")
+    assert cache.get("user:id:1") is None
+
+###############################################
+# Test Cached User Lookups
+###############################################
+
+def _create_user() -> dict:
+    suffix = uuid4().hex[:8]
+    response = client.post(
+        "/users/createuser",
+        json={
+            "username": f"cache_{suffix}",
+            "email": f"cache_{suffix}@example.com",
+            "password": "testpassword",
+            "first_name": "Cache",
+            "last_name": "User",
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+def _headers(user: dict) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': user['id'], 'sid': uuid4().hex})}"}
+
+def test_update_invalidates_old_keys():
+    """
+    After renaming a user, the old username and email no longer resolve
+    from the cache and the new ones resolve to the same id
+    """
+    previous = get_user_cache()
+    set_user_cache(RedisCache(FakeRedis(), ttl=60))
+    try:
+        user = _create_user()
+        client.get(f"/users/username/{user['username']}/id")
+        client.get(f"/users/email/{user['email']}/id")
+        assert client.get(f"/users/{user['id']}").json()["first_name"] == "Cache"
+        assert client.get(f"/users/{user['id']}").status_code == 200
+        assert get_user_cache().hits == 1
+
+        response = client.put(
+            f"/users/update/{user['id']}",
+            json={
+                "username": f"{user['username']}_new",
+                "email": f"new_{user['email']}",
+                "first_name": "Cache",
+                "last_name": "User",
+                "password": "testpassword",
+            },
+            headers=_headers(user),
+        )
+        assert response.status_code == 200
+
+        assert client.get(f"/users/username/{user['username']}/id").status_code == 404
+        assert client.get(f"/users/email/{user['email']}/id").status_code == 404
+        assert client.get(f"/users/username/{user['username']}_new/id").json() == user["id"]
+        assert client.get(f"/users/{user['id']}").json()["email"] == f"new_{user['email']}"
+    finally:
+        set_user_cache(previous)
+
+def test_delete_invalidates_keys(internal_headers):
+    user = _create_user()
+    assert client.get(f"/users/{user['id']}").status_code == 200
+    assert client.get(f"/users/{user['id']}").status_code == 200
+
+    assert client.delete(f"/users/{user['id']}", headers=_headers(user)).status_code == 204
+    assert client.get(f"/users/{user['id']}").status_code == 404
+    assert client.get("/internal/cache", headers=internal_headers).json()["users"]["invalidations"] >= 4
+
+def test_cache_never_holds_password_hash():
+    user = _create_user()
+    assert client.get(f"/users/{user['id']}").status_code == 200
+    assert client.get(f"/users/email/{user['email']}").status_code == 200
+    for key in (f"user:id:{user['id']}", f"user:email:{user['email']}"):
+        cached = get_user_cache().get(key)
+        assert cached["username"] == user["username"]
+        assert "password" not in cached
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.main import app
+
+client = TestClient(app)
+
+###############################################
+# Test Single Round Trip Creation
+###############################################
+
+@pytest.mark.skipif(database.DB_ASYNC, reason="counts statements on the sync engine")
+def test_create_user_issues_one_statement():
+    """
+    Creating a user is a single INSERT ... RETURNING, with no pre-check
+    SELECTs and no refresh afterwards
+    """
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        suffix = uuid4().hex[:8]
+        response = client.post(
+            "/users/createuser",
+            json={
+                "username": f"single_{suffix}",
+                "email": f"single_{suffix}@example.com",
+                "password": "testpassword",
+                "first_name": "Single",
+                "last_name": "Trip",
+            },
+        )
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 201
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
+
+###############################################
+# Test Concurrent Duplicate Registrations
+###############################################
+
+def test_concurrent_duplicate_registrations():
+    """
+    Fire the same registration from several threads at once; the unique
+    indexes must let exactly one through and reject the rest with a 400
+    """
+    suffix = uuid4().hex[:8]
+    payload = {
+        "username": f"race_{suffix}",
+        "email": f"race_{suffix}@example.com",
+        "first_name": "Race",
+        "last_name": "Condition",
+        "password": "testpassword",
+    }
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda _: client.post("/auth/register", json=payload), range(8)))
+
+    codes = sorted(response.status_code for response in responses)
+    assert codes == [201] + [400] * 7
+    assert all(
+        response.json() == {"detail": "Username already registered"}
+        for response in responses
+        if response.status_code == 400
+    )
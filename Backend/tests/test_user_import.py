@@ -0,0 +1,98 @@
+import json
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from src.backend.main import app
+
+client = TestClient(app)
+
+def _row(name: str, **overrides) -> dict:
+    row = {
+        "username": name,
+        "first_name": "Bulk",
+        "last_name": "Import",
+        "email": f"{name}@example.com",
+        "password": "testpassword",
+    }
+    row.update(overrides)
+    return row
+
+###############################################
+# Test Bulk Import
+###############################################
+
+def test_import_users_jsonl(internal_headers):
+    """
+    Valid rows are inserted while invalid JSON, schema errors and
+    duplicates (within the file and against existing users) are reported
+    per line without aborting the batch
+    """
+    suffix = uuid4().hex[:8]
+    lines = [
+        json.dumps(_row(f"bulk_a_{suffix}")),
+        json.dumps(_row(f"bulk_b_{suffix}")),
+        "{not json",
+        json.dumps({"username": f"bulk_c_{suffix}"}),
+        json.dumps(_row(f"bulk_d_{suffix}", email=f"bulk_a_{suffix}@example.com")),
+        "",
+        json.dumps(_row(f"bulk_b_{suffix}", email=f"bulk_e_{suffix}@example.com")),
+    ]
+    response = client.post(
+        "/users/import",
+        params={"batch_size": 2},
+        headers=internal_headers,
+        files={"file": ("users.jsonl", "\n".join(lines), "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total"] == 6
+    assert report["inserted"] == 2
+    assert [issue["line"] for issue in report["invalid"]] == [3, 4]
+    assert {(issue["line"], issue["detail"]) for issue in report["conflicts"]} == {
+        (5, "Email already registered"),
+        (7, "Username already registered"),
+    }
+    assert client.get(f"/users/username/bulk_b_{suffix}/id").status_code == 200
+
+def test_import_users_csv(internal_headers):
+    suffix = uuid4().hex[:8]
+    body = "username,first_name,last_name,email,password\n"
+    body += f"csv_a_{suffix},Csv,Import,csv_a_{suffix}@example.com,testpassword\n"
+    body += f"csv_b_{suffix},Csv,Import,not-an-email,testpassword\n"
+    response = client.post("/users/import", files={"file": ("users.csv", body, "text/csv")}, headers=internal_headers)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["invalid"][0]["line"] == 3
+    assert report["invalid"][0]["detail"].startswith("email")
+
+def test_import_reports_unhashable_passwords(internal_headers):
+    """A password bcrypt refuses is reported on its own line; the rest of the batch goes in"""
+    suffix = uuid4().hex[:8]
+    lines = [
+        json.dumps(_row(f"bulk_ok_a_{suffix}")),
+        json.dumps(_row(f"bulk_long_{suffix}", password="x" * 73)),
+        json.dumps(_row(f"bulk_ok_b_{suffix}")),
+    ]
+    response = client.post(
+        "/users/import",
+        headers=internal_headers,
+        files={"file": ("users.jsonl", "\n".join(lines), "application/x-ndjson")},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["total"] == 3
+    assert report["inserted"] == 2
+    assert [(issue["line"], issue["username"]) for issue in report["invalid"]] == [(2, f"bulk_long_{suffix}")]
+    assert report["invalid"][0]["detail"].startswith("password")
+    assert client.get(f"/users/username/bulk_long_{suffix}/id").status_code == 404
+    assert client.get(f"/users/username/bulk_ok_b_{suffix}/id").status_code == 200
+
+def test_import_is_for_operators():
+    body = json.dumps(_row(f"bulk_anon_{uuid4().hex[:8]}"))
+    files = {"file": ("users.jsonl", body, "application/x-ndjson")}
+
+    assert client.post("/users/import", files=files).status_code == 403
+    assert client.post("/users/import", files=files, headers={"X-Internal-Token": "wrong"}).status_code == 403
@@ -0,0 +1,100 @@
+from uuid import uuid4
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.cruds.crud_user import UserCRUD
+from src.backend.main import app
+from src.backend.routers.auth_routes import _get_user_by_username
+
+client = TestClient(app)
+
+def _create_user(path: str = "/users/createuser", **overrides):
+    suffix = uuid4().hex[:8]
+    payload = {
+        "username": f"Lookup_{suffix}",
+        "email": f"Lookup_{suffix}@Example.com",
+        "password": "testpassword",
+        "first_name": "Lookup",
+        "last_name": "User",
+        **overrides,
+    }
+    return client.post(path, json=payload)
+
+###############################################
+# Test Case-insensitive Lookups
+###############################################
+
+def test_lookups_ignore_case():
+    user = _create_user().json()
+
+    assert client.get(f"/users/email/{user['email'].upper()}").json()["id"] == user["id"]
+    assert client.get(f"/users/email/{user['email'].lower()}/id").json() == user["id"]
+    assert client.get(f"/users/username/{user['username'].upper()}/id").json() == user["id"]
+    batch = client.post("/users/batch", json={"usernames": [user["username"].lower()]}).json()
+    assert batch["usernames"][user["username"].lower()]["id"] == user["id"]
+    # Stored as entered
+    assert client.get(f"/users/{user['id']}").json()["username"] == user["username"]
+
+def test_duplicates_differing_in_case_are_rejected():
+    user = _create_user().json()
+
+    same_email = _create_user(email=user["email"].upper())
+    same_username = _create_user(username=user["username"].lower())
+
+    assert same_email.status_code == 400
+    assert same_email.json()["detail"] == "Email already registered"
+    assert same_username.status_code == 400
+    assert same_username.json()["detail"] == "Username already registered"
+
+def test_login_ignores_username_case():
+    user = _create_user(path="/auth/register").json()
+    response = client.post("/auth/login", data={"username": user["username"].upper(), "password": "testpassword"})
+
+    assert response.status_code == 200
+
+###############################################
+# Test Query Plans
+###############################################
+
+def _plan(conn, statement: str, parameters) -> str:
+    if conn.dialect.name == "postgresql":
+        # Tiny test tables make a sequential scan the cheapest plan; rule it out to see whether an index can serve
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+    else:
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+def _captured_statements(lookup) -> list[tuple[str, tuple]]:
+    statements = []
+    listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        with Session(database.engine) as session:
+            lookup(session)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+    return statements
+
+@pytest.mark.parametrize("lookup", [
+    lambda db, user: UserCRUD.get_user_by_email(db, user["email"].upper()),
+    lambda db, user: UserCRUD.get_user_version_by_email(db, user["email"].upper()),
+    lambda db, user: UserCRUD.get_user_id_by_email(db, user["email"].upper()),
+    lambda db, user: UserCRUD.get_user_id_by_username(db, user["username"].upper()),
+    lambda db, user: UserCRUD.get_users_by(db, "username", [user["username"].upper(), "nobody"]),
+    lambda db, user: UserCRUD.get_users_by(db, "email", [user["email"].upper()]),
+    lambda db, user: _get_user_by_username(db, user["username"].upper()),
+], ids=["by_email", "version_by_email", "id_by_email", "id_by_username", "batch_usernames", "batch_emails", "login"])
+def test_lookups_use_an_index(lookup):
+    user = _create_user().json()
+    statements = _captured_statements(lambda db: lookup(db, user))
+
+    assert statements
+    with database.engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = _plan(conn, statement, parameters)
+            assert "lower" in statement
+            assert "Seq Scan" not in plan and "SCAN USERS" not in plan, plan
+            assert "ix_USERS_lower_" in plan, plan
@@ -0,0 +1,123 @@
+from uuid import uuid4
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.main import app
+
+client = TestClient(app)
+
+def _create_user(register_user) -> tuple[dict, dict]:
+    """A fresh user, and the headers that authenticate as them."""
+    registered = register_user("patch", "Patch")
+    return registered.user, registered.headers
+
+###############################################
+# Test PATCH
+###############################################
+
+def test_patch_updates_only_sent_fields(register_user):
+    user, headers = _create_user(register_user)
+    response = client.patch(f"/users/{user['id']}", json={"first_name": "Patched", "last_name": None}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Patched"
+    assert response.json()["last_name"] == "User"
+    assert response.json()["username"] == user["username"]
+    assert response.json()["updated_at"] != user["updated_at"]
+    assert response.headers["ETag"] == client.get(f"/users/{user['id']}").headers["ETag"]
+
+@pytest.mark.skipif(database.DB_ASYNC, reason="counts statements on the sync engine")
+def test_patch_issues_one_statement(register_user):
+    user, headers = _create_user(register_user)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        response = client.patch(f"/users/{user['id']}", json={"first_name": "Once"}, headers=headers)
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+
+    # The token's revocation check may also sync from REVOKED_TOKENS
+    statements = [statement for statement in statements if "REVOKED_TOKENS" not in statement]
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+    assert "RETURNING" in statements[0].upper()
+
+def test_empty_patch_changes_nothing(register_user):
+    user, headers = _create_user(register_user)
+    etag = client.get(f"/users/{user['id']}").headers["ETag"]
+
+    for body in ({}, {"first_name": None, "password": None}):
+        response = client.patch(f"/users/{user['id']}", json=body, headers={**headers, "If-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["updated_at"] == user["updated_at"]
+        assert response.headers["ETag"] == etag
+    assert client.patch(f"/users/{user['id']}", json={}, headers={**headers, "If-Match": '"other"'}).status_code == 412
+
+def test_patch_if_match(register_user):
+    user, headers = _create_user(register_user)
+    etag = client.get(f"/users/{user['id']}").headers["ETag"]
+
+    first = client.patch(f"/users/{user['id']}", json={"first_name": "First"}, headers={**headers, "If-Match": etag})
+    assert first.status_code == 200
+    # The same stale ETag now loses, and nothing is written
+    second = client.patch(f"/users/{user['id']}", json={"first_name": "Second"}, headers={**headers, "If-Match": etag})
+    assert second.status_code == 412
+    assert client.get(f"/users/{user['id']}").json()["first_name"] == "First"
+
+    new_etag = first.headers["ETag"]
+    assert client.patch(f"/users/{user['id']}", json={"first_name": "Weak"}, headers={**headers, "If-Match": f"W/{new_etag}"}).status_code == 412
+    assert client.patch(f"/users/{user['id']}", json={"first_name": "Third"}, headers={**headers, "If-Match": f'"other", {new_etag}'}).status_code == 200
+    assert client.patch(f"/users/{user['id']}", json={"first_name": "Any"}, headers={**headers, "If-Match": "*"}).status_code == 200
+
+def test_patch_hashes_password(register_user):
+    user, headers = _create_user(register_user)
+    assert client.patch(f"/users/{user['id']}", json={"password": "changedpassword"}, headers=headers).status_code == 200
+
+    login = lambda password: client.post("/auth/login", data={"username": user["username"], "password": password})
+    assert login("changedpassword").status_code == 200
+    assert login("testpassword").status_code == 401
+
+def test_patch_rename(register_user):
+    (user, headers), (other, _) = _create_user(register_user), _create_user(register_user)
+    client.get(f"/users/email/{user['email']}")
+
+    taken = client.patch(f"/users/{user['id']}", json={"username": other["username"]}, headers=headers)
+    assert taken.status_code == 400
+    assert taken.json()["detail"] == "Username already registered"
+
+    new_email = f"renamed_{uuid4().hex[:8]}@example.com"
+    assert client.patch(f"/users/{user['id']}", json={"email": new_email}, headers=headers).status_code == 200
+    assert client.get(f"/users/email/{user['email']}").status_code == 404
+    assert client.get(f"/users/email/{new_email}").json()["id"] == user["id"]
+
+###############################################
+# Test Access
+###############################################
+
+def test_changes_need_the_owners_token(register_user):
+    (user, headers), (other, _) = _create_user(register_user), _create_user(register_user)
+
+    # Anonymous
+    assert client.patch(f"/users/{user['id']}", json={"password": "takenover"}).status_code == 401
+    assert client.put(f"/users/update/{user['id']}", json={"password": "takenover"}).status_code == 401
+    assert client.delete(f"/users/{user['id']}").status_code == 401
+    # Someone else's account
+    assert client.patch(f"/users/{other['id']}", json={"password": "takenover"}, headers=headers).status_code == 403
+    assert client.put(f"/users/update/{other['id']}", json={"password": "takenover"}, headers=headers).status_code == 403
+    assert client.delete(f"/users/{other['id']}", headers=headers).status_code == 403
+    assert client.post("/auth/login", data={"username": other["username"], "password": "takenover"}).status_code == 401
+
+def test_password_change_ends_old_sessions(register_user):
+    registered = register_user("patch", "Patch")
+    response = client.patch(f"/users/{registered.id}", json={"password": "changedpassword"}, headers=registered.headers)
+    assert response.status_code == 200
+
+    assert client.post("/auth/refresh", json={"refresh_token": registered.refresh_token}).status_code == 401
+    assert client.get("/users/me", headers=registered.headers).status_code == 401
+    # Tokens issued after the change work
+    tokens = client.post("/auth/login", data={"username": registered.username, "password": "changedpassword"}).json()
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {tokens['access_token']}"}).status_code == 200
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
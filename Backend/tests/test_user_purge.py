@@ -0,0 +1,163 @@
+from uuid import UUID, uuid4
+import pytest
+from sqlalchemy import func
+from sqlmodel import Session, select
+from fastapi.testclient import TestClient
+from src.backend import database
+from src.backend.cruds import crud_timeline
+from src.backend.cruds.crud_purge import UserPurger
+from src.backend.cruds.crud_search import search_indexer
+from src.backend.main import app
+from src.backend.models.blogs import Comment, Post, PostLike
+from src.backend.models.social import Follow, FollowerCount, TimelineEntry
+from src.backend.models.users import User
+
+client = TestClient(app)
+
+def _publish(headers: dict) -> dict:
+    return client.post("/posts/", json={"title": "Purge me", "body": "Body", "status": "published"}, headers=headers).json()
+
+def _count(db: Session, model, *conditions) -> int:
+    return db.exec(select(func.count()).select_from(model).where(*conditions)).one()
+
+###############################################
+# Test Soft Delete
+###############################################
+
+def test_deleted_user_disappears_at_once(register_user):
+    registered = register_user("purge", "Purge")
+    user = registered.user
+    assert client.get(f"/users/{user['id']}").status_code == 200
+
+    assert client.delete(f"/users/{user['id']}", headers=registered.headers).status_code == 204
+
+    assert client.get(f"/users/{user['id']}").status_code == 404
+    assert client.get(f"/users/email/{user['email']}").status_code == 404
+    assert client.get(f"/users/username/{user['username']}/id").status_code == 404
+    assert client.post("/users/batch", json={"ids": [user["id"]]}).json()["ids"][user["id"]] is None
+    assert client.post("/auth/login", data={"username": user["username"], "password": "testpassword"}).status_code == 401
+    # The deleting token was revoked with the user
+    assert client.delete(f"/users/{user['id']}", headers=registered.headers).status_code == 401
+    # The tombstone is still there, waiting for the purger
+    with Session(database.engine) as db:
+        assert db.get(User, UUID(user["id"])).deleted_at is not None
+
+def test_deleted_user_tokens_stop_working(register_user):
+    user = register_user("purge", "Purge")
+    assert client.delete(f"/users/{user.id}", headers=user.headers).status_code == 204
+
+    response = client.post("/posts/", json={"title": "Ghost", "body": "Body", "status": "published"}, headers=user.headers)
+    assert response.status_code == 401
+    assert client.get("/users/me", headers=user.headers).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": user.refresh_token}).status_code == 401
+
+def test_deleted_authors_posts_disappear_at_once(monkeypatch, register_user):
+    author, reader = register_user("purge", "Purge"), register_user("purge", "Purge")
+    client.post(f"/users/{author.id}/follow", headers=reader.headers)
+    word = f"ghost{uuid4().hex[:8]}"
+    pushed = client.post("/posts/", json={"title": word, "body": "Body", "status": "published"}, headers=author.headers).json()
+    # Above the fan-out limit the post is pulled on read instead
+    monkeypatch.setattr(crud_timeline, "TIMELINE_FANOUT_LIMIT", 0)
+    pulled = _publish(author.headers)
+    with Session(database.engine) as db:
+        search_indexer.flush(db)
+
+    timeline = lambda: [post["id"] for post in client.get("/timeline/", headers=reader.headers).json()["items"]]
+    feed = lambda: [post["id"] for post in client.get("/posts/?limit=100").json()["items"]]
+    search = lambda: [hit["id"] for hit in client.get("/search/", params={"q": word, "kind": "post"}).json()["items"]]
+    assert timeline() == [pulled["id"], pushed["id"]]
+    assert pushed["id"] in feed()
+    assert search() == [pushed["id"]]
+
+    assert client.delete(f"/users/{author.id}", headers=author.headers).status_code == 204
+    with Session(database.engine) as db:
+        search_indexer.flush(db)
+
+    assert timeline() == []
+    assert not {pushed["id"], pulled["id"]} & set(feed())
+    assert search() == []
+    assert client.get(f"/posts/author/{author.id}").json()["items"] == []
+    assert client.get(f"/users/{reader.id}/following").json() == []
+    for post in (pushed, pulled):
+        assert client.get(f"/posts/{post['id']}").status_code == 404
+        assert client.get(f"/posts/{post['id']}", headers={"If-None-Match": '"stale"'}).status_code == 404
+        assert client.get(f"/posts/slug/{post['slug']}").status_code == 404
+        assert client.get(f"/posts/{post['id']}/comments").status_code == 404
+        assert client.post(f"/posts/{post['id']}/likes", headers=reader.headers).status_code == 404
+        assert client.post(f"/posts/{post['id']}/comments", json={"body": "Hi"}, headers=reader.headers).status_code == 404
+
+def test_deleted_username_can_be_reused(register_user):
+    registered = register_user("purge", "Purge")
+    user = registered.user
+    client.delete(f"/users/{user['id']}", headers=registered.headers)
+
+    response = client.post("/users/createuser", json={
+        "username": user["username"], "email": user["email"], "password": "x", "first_name": "New", "last_name": "Owner",
+    })
+
+    assert response.status_code == 201
+    assert client.get(f"/users/username/{user['username']}/id").json() == response.json()["id"]
+
+###############################################
+# Test Purge
+###############################################
+
+def test_purge_removes_owned_rows_in_batches(register_user):
+    victim, other = register_user("purge", "Purge"), register_user("purge", "Purge")
+    victim_headers, other_headers = victim.headers, other.headers
+    own_post, other_post = _publish(victim_headers), _publish(other_headers)
+    for post in (own_post, other_post):
+        for headers in (victim_headers, other_headers):
+            client.post(f"/posts/{post['id']}/likes", headers=headers)
+            client.post(f"/posts/{post['id']}/comments", json={"body": "Hi"}, headers=headers)
+    client.post(f"/users/{other.id}/follow", headers=victim_headers)
+    client.post(f"/users/{victim.id}/follow", headers=other_headers)
+    client.delete(f"/users/{victim.id}", headers=victim_headers)
+
+    purger = UserPurger(batch_size=1, pause=0)
+    with Session(database.engine) as db:
+        assert purger.flush(db) >= 1
+        victim_id, other_id, post_id = UUID(victim.id), UUID(other.id), UUID(other_post["id"])
+        assert db.get(User, victim_id) is None
+        assert _count(db, Post, Post.author_id == victim_id) == 0
+        assert _count(db, Comment, (Comment.author_id == victim_id) | (Comment.post_id == UUID(own_post["id"]))) == 0
+        assert _count(db, PostLike, (PostLike.user_id == victim_id) | (PostLike.post_id == UUID(own_post["id"]))) == 0
+        assert _count(db, Follow, (Follow.follower_id == victim_id) | (Follow.followee_id == victim_id)) == 0
+        assert _count(db, TimelineEntry, (TimelineEntry.user_id == victim_id) | (TimelineEntry.author_id == victim_id)) == 0
+        assert _count(db, FollowerCount, FollowerCount.user_id == victim_id) == 0
+        # Counters on what the victim touched but did not own are kept right
+        post = db.get(Post, post_id)
+        assert (post.like_count, post.comment_count) == (1, 1)
+        assert db.get(FollowerCount, other_id).follower_count == 0
+        assert UserPurger.tombstones(db) == 0
+    # One row per transaction: posts, comments, likes, follows and the user each took their own batches
+    assert purger.batches >= 8
+    assert purger.stats()["users_purged"] >= 1
+
+def test_purge_status_endpoint(register_user, internal_headers):
+    user = register_user("purge", "Purge")
+    client.delete(f"/users/{user.id}", headers=user.headers)
+
+    stats = client.get("/internal/user-purge", headers=internal_headers).json()
+
+    assert stats["tombstones"] >= 1
+    assert {"pending", "current", "users_purged", "rows_deleted", "batches", "failures", "running"} <= stats.keys()
+
+###############################################
+# Test Query Plans
+###############################################
+
+def test_reads_use_partial_indexes():
+    if database.engine.dialect.name != "sqlite":
+        pytest.skip("reads SQLite query plans")
+    live_page = select(User).where(User.deleted_at.is_(None)).order_by(User.created_at, User.id).limit(10)
+    oldest_tombstone = select(User.id).where(User.deleted_at.is_not(None)).order_by(User.deleted_at).limit(1)
+    plans = []
+    with database.engine.connect() as conn:
+        for stmt in (live_page, oldest_tombstone):
+            compiled = stmt.compile(database.engine)
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), tuple(compiled.params.values()))
+            plans.append(" ".join(str(row[-1]) for row in rows))
+
+    assert "ix_USERS_created_at_id" in plans[0], plans[0]
+    assert "ix_USERS_deleted_at" in plans[1], plans[1]